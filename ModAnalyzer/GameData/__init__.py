@@ -0,0 +1,14 @@
+from typing import TYPE_CHECKING
+
+from ModAnalyzer.lazy_imports import get_lazy_getattr
+
+if TYPE_CHECKING:
+    from .vanilla_index import VanillaIndex, VanillaIndexBuilder  # noqa: F401
+
+__getattr__, __dir__ = get_lazy_getattr(
+    __name__,
+    {
+        "VanillaIndex": ".vanilla_index",
+        "VanillaIndexBuilder": ".vanilla_index",
+    },
+)
@@ -0,0 +1,302 @@
+"""
+Index file layout, all integers little endian:
+
+    header      magic, version, then the offset of each section
+    section     count
+                string offsets  (count + 1) x u32, into the string blob
+                posting offsets (count + 1) x u32, into the postings
+                postings        x u32
+                flags           count x u8
+                string blob     UTF-8
+
+Strings in a section are sorted so lookups are a binary search
+directly over the mapped file. Postings link a table to the indexes
+of its entries in the categories section, and an entry to the indexes
+of the tables it is in.
+"""
+
+import logging
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+
+from ModAnalyzer.analysis_cache import AnalysisCache
+from ModAnalyzer.Stats.stats_parser import StatsParser
+from ModAnalyzer.TreasureTable.models import TreasureTableStore
+from ModAnalyzer.TreasureTable.treasure_table_parser import TreasureTableParser
+from ModAnalyzer.TreasureTable.treasure_table_reader import TreasureTableReader
+
+HEADER = struct.Struct("<4sIQQQ")
+U32 = struct.Struct("<I")
+
+
+class MappedSection(Sequence):
+    """One sorted string section of a mapped index file"""
+
+    def __init__(self, buffer: mmap.mmap, offset: int):
+        self.buffer = buffer
+        self.count = U32.unpack_from(buffer, offset)[0]
+        self.string_offsets = offset + U32.size
+        self.posting_offsets = self.string_offsets + (self.count + 1) * U32.size
+        self.postings = self.posting_offsets + (self.count + 1) * U32.size
+        num_postings = self.get_u32(self.posting_offsets, self.count)
+        self.flags = self.postings + num_postings * U32.size
+        self.strings = self.flags + self.count
+
+    def get_u32(self, start: int, index: int) -> int:
+        return U32.unpack_from(self.buffer, start + index * U32.size)[0]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> str:
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        start = self.get_u32(self.string_offsets, index)
+        end = self.get_u32(self.string_offsets, index + 1)
+        return self.buffer[self.strings + start : self.strings + end].decode("UTF-8")
+
+    def find(self, value: str) -> int:
+        """Returns the index of value, or -1"""
+        index = bisect_left(self, value)
+        if index < self.count and self[index] == value:
+            return index
+        return -1
+
+    def get_postings(self, index: int) -> list[int]:
+        start = self.get_u32(self.posting_offsets, index)
+        end = self.get_u32(self.posting_offsets, index + 1)
+        return [self.get_u32(self.postings, posting) for posting in range(start, end)]
+
+    def get_flags(self, index: int) -> int:
+        return self.buffer[self.flags + index]
+
+
+class VanillaIndex:
+    """
+    Read only lookups into an index built by VanillaIndexBuilder. The
+    file is memory mapped, so opening it is cheap and only the pages a
+    lookup touches are read.
+
+    with VanillaIndex("vanilla.idx") as index:
+        index.has_category("I_OBJ_RUNE_ROF_BONE_ARMOR")
+    """
+
+    MAGIC = b"MAVI"
+    VERSION = 1
+    DEFAULT_PATH = os.path.join(AnalysisCache.DEFAULT_CACHE_DIR, "vanilla.idx")
+    CAN_MERGE = TreasureTableStore.CAN_MERGE
+
+    def __init__(self, index_path: str = DEFAULT_PATH):
+        self.index_path = index_path
+        with open(index_path, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, *section_offsets = HEADER.unpack_from(self.buffer, 0)
+            if magic != self.MAGIC or version != self.VERSION:
+                raise ValueError(
+                    f"{index_path} is not a version {self.VERSION} vanilla index, "
+                    "rebuild it with index-vanilla"
+                )
+        except (struct.error, ValueError):
+            self.buffer.close()
+            raise
+
+        tables_offset, categories_offset, stats_offset = section_offsets
+        self.tables = MappedSection(self.buffer, tables_offset)
+        self.categories = MappedSection(self.buffer, categories_offset)
+        self.stats = MappedSection(self.buffer, stats_offset)
+
+    @classmethod
+    def open_if_exists(cls, index_path: str = DEFAULT_PATH) -> "VanillaIndex | None":
+        if not os.path.isfile(index_path):
+            return None
+        try:
+            return cls(index_path)
+        except (OSError, ValueError, struct.error) as err:
+            logging.getLogger(__name__).error(
+                f"Unable to open vanilla index {index_path}: {err}"
+            )
+            return None
+
+    def close(self):
+        self.buffer.close()
+
+    def __enter__(self) -> "VanillaIndex":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __getstate__(self):
+        # Worker processes map the file again instead of copying it
+        return {"index_path": self.index_path}
+
+    def __setstate__(self, state: dict):
+        self.__init__(state["index_path"])
+
+    def has_table(self, table_name: str) -> bool:
+        return self.tables.find(table_name) >= 0
+
+    def has_category(self, object_category_name: str) -> bool:
+        return self.categories.find(object_category_name) >= 0
+
+    def has_stats(self, stats_name: str) -> bool:
+        return self.stats.find(stats_name) >= 0
+
+    def can_merge(self, table_name: str) -> bool:
+        index = self.tables.find(table_name)
+        return index >= 0 and bool(self.tables.get_flags(index) & self.CAN_MERGE)
+
+    def get_table_entries(self, table_name: str) -> list[str]:
+        """Entry names in a vanilla table, in name order"""
+        index = self.tables.find(table_name)
+        if index < 0:
+            return []
+        return [self.categories[entry] for entry in self.tables.get_postings(index)]
+
+    def get_tables_with_category(self, object_category_name: str) -> list[str]:
+        index = self.categories.find(object_category_name)
+        if index < 0:
+            return []
+        return [self.tables[table] for table in self.categories.get_postings(index)]
+
+    def get_summary(self) -> dict[str, int]:
+        return {
+            "tables": len(self.tables),
+            "categories": len(self.categories),
+            "stats": len(self.stats),
+        }
+
+
+class VanillaIndexBuilder:
+    """
+    Reads the treasure tables and stats of an unpacked game data tree
+    once and writes them to a VanillaIndex file
+
+    Every Stats/Generated/TreasureTable.txt and Stats/Generated/Data/*.txt
+    under the data dir is read, so the tree can hold any set of
+    unpacked paks (Shared, Gustav, ...).
+    """
+
+    def __init__(self, data_dir: str):
+        self.logger = logging.getLogger(__name__)
+        self.data_dir = Path(data_dir)
+        self.tt_parser = TreasureTableParser()
+        self.stats_parser = StatsParser()
+        self.reader = TreasureTableReader()
+
+    def get_stats_dirs(self) -> Iterator[Path]:
+        for generated_dir in self.data_dir.rglob("Stats/Generated"):
+            if generated_dir.is_dir():
+                yield generated_dir
+
+    def get_treasure_table_store(self) -> TreasureTableStore:
+        store = TreasureTableStore()
+        for stats_dir in sorted(self.get_stats_dirs()):
+            tt_path = stats_dir / "TreasureTable.txt"
+            if tt_path.is_file():
+                self.logger.debug(f"Indexing {tt_path}")
+                for table in self.tt_parser.iter_treasure_tables(
+                    self.reader.iter_lines(str(tt_path))
+                ):
+                    store.add_table(table)
+        return store
+
+    def iter_stats_names(self) -> Iterator[str]:
+        for stats_dir in sorted(self.get_stats_dirs()):
+            for stats_path in sorted((stats_dir / "Data").glob("*.txt")):
+                for entry in self.stats_parser.iter_entries(
+                    self.reader.iter_lines(str(stats_path))
+                ):
+                    yield entry.name
+
+    @staticmethod
+    def get_section_bytes(
+        strings: list[str],
+        postings: list[Iterable[int]] | None = None,
+        flags: list[int] | None = None,
+    ) -> bytes:
+        """strings must already be sorted"""
+        encoded = [value.encode("UTF-8") for value in strings]
+        string_offsets = [0]
+        for value in encoded:
+            string_offsets.append(string_offsets[-1] + len(value))
+
+        posting_offsets = [0]
+        packed_postings: list[int] = []
+        for values in postings or [[] for _ in strings]:
+            packed_postings.extend(values)
+            posting_offsets.append(len(packed_postings))
+
+        return b"".join(
+            [
+                U32.pack(len(strings)),
+                struct.pack(f"<{len(string_offsets)}I", *string_offsets),
+                struct.pack(f"<{len(posting_offsets)}I", *posting_offsets),
+                struct.pack(f"<{len(packed_postings)}I", *packed_postings),
+                bytes(flags or [0] * len(strings)),
+                *encoded,
+            ]
+        )
+
+    def build(self, index_path: str = VanillaIndex.DEFAULT_PATH) -> dict[str, int]:
+        """Writes the index and returns how many of each thing it holds"""
+        store = self.get_treasure_table_store()
+        stats_names = sorted(set(self.iter_stats_names()))
+
+        table_names = sorted(store.get_table_names())
+        category_names = sorted(
+            {store.strings[category_id] for category_id in store.category_ids}
+        )
+        category_indexes = {name: index for index, name in enumerate(category_names)}
+
+        table_entries: list[list[int]] = []
+        table_flags: list[int] = []
+        category_tables: list[list[int]] = [[] for _ in category_names]
+        for table_index, table_name in enumerate(table_names):
+            entries = store.get_entries(table_name)
+            entry_indexes = sorted(
+                category_indexes[entry.object_category_name] for entry in entries
+            )
+            table_entries.append(entry_indexes)
+            table_flags.append(
+                TreasureTableStore.CAN_MERGE if store.can_merge(table_name) else 0
+            )
+            for category_index in entry_indexes:
+                category_tables[category_index].append(table_index)
+
+        sections = [
+            self.get_section_bytes(table_names, table_entries, table_flags),
+            self.get_section_bytes(category_names, category_tables),
+            self.get_section_bytes(stats_names),
+        ]
+        section_offsets: list[int] = []
+        offset = HEADER.size
+        for section in sections:
+            section_offsets.append(offset)
+            offset += len(section)
+
+        os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+        # Written next to the index and moved over it, so an open
+        # index is never read half written
+        temp_path = f"{index_path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(
+                HEADER.pack(VanillaIndex.MAGIC, VanillaIndex.VERSION, *section_offsets)
+            )
+            for section in sections:
+                file.write(section)
+        os.replace(temp_path, index_path)
+
+        summary = {
+            "tables": len(table_names),
+            "categories": len(category_names),
+            "stats": len(stats_names),
+        }
+        self.logger.info(f"Wrote vanilla index to {index_path}: {summary}")
+        return summary
@@ -0,0 +1,17 @@
+from typing import TYPE_CHECKING
+
+from ModAnalyzer.lazy_imports import get_lazy_getattr
+
+if TYPE_CHECKING:
+    from .lsf_reader import LSFAttribute, LSFReader  # noqa: F401
+    from .pak_reader import PakEntry, PakReader  # noqa: F401
+
+__getattr__, __dir__ = get_lazy_getattr(
+    __name__,
+    {
+        "LSFAttribute": ".lsf_reader",
+        "LSFReader": ".lsf_reader",
+        "PakEntry": ".pak_reader",
+        "PakReader": ".pak_reader",
+    },
+)
@@ -0,0 +1,161 @@
+import struct
+import zlib
+
+# The low bits of a pak entry's (or LSF section's) flags
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_LZ4 = 2
+COMPRESSION_ZSTD = 3
+COMPRESSION_METHOD_MASK = 0x0F
+
+LZ4_MIN_MATCH = 4
+LZ4_FRAME_MAGIC = 0x184D2204
+LZ4_FRAME_BLOCK_CHECKSUM = 0x10
+LZ4_FRAME_CONTENT_SIZE = 0x08
+LZ4_FRAME_CONTENT_CHECKSUM = 0x04
+LZ4_FRAME_DICT_ID = 0x01
+# Set in a block's size when the block is stored as is
+LZ4_FRAME_UNCOMPRESSED_BLOCK = 0x80000000
+
+
+def get_lz4_length(source: memoryview, position: int, length: int) -> tuple[int, int]:
+    """Adds the extra length bytes that follow a nibble of 15"""
+    if length == 15:
+        while True:
+            extra = source[position]
+            position += 1
+            length += extra
+            if extra != 255:
+                break
+    return length, position
+
+
+def decompress_lz4_block_into(source: bytes | memoryview, output: bytearray):
+    """
+    Decodes an LZ4 block onto the end of output. Matches can reach
+    back into what is already in output, which is how linked blocks of
+    an LZ4 frame are decoded.
+    """
+    source = memoryview(source)
+    position = 0
+    end = len(source)
+
+    try:
+        while position < end:
+            token = source[position]
+            position += 1
+
+            literal_length, position = get_lz4_length(source, position, token >> 4)
+            output += source[position : position + literal_length]
+            position += literal_length
+            # The last sequence is only literals
+            if position >= end:
+                break
+
+            offset = source[position] | (source[position + 1] << 8)
+            position += 2
+            if offset == 0 or offset > len(output):
+                raise ValueError(f"Invalid LZ4 match offset {offset}")
+
+            match_length, position = get_lz4_length(source, position, token & 0x0F)
+            match_length += LZ4_MIN_MATCH
+            start = len(output) - offset
+            if match_length <= offset:
+                output += output[start : start + match_length]
+            else:
+                # The match overlaps what it writes, so it repeats the
+                # last offset bytes
+                pattern = output[start:]
+                repeats, remainder = divmod(match_length, offset)
+                output += pattern * repeats + pattern[:remainder]
+    except IndexError:
+        raise ValueError("Truncated LZ4 block") from None
+
+
+def decompress_lz4_block(source: bytes | memoryview, uncompressed_size: int) -> bytes:
+    output = bytearray()
+    decompress_lz4_block_into(source, output)
+    if len(output) != uncompressed_size:
+        raise ValueError(
+            f"LZ4 block decoded to {len(output)} bytes, expected {uncompressed_size}"
+        )
+    return bytes(output)
+
+
+def decompress_lz4_frame(source: bytes | memoryview) -> bytes:
+    """
+    Decodes an LZ4 frame, which is what LSF files use. Blocks are
+    decoded onto the same output, so linked blocks just work.
+    Checksums are skipped, not verified.
+    """
+    source = memoryview(source)
+    output = bytearray()
+
+    try:
+        magic, frame_flags = struct.unpack_from("<IB", source, 0)
+        if magic != LZ4_FRAME_MAGIC:
+            raise ValueError(f"Invalid LZ4 frame magic {magic:#x}")
+
+        # Magic, flags and block size, then the optional fields, then
+        # the header checksum
+        position = 6
+        if frame_flags & LZ4_FRAME_CONTENT_SIZE:
+            position += 8
+        if frame_flags & LZ4_FRAME_DICT_ID:
+            position += 4
+        position += 1
+        block_checksum_size = 4 if frame_flags & LZ4_FRAME_BLOCK_CHECKSUM else 0
+
+        while True:
+            block_size = struct.unpack_from("<I", source, position)[0]
+            position += 4
+            if block_size == 0:
+                break
+
+            stored = block_size & LZ4_FRAME_UNCOMPRESSED_BLOCK
+            block_size &= ~LZ4_FRAME_UNCOMPRESSED_BLOCK
+            block = source[position : position + block_size]
+            if len(block) != block_size:
+                raise ValueError("Truncated LZ4 frame")
+            if stored:
+                output += block
+            else:
+                decompress_lz4_block_into(block, output)
+            position += block_size + block_checksum_size
+    except struct.error:
+        raise ValueError("Truncated LZ4 frame") from None
+
+    return bytes(output)
+
+
+def decompress_zstd(source: bytes | memoryview) -> bytes:
+    try:
+        # Only in the standard library from Python 3.14
+        from compression import zstd
+    except ImportError:
+        raise ValueError("Reading zstd compressed files needs Python 3.14") from None
+    return zstd.decompress(source)
+
+
+def decompress(
+    source: bytes | memoryview, flags: int, uncompressed_size: int, chunked=False
+) -> bytes:
+    """
+    Decompresses with the method in the low bits of flags. Chunked LZ4
+    data is a frame rather than a single block.
+    """
+    method = flags & COMPRESSION_METHOD_MASK
+    if method == COMPRESSION_NONE:
+        return bytes(source)
+    if method == COMPRESSION_ZLIB:
+        try:
+            return zlib.decompress(source)
+        except zlib.error as err:
+            raise ValueError(f"Invalid zlib data: {err}") from None
+    if method == COMPRESSION_LZ4 and chunked:
+        return decompress_lz4_frame(source)
+    if method == COMPRESSION_LZ4:
+        return decompress_lz4_block(source, uncompressed_size)
+    if method == COMPRESSION_ZSTD:
+        return decompress_zstd(source)
+    raise ValueError(f"Unknown compression method {method}")
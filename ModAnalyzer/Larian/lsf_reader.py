@@ -0,0 +1,400 @@
+"""
+LSF (binary LSX) layout, all integers little endian:
+
+    magic       "LSOF"
+    header      version u32, engine version u32 (u64 from version 5)
+    metadata    uncompressed size u32 and size on disk u32 for each
+                section, compression flags u8, u8, u16, then a u32
+                that says whether nodes and attributes are the long
+                kind. From version 6 there is a keys section too.
+    sections    strings, nodes, attributes, values (then keys), each
+                stored as is when its size on disk is 0. From version
+                2, every section but strings is an LZ4 frame when the
+                file is LZ4 compressed.
+
+    strings     number of buckets u32, then per bucket: number of
+                names u16, then per name: length u16, UTF-8 bytes
+    node        name u32 (bucket << 16 | index), parent i32, next
+                sibling i32, first attribute i32. The short kind has
+                name, first attribute, parent.
+    attribute   name u32, type u6 | length << 6, next attribute i32,
+                offset in values u32. The short kind has name, type and
+                length, node i32, and values are in attribute order.
+
+A node without a parent is a region, like <region id="Templates">.
+"""
+
+import mmap
+import os
+import struct
+import uuid
+from collections.abc import Iterator
+from typing import NamedTuple
+
+from ModAnalyzer.Larian.compression import (
+    COMPRESSION_METHOD_MASK,
+    COMPRESSION_NONE,
+    decompress,
+)
+
+MAGIC = b"LSOF"
+VERSION_HEADER = struct.Struct("<4sI")
+# Chunked (LZ4 frame) compression
+VERSION_CHUNKED = 2
+# Long nodes and attributes
+VERSION_EXTENDED_NODES = 3
+# 64 bit engine version
+VERSION_EXTENDED_HEADER = 5
+# Metadata with a keys section
+VERSION_KEYS = 6
+METADATA_V5 = struct.Struct("<8IBBHI")
+METADATA_V6 = struct.Struct("<10IBBHI")
+METADATA_FORMAT_KEYS_AND_ADJACENCY = 1
+
+NODE_SHORT = struct.Struct("<Iii")
+NODE_LONG = struct.Struct("<Iiii")
+ATTRIBUTE_SHORT = struct.Struct("<IIi")
+ATTRIBUTE_LONG = struct.Struct("<IIiI")
+
+# Type id => the type name LSX files use
+TYPE_NAMES = [
+    "None",
+    "uint8",
+    "int16",
+    "uint16",
+    "int32",
+    "uint32",
+    "float",
+    "double",
+    "ivec2",
+    "ivec3",
+    "ivec4",
+    "fvec2",
+    "fvec3",
+    "fvec4",
+    "mat2x2",
+    "mat3x3",
+    "mat3x4",
+    "mat4x3",
+    "mat4x4",
+    "bool",
+    "string",
+    "path",
+    "FixedString",
+    "LSString",
+    "uint64",
+    "ScratchBuffer",
+    "old_int64",
+    "int8",
+    "TranslatedString",
+    "WString",
+    "LSWString",
+    "guid",
+    "int64",
+    "TranslatedFSString",
+]
+STRING_TYPES = {"string", "path", "FixedString", "LSString", "WString", "LSWString"}
+# Type name => struct format for fixed size values
+SCALAR_FORMATS = {
+    "uint8": "<B",
+    "int16": "<h",
+    "uint16": "<H",
+    "int32": "<i",
+    "uint32": "<I",
+    "float": "<f",
+    "double": "<d",
+    "ivec2": "<2i",
+    "ivec3": "<3i",
+    "ivec4": "<4i",
+    "fvec2": "<2f",
+    "fvec3": "<3f",
+    "fvec4": "<4f",
+    "mat2x2": "<4f",
+    "mat3x3": "<9f",
+    "mat3x4": "<12f",
+    "mat4x3": "<12f",
+    "mat4x4": "<16f",
+    "bool": "<?",
+    "uint64": "<Q",
+    "old_int64": "<q",
+    "int8": "<b",
+    "int64": "<q",
+}
+
+
+class LSFAttribute(NamedTuple):
+    # The LSX type name, e.g. FixedString
+    type_name: str
+    # Strings for string types and the handle for TranslatedStrings,
+    # numbers or tuples of numbers otherwise
+    value: object
+
+
+class LSFReader:
+    """
+    Reads binary .lsf resources without converting them to LSX first.
+
+    Files are memory mapped, and sections that are stored uncompressed
+    are read through memoryviews over the mapping without copying.
+    Node and attribute tables are read when the file is opened, and
+    values are only decoded when they are asked for.
+
+    with LSFReader("RunesOfFaerun.lsf") as lsf:
+        for node_index in lsf.get_children(lsf.get_region("Templates")):
+            lsf.get_attributes(node_index)["Stats"].value
+    """
+
+    def __init__(self, source: str | os.PathLike | bytes):
+        self.path = str(source) if isinstance(source, (str, os.PathLike)) else ""
+        self.mapping: mmap.mmap | None = None
+        # Every view over the mapping, released on close
+        self.views: list[memoryview] = []
+
+        if self.path:
+            with open(self.path, "rb") as file:
+                self.mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            buffer = self.get_view(self.mapping)
+        else:
+            buffer = memoryview(source)
+
+        # Node index => child indexes, built on first use
+        self.children: dict[int, list[int]] | None = None
+        try:
+            self.read_sections(buffer)
+        except (struct.error, ValueError, IndexError, UnicodeDecodeError) as err:
+            self.close()
+            raise ValueError(f"{self.path or 'Data'} is not a readable LSF: {err}")
+
+    def get_view(self, source) -> memoryview:
+        view = memoryview(source)
+        self.views.append(view)
+        return view
+
+    def read_sections(self, buffer: memoryview):
+        magic, self.version = VERSION_HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("missing LSOF magic")
+
+        position = VERSION_HEADER.size
+        position += 8 if self.version >= VERSION_EXTENDED_HEADER else 4
+
+        if self.version >= VERSION_KEYS:
+            metadata = METADATA_V6.unpack_from(buffer, position)
+            position += METADATA_V6.size
+            section_sizes = [
+                metadata[0:2],
+                metadata[4:6],
+                metadata[6:8],
+                metadata[8:10],
+            ]
+        else:
+            metadata = METADATA_V5.unpack_from(buffer, position)
+            position += METADATA_V5.size
+            section_sizes = [metadata[0:2], metadata[2:4], metadata[4:6], metadata[6:8]]
+        self.compression_flags = metadata[-4]
+        is_long = (
+            self.version >= VERSION_EXTENDED_NODES
+            and metadata[-1] == METADATA_FORMAT_KEYS_AND_ADJACENCY
+        )
+
+        sections: list[memoryview | bytes] = []
+        for section_index, (uncompressed_size, size_on_disk) in enumerate(
+            section_sizes
+        ):
+            # Strings are always one compressed block, like in LSLib,
+            # only the other sections are LZ4 frames
+            section, position = self.read_section(
+                buffer,
+                position,
+                uncompressed_size,
+                size_on_disk,
+                chunked=section_index > 0 and self.version >= VERSION_CHUNKED,
+            )
+            sections.append(section)
+        strings, nodes, attributes, self.values = sections
+
+        self.names = self.read_names(strings)
+        self.read_nodes(nodes, is_long)
+        self.read_attributes(attributes, is_long)
+
+    def read_section(
+        self,
+        buffer: memoryview,
+        position: int,
+        uncompressed_size: int,
+        size_on_disk: int,
+        chunked: bool = False,
+    ) -> tuple[memoryview | bytes, int]:
+        """Returns the section's contents and the position after it"""
+        if size_on_disk == 0:
+            end = position + uncompressed_size
+            if end > len(buffer):
+                raise ValueError("section runs past the end of the file")
+            return self.get_view(buffer[position:end]), end
+
+        is_compressed = (
+            self.compression_flags & COMPRESSION_METHOD_MASK != COMPRESSION_NONE
+        )
+        end = position + (size_on_disk if is_compressed else uncompressed_size)
+        with buffer[position:end] as stored:
+            contents = decompress(
+                stored,
+                self.compression_flags,
+                uncompressed_size,
+                chunked=chunked,
+            )
+        return contents, end
+
+    def read_names(self, strings: memoryview | bytes) -> list[list[str]]:
+        names: list[list[str]] = []
+        num_buckets = struct.unpack_from("<I", strings, 0)[0]
+        position = 4
+        for _ in range(num_buckets):
+            num_names = struct.unpack_from("<H", strings, position)[0]
+            position += 2
+            bucket: list[str] = []
+            for _ in range(num_names):
+                length = struct.unpack_from("<H", strings, position)[0]
+                position += 2
+                bucket.append(bytes(strings[position : position + length]).decode())
+                position += length
+            names.append(bucket)
+        return names
+
+    def get_name(self, name_index: int) -> str:
+        return self.names[name_index >> 16][name_index & 0xFFFF]
+
+    def read_nodes(self, nodes: memoryview | bytes, is_long: bool):
+        self.node_names: list[str] = []
+        self.node_parents: list[int] = []
+        self.node_attributes: list[int] = []
+
+        if is_long:
+            for name, parent, _, first_attribute in NODE_LONG.iter_unpack(nodes):
+                self.node_names.append(self.get_name(name))
+                self.node_parents.append(parent)
+                self.node_attributes.append(first_attribute)
+        else:
+            for name, first_attribute, parent in NODE_SHORT.iter_unpack(nodes):
+                self.node_names.append(self.get_name(name))
+                self.node_parents.append(parent)
+                self.node_attributes.append(first_attribute)
+
+    def read_attributes(self, attributes: memoryview | bytes, is_long: bool):
+        self.attribute_names: list[str] = []
+        self.attribute_types: list[int] = []
+        self.attribute_offsets: list[int] = []
+        self.attribute_lengths: list[int] = []
+        self.attribute_next: list[int] = []
+
+        if is_long:
+            for name, type_length, next_index, offset in ATTRIBUTE_LONG.iter_unpack(
+                attributes
+            ):
+                self.attribute_names.append(self.get_name(name))
+                self.attribute_types.append(type_length & 0x3F)
+                self.attribute_lengths.append(type_length >> 6)
+                self.attribute_offsets.append(offset)
+                self.attribute_next.append(next_index)
+            return
+
+        # Short attributes are stored in order, so offsets add up and
+        # each one is linked to the previous one of the same node
+        offset = 0
+        last_attribute: dict[int, int] = {}
+        for index, (name, type_length, node_index) in enumerate(
+            ATTRIBUTE_SHORT.iter_unpack(attributes)
+        ):
+            self.attribute_names.append(self.get_name(name))
+            self.attribute_types.append(type_length & 0x3F)
+            self.attribute_lengths.append(type_length >> 6)
+            self.attribute_offsets.append(offset)
+            self.attribute_next.append(-1)
+            offset += type_length >> 6
+
+            if node_index in last_attribute:
+                self.attribute_next[last_attribute[node_index]] = index
+            last_attribute[node_index] = index
+
+    def close(self):
+        for view in reversed(self.views):
+            view.release()
+        self.views = []
+        if self.mapping is not None:
+            self.mapping.close()
+            self.mapping = None
+
+    def __enter__(self) -> "LSFReader":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def get_node_count(self) -> int:
+        return len(self.node_names)
+
+    def get_node_name(self, node_index: int) -> str:
+        return self.node_names[node_index]
+
+    def get_region(self, region_name: str) -> int:
+        """Returns the index of the region's node, or -1"""
+        for node_index, name in enumerate(self.node_names):
+            if name == region_name and self.node_parents[node_index] == -1:
+                return node_index
+        return -1
+
+    def get_children(self, node_index: int) -> list[int]:
+        if self.children is None:
+            self.children = {}
+            for child_index, parent_index in enumerate(self.node_parents):
+                self.children.setdefault(parent_index, []).append(child_index)
+        return self.children.get(node_index, [])
+
+    def iter_attribute_indexes(self, node_index: int) -> Iterator[int]:
+        attribute_index = self.node_attributes[node_index]
+        while attribute_index >= 0:
+            yield attribute_index
+            attribute_index = self.attribute_next[attribute_index]
+
+    def get_attributes(self, node_index: int) -> dict[str, LSFAttribute]:
+        return {
+            self.attribute_names[attribute_index]: self.get_attribute(attribute_index)
+            for attribute_index in self.iter_attribute_indexes(node_index)
+        }
+
+    def get_attribute_name(self, attribute_index: int) -> str:
+        return self.attribute_names[attribute_index]
+
+    def get_attribute_type_name(self, attribute_index: int) -> str:
+        type_id = self.attribute_types[attribute_index]
+        return TYPE_NAMES[type_id] if type_id < len(TYPE_NAMES) else str(type_id)
+
+    def get_attribute(self, attribute_index: int) -> LSFAttribute:
+        type_name = self.get_attribute_type_name(attribute_index)
+        offset = self.attribute_offsets[attribute_index]
+        value = self.values[offset : offset + self.attribute_lengths[attribute_index]]
+        return LSFAttribute(type_name, self.get_value(type_name, value))
+
+    def get_string(self, value: memoryview | bytes) -> str:
+        # Stored with their NUL terminator
+        return bytes(value).rstrip(b"\0").decode("UTF-8", errors="replace")
+
+    def get_value(self, type_name: str, value: memoryview | bytes) -> object:
+        if type_name in STRING_TYPES:
+            return self.get_string(value)
+
+        if type_name in ("TranslatedString", "TranslatedFSString"):
+            # Version u16, then the handle. TranslatedFSStrings have
+            # arguments after the handle, which aren't needed here.
+            handle_length = struct.unpack_from("<i", value, 2)[0]
+            return self.get_string(value[6 : 6 + handle_length])
+
+        if type_name == "guid":
+            return str(uuid.UUID(bytes_le=bytes(value)))
+
+        scalar_format = SCALAR_FORMATS.get(type_name)
+        if scalar_format is not None:
+            values = struct.unpack_from(scalar_format, value, 0)
+            return values[0] if len(values) == 1 else values
+
+        return bytes(value)
@@ -0,0 +1,202 @@
+"""
+LSPK archive layout, all integers little endian:
+
+    magic       "LSPK"
+    header      version u32, file list offset u64, file list size u32,
+                flags u8, priority u8, md5 16 bytes, then from
+                version 16 the number of parts u16
+    file list   at the file list offset: number of files u32,
+                compressed size u32, then an LZ4 block of entries
+    entry       version 18 (BG3): name 256 bytes of NUL padded UTF-8,
+                offset u32 + u16, archive part u8, flags u8,
+                size on disk u32, uncompressed size u32
+                versions 15 and 16: name, offset u64, size on disk u64,
+                uncompressed size u64, archive part u32, flags u32,
+                crc u32, unknown u32
+
+Files with archive part N > 0 are in Name_N.pak next to Name.pak.
+"""
+
+import io
+import logging
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+
+from ModAnalyzer.Larian.compression import (
+    COMPRESSION_METHOD_MASK,
+    COMPRESSION_NONE,
+    decompress,
+    decompress_lz4_block,
+)
+
+MAGIC = b"LSPK"
+HEADER_15 = struct.Struct("<IQIBB16s")
+HEADER_16 = struct.Struct("<IQIBB16sH")
+FILE_LIST_HEADER = struct.Struct("<II")
+ENTRY_15 = struct.Struct("<256sQQQIIII")
+ENTRY_18 = struct.Struct("<256sIHBBII")
+# Files are compressed together, which this reader doesn't handle
+FLAG_SOLID = 0x04
+
+
+@dataclass(slots=True)
+class PakEntry:
+    name: str
+    offset: int
+    size_on_disk: int
+    uncompressed_size: int
+    archive_part: int
+    flags: int
+
+    @property
+    def is_compressed(self) -> bool:
+        return self.flags & COMPRESSION_METHOD_MASK != COMPRESSION_NONE
+
+    @property
+    def size(self) -> int:
+        return self.uncompressed_size if self.is_compressed else self.size_on_disk
+
+
+class PakReader:
+    """
+    Reads files out of a .pak without unpacking it. The archive is
+    memory mapped and its file list is read once, then each file is
+    only read (and decompressed) when it is asked for.
+
+    with PakReader("RunesOfFaerun.pak") as pak:
+        meta = pak.read("Mods/RunesOfFaerun/meta.lsx")
+    """
+
+    SUPPORTED_VERSIONS = (15, 16, 18)
+
+    def __init__(self, pak_path: str):
+        self.logger = logging.getLogger(__name__)
+        self.pak_path = pak_path
+        self.entries: dict[str, PakEntry] = {}
+        # Archive part => mapped file, part 0 is pak_path itself
+        self.buffers: dict[int, mmap.mmap] = {}
+
+        buffer = self.get_buffer(0)
+        try:
+            self.version, self.flags = self.read_file_list(buffer)
+        except (struct.error, ValueError) as err:
+            self.close()
+            raise ValueError(f"{pak_path} is not a readable LSPK archive: {err}")
+
+        self.logger.debug(
+            f"Read {len(self.entries)} entries from {pak_path} (v{self.version})"
+        )
+
+    def get_part_path(self, archive_part: int) -> str:
+        if archive_part == 0:
+            return self.pak_path
+        path = Path(self.pak_path)
+        return str(path.with_name(f"{path.stem}_{archive_part}{path.suffix}"))
+
+    def get_buffer(self, archive_part: int) -> mmap.mmap:
+        buffer = self.buffers.get(archive_part)
+        if buffer is None:
+            with open(self.get_part_path(archive_part), "rb") as file:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.buffers[archive_part] = buffer
+        return buffer
+
+    def read_file_list(self, buffer: mmap.mmap) -> tuple[int, int]:
+        """Fills entries and returns (version, flags)"""
+        if buffer[: len(MAGIC)] != MAGIC:
+            raise ValueError("missing LSPK magic")
+
+        version = struct.unpack_from("<I", buffer, len(MAGIC))[0]
+        if version not in self.SUPPORTED_VERSIONS:
+            raise ValueError(f"version {version} is not supported")
+
+        header = HEADER_15 if version == 15 else HEADER_16
+        _, file_list_offset, _, flags, *_ = header.unpack_from(buffer, len(MAGIC))
+        if flags & FLAG_SOLID:
+            raise ValueError("solid archives are not supported")
+
+        num_files, compressed_size = FILE_LIST_HEADER.unpack_from(
+            buffer, file_list_offset
+        )
+        entry_struct = ENTRY_18 if version == 18 else ENTRY_15
+        start = file_list_offset + FILE_LIST_HEADER.size
+        with memoryview(buffer)[start : start + compressed_size] as compressed:
+            file_list = decompress_lz4_block(compressed, num_files * entry_struct.size)
+
+        for values in entry_struct.iter_unpack(file_list):
+            entry = self.get_entry_from_values(version, values)
+            self.entries[entry.name] = entry
+
+        return version, flags
+
+    def get_entry_from_values(self, version: int, values: tuple) -> PakEntry:
+        name = values[0].split(b"\0", 1)[0].decode("UTF-8").replace("\\", "/")
+        if version == 18:
+            _, offset_low, offset_high, part, flags, size_on_disk, size = values
+            offset = offset_low | (offset_high << 32)
+        else:
+            _, offset, size_on_disk, size, part, flags, *_ = values
+        return PakEntry(
+            name=name,
+            offset=offset,
+            size_on_disk=size_on_disk,
+            uncompressed_size=size,
+            archive_part=part,
+            flags=flags,
+        )
+
+    @classmethod
+    def open_if_exists(cls, pak_path: str) -> "PakReader | None":
+        if not os.path.isfile(pak_path):
+            return None
+        try:
+            return cls(pak_path)
+        except (OSError, ValueError) as err:
+            logging.getLogger(__name__).error(f"Unable to open {pak_path}: {err}")
+            return None
+
+    def close(self):
+        for buffer in self.buffers.values():
+            buffer.close()
+        self.buffers = {}
+
+    def __enter__(self) -> "PakReader":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __getstate__(self):
+        # Worker processes map the archive again instead of copying it
+        return {"pak_path": self.pak_path}
+
+    def __setstate__(self, state: dict):
+        self.__init__(state["pak_path"])
+
+    def get_names(self, prefix: str = "") -> list[str]:
+        """Sorted names of the files under prefix, e.g. Public/RunesOfFaerun/"""
+        return sorted(name for name in self.entries if name.startswith(prefix))
+
+    def has_file(self, name: str) -> bool:
+        return name in self.entries
+
+    def get_entry(self, name: str) -> PakEntry:
+        """Raises KeyError if the archive has no file with that name"""
+        return self.entries[name]
+
+    def read(self, name: str) -> bytes:
+        entry = self.get_entry(name)
+        buffer = self.get_buffer(entry.archive_part)
+        end = entry.offset + entry.size_on_disk
+        if end > len(buffer):
+            raise ValueError(f"{name} runs past the end of {self.pak_path}")
+
+        # Released before returning, so the archive can still be closed
+        with memoryview(buffer)[entry.offset : end] as data:
+            return decompress(data, entry.flags, entry.uncompressed_size)
+
+    def open(self, name: str) -> io.BytesIO:
+        return io.BytesIO(self.read(name))
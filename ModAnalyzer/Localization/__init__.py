@@ -0,0 +1,17 @@
+from typing import TYPE_CHECKING
+
+from ModAnalyzer.lazy_imports import get_lazy_getattr
+
+if TYPE_CHECKING:
+    from .localization_analyzer import (  # noqa: F401
+        LocalizationAnalyzer,
+        LocalizationReport,
+    )
+
+__getattr__, __dir__ = get_lazy_getattr(
+    __name__,
+    {
+        "LocalizationAnalyzer": ".localization_analyzer",
+        "LocalizationReport": ".localization_analyzer",
+    },
+)
@@ -0,0 +1,200 @@
+import logging
+import re
+import xml.etree.ElementTree as ET
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ModAnalyzer.analysis_cache import AnalysisCache
+from ModAnalyzer.mod_fs import ModFS
+from ModAnalyzer.Structure.structure_analyzer import StructureAnalyzer
+from ModAnalyzer.timings import Timings
+from ModAnalyzer.TreasureTable.models import TemplateRecord
+from ModAnalyzer.TreasureTable.treasure_table_analyzer import TreasureTableAnalyzer
+
+# What the editor writes for a TranslatedString that was never set
+UNKNOWN_HANDLE = "ls::TranslatedStringRepository::s_HandleUnknown"
+# Stats files reference handles like data "DisplayName" "h5f6...;1"
+HANDLE_PATTERN = re.compile(r"\bh[0-9a-g]{36}\b")
+
+
+@dataclass
+class LocalizationReport:
+    has_localization: bool = False
+    localization_files: list[str] = field(default_factory=list)
+    num_entries: int = 0
+    # Handle => where it is used, e.g. "Root template ROF_Rune DisplayName"
+    missing_handles: dict[str, list[str]] = field(default_factory=dict)
+    # Handles with more than one entry
+    duplicate_handles: list[str] = field(default_factory=list)
+    # Entries nothing in the RTs, tags or stats uses. Dialogs, scripts
+    # and Osiris aren't checked, so these are only candidates.
+    unused_handles: list[str] = field(default_factory=list)
+
+
+class LocalizationAnalyzer:
+    """
+    Checks that every TranslatedString handle used by the mod's root
+    templates, tags and stats has an entry in its localization files
+
+    <contentList>
+        <content contentuid="h339303faca4d483f970a0f16c082aef5869b" version="1">Rune of Bone Armor</content>
+    </contentList>
+
+    Localization files are pull parsed into a contentuid => count dict,
+    so large files are never held as a tree.
+    """
+
+    structure_analyzer: StructureAnalyzer
+    fs: ModFS
+    cache: AnalysisCache
+    timings: Timings
+
+    def __init__(self, **kwargs):
+        self.logger = logging.getLogger(__name__)
+        self.structure_analyzer = kwargs["structure_analyzer"]
+        self.fs = kwargs.get("fs") or self.structure_analyzer.fs
+        self.cache = kwargs.get("cache") or AnalysisCache(enabled=False)
+        self.timings = kwargs.get("timings") or Timings()
+
+    def get_localization_files(self) -> list[str]:
+        loca_path = self.structure_analyzer.get_localization_dir_path()
+        if not self.fs.is_dir(loca_path):
+            return []
+        return self.fs.get_files(loca_path, ".xml")
+
+    def parse_localization_file(self, loca_path: str) -> dict[str, int]:
+        """Returns contentuid => number of entries with it"""
+        handles: dict[str, int] = {}
+        root: ET.Element | None = None
+        size = self.fs.stat(loca_path).size
+
+        try:
+            with self.fs.open(loca_path) as loca_file:
+                for event, element in ET.iterparse(loca_file, events=("start", "end")):
+                    if root is None:
+                        root = element
+                        continue
+                    if event == "end" and element.tag == "content":
+                        handle = element.get("contentuid")
+                        if handle:
+                            handles[handle] = handles.get(handle, 0) + 1
+                        # Entries are direct children, so this drops every
+                        # entry read so far
+                        root.clear()
+        except ET.ParseError as err:
+            # Empty placeholder files created with the mod are normal
+            if size > 0:
+                self.logger.error(f"Unable to parse {loca_path}: {err}")
+
+        self.timings.count("bytes_read", size)
+        return handles
+
+    def get_handle_index(self, loca_files: list[str]) -> dict[str, int]:
+        handle_index: dict[str, int] = {}
+        for loca_path in loca_files:
+            file_handles = self.cache.get_or_parse(
+                "localization_handles",
+                loca_path,
+                lambda: self.parse_localization_file(loca_path),
+            )
+            for handle, count in file_handles.items():
+                handle_index[handle] = handle_index.get(handle, 0) + count
+        return handle_index
+
+    def get_template_records(self) -> list[TemplateRecord]:
+        tt_analyzer = TreasureTableAnalyzer(
+            cache=self.cache,
+            fs=self.fs,
+            path_analyzer=self.structure_analyzer.path_analyzer,
+        )
+        item_summary = tt_analyzer.get_item_list(self.structure_analyzer.get_rt_dir())
+        return item_summary["verified"] + item_summary["ignored"]
+
+    def iter_rt_handles(
+        self, template_records: list[TemplateRecord]
+    ) -> Iterator[tuple[str, str]]:
+        """Yields (handle, where it is used) for every RT, ignored ones too"""
+        for record in template_records:
+            for attr_id, handle in record.handles.items():
+                yield handle, f"Root template {record.name} {attr_id}"
+
+    def iter_tag_handles(self) -> Iterator[tuple[str, str]]:
+        tags_path = self.structure_analyzer.get_tags_path()
+        if not self.fs.is_dir(tags_path):
+            return
+
+        for tag_path in self.fs.get_files(tags_path, ".lsx"):
+            try:
+                tag = self.structure_analyzer.get_tag_from_file(tag_path)
+            except (ET.ParseError, KeyError) as err:
+                self.logger.error(f"Unable to read tag {tag_path}: {err}")
+                continue
+            if tag is not None:
+                yield tag.display_name, f"Tag {tag.name} DisplayName"
+                yield tag.display_description, f"Tag {tag.name} DisplayDescription"
+
+    def iter_stats_handles(self) -> Iterator[tuple[str, str]]:
+        data_path = self.structure_analyzer.get_data_path()
+        if not self.fs.is_dir(data_path):
+            return
+
+        for stats_path in self.fs.get_files(data_path, ".txt"):
+            contents = self.fs.read_text(stats_path, errors="replace")
+            for handle in HANDLE_PATTERN.findall(contents):
+                yield handle, f"Stats {Path(stats_path).name}"
+
+    def get_used_handles(
+        self, template_records: list[TemplateRecord]
+    ) -> dict[str, list[str]]:
+        """Handle => everywhere it is used"""
+        used_handles: dict[str, list[str]] = {}
+        for handle_iter in [
+            self.iter_rt_handles(template_records),
+            self.iter_tag_handles(),
+            self.iter_stats_handles(),
+        ]:
+            for handle, source in handle_iter:
+                if handle and handle != UNKNOWN_HANDLE:
+                    used_handles.setdefault(handle, []).append(source)
+        return used_handles
+
+    def generate_report(
+        self, template_records: list[TemplateRecord] | None = None
+    ) -> LocalizationReport:
+        """
+        template_records are the mod's root templates, when they have
+        already been parsed, otherwise they are read here
+        """
+        report = LocalizationReport()
+        loca_files = self.get_localization_files()
+        report.has_localization = len(loca_files) > 0
+        report.localization_files = loca_files
+
+        with self.timings.span("loca_parse"):
+            handle_index = self.get_handle_index(loca_files)
+        report.num_entries = sum(handle_index.values())
+        self.timings.count("loca_entries", report.num_entries)
+
+        with self.timings.span("verify"):
+            if template_records is None:
+                template_records = self.get_template_records()
+            used_handles = self.get_used_handles(template_records)
+            report.missing_handles = {
+                handle: sources
+                for handle, sources in used_handles.items()
+                if handle not in handle_index
+            }
+            report.duplicate_handles = sorted(
+                handle for handle, count in handle_index.items() if count > 1
+            )
+            report.unused_handles = sorted(
+                handle for handle in handle_index if handle not in used_handles
+            )
+
+        if report.missing_handles:
+            self.logger.info(
+                f"{len(report.missing_handles)} handles are not in {loca_files}"
+            )
+
+        return report
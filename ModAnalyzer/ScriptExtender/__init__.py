@@ -1 +1,8 @@
-from .se_analyzer import SEAnalyzer  # noqa: F401
+from typing import TYPE_CHECKING
+
+from ModAnalyzer.lazy_imports import get_lazy_getattr
+
+if TYPE_CHECKING:
+    from .se_analyzer import SEAnalyzer  # noqa: F401
+
+__getattr__, __dir__ = get_lazy_getattr(__name__, {"SEAnalyzer": ".se_analyzer"})
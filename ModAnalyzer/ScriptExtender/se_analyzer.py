@@ -1,19 +1,25 @@
 import json
 import logging
 import os
+from dataclasses import dataclass, field
 from numbers import Number
-from pathlib import Path
 
+from ModAnalyzer.analysis_cache import AnalysisCache
+from ModAnalyzer.mod_fs import ModFS
+from ModAnalyzer.Structure.mod_tree_index import ModTreeIndex
 from ModAnalyzer.Structure.structure_analyzer import StructureAnalyzer
+from ModAnalyzer.timings import Timings
 
 
+@dataclass
 class SEReport:
     has_se_dir: bool = False
     has_config: bool = False
     config_parse_error: str = ""
-    config_missing_fields: list[str] = []
-    config_invalid_fields: dict[str, str] = {}
-    config: dict
+    config_missing_fields: list[str] = field(default_factory=list)
+    config_invalid_fields: dict[str, str] = field(default_factory=dict)
+    # None unless the config parsed
+    config: dict | None = None
     has_server_dir: bool = False
     has_bootstrap_server: bool = False
     has_bootstrap_client: bool = False
@@ -21,6 +27,9 @@ class SEReport:
 
 class SEAnalyzer:
     structure_analyzer: StructureAnalyzer
+    fs: ModFS
+    cache: AnalysisCache
+    timings: Timings
 
     """
     Analyzes structure and files of the ScriptExtender folder
@@ -28,6 +37,9 @@ class SEAnalyzer:
 
     def __init__(self, **kwargs):
         self.structure_analyzer = kwargs["structure_analyzer"]
+        self.fs = kwargs.get("fs") or self.structure_analyzer.fs
+        self.cache = kwargs.get("cache") or AnalysisCache(enabled=False)
+        self.timings = kwargs.get("timings") or Timings()
         self.logger = logging.getLogger(__file__)
 
     def get_config_path(self) -> str:
@@ -53,17 +65,17 @@ class SEAnalyzer:
 
     ####################
 
-    def has_se_dir(self, mod_dirs: list[str]) -> bool:
+    def has_se_dir(self, mod_dirs: list[str] | ModTreeIndex) -> bool:
         return self.structure_analyzer.is_path_in_mod_dirs(
             mod_dirs, self.get_base_path()
         )
 
-    def has_server_dir(self, mod_dirs: list[str]) -> bool:
+    def has_server_dir(self, mod_dirs: list[str] | ModTreeIndex) -> bool:
         return self.structure_analyzer.is_path_in_mod_dirs(
             mod_dirs, self.get_server_dir()
         )
 
-    def has_config(self, mod_dirs: list[str]) -> bool:
+    def has_config(self, mod_dirs: list[str] | ModTreeIndex) -> bool:
         return self.structure_analyzer.is_path_in_mod_dirs(
             mod_dirs, self.get_config_path()
         )
@@ -71,12 +83,12 @@ class SEAnalyzer:
     def has_required_config_fields(self, missing_fields: list[str]) -> bool:
         return len(missing_fields) == 0
 
-    def has_bootstrap_server(self, mod_dirs: list[str]) -> bool:
+    def has_bootstrap_server(self, mod_dirs: list[str] | ModTreeIndex) -> bool:
         return self.structure_analyzer.is_path_in_mod_dirs(
             mod_dirs, self.get_bootstrap_server_file_path()
         )
 
-    def has_bootstrap_client(self, mod_dirs: list[str]) -> bool:
+    def has_bootstrap_client(self, mod_dirs: list[str] | ModTreeIndex) -> bool:
         return self.structure_analyzer.is_path_in_mod_dirs(
             mod_dirs, self.get_bootstrap_client_file_path()
         )
@@ -127,15 +139,21 @@ class SEAnalyzer:
             return invalid_fields
 
     def get_parsed_config(self, config_path: str) -> dict | None:
-        path = Path(config_path)
-        if path.exists():
-            config_contents = path.read_text()
-            config = json.loads(config_contents)
-            self.logger.debug("Parsed SE config successfully")
-            return config
-
-    def generate_report(self, mod_dirs: list[str]) -> SEReport:
+        if self.fs.exists(config_path):
+
+            def parse() -> dict:
+                config_contents = self.fs.read_text(config_path)
+                self.timings.count("bytes_read", self.fs.stat(config_path).size)
+                config = json.loads(config_contents)
+                self.logger.debug("Parsed SE config successfully")
+                return config
+
+            with self.timings.span("config_parse"):
+                return self.cache.get_or_parse("se_config", config_path, parse)
+
+    def generate_report(self, mod_dirs: list[str] | ModTreeIndex) -> SEReport:
         report = SEReport()
+        mod_dirs = self.structure_analyzer.get_mod_tree_index(mod_dirs)
 
         report.has_se_dir = self.has_se_dir(mod_dirs)
 
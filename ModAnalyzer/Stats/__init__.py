@@ -0,0 +1,15 @@
+from typing import TYPE_CHECKING
+
+from ModAnalyzer.lazy_imports import get_lazy_getattr
+
+if TYPE_CHECKING:
+    from .stats_parser import StatsParser  # noqa: F401
+    from .stats_resolver import StatsResolver  # noqa: F401
+
+__getattr__, __dir__ = get_lazy_getattr(
+    __name__,
+    {
+        "StatsParser": ".stats_parser",
+        "StatsResolver": ".stats_resolver",
+    },
+)
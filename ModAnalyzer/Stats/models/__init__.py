@@ -0,0 +1 @@
+from .stats_entry import StatsEntry  # noqa: F401
@@ -0,0 +1,20 @@
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class StatsEntry:
+    """
+    One entry from a Stats/Generated/Data file
+
+    new entry "OBJ_RUNE_ROF_BONE_ARMOR"
+    type "Object"
+    using "OBJ_RUNE_BASE"
+    data "RootTemplate" "e5e39521-2b95-4b18-b07a-dbe5f1356576"
+    """
+
+    name: str
+    type: str = ""
+    # The entry this one inherits data from
+    using: str = ""
+    # Only the fields this entry sets, not the inherited ones
+    data: dict[str, str] = field(default_factory=dict)
@@ -0,0 +1,112 @@
+import logging
+from collections.abc import Iterable, Iterator
+
+from ModAnalyzer.Stats.models import StatsEntry
+
+
+class StatsParser:
+    """
+    Parses stats files from Stats/Generated/Data
+
+    Each file has a series of entries like this:
+
+    // A comment looks like this
+    new entry "OBJ_RUNE_ROF_BONE_ARMOR"
+    type "Object"
+    using "OBJ_RUNE_BASE"
+    data "RootTemplate" "e5e39521-2b95-4b18-b07a-dbe5f1356576"
+    """
+
+    # Lines read by the last parse
+    num_lines: int = 0
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def get_quoted_value(self, line: str, start: int = 0) -> tuple[str, int]:
+        """
+        Returns the first quoted value at or after start, and the
+        position after its closing quote
+        """
+        open_quote = line.find('"', start)
+        if open_quote == -1:
+            raise ValueError(f"No quotes found in value: {line}")
+
+        close_quote = line.find('"', open_quote + 1)
+        if close_quote == -1:
+            raise ValueError(f"Unterminated quote in value: {line}")
+
+        return line[open_quote + 1 : close_quote], close_quote + 1
+
+    def get_data_field(self, line: str) -> tuple[str, str]:
+        """data "RootTemplate" "e5e39521-2b95-4b18-b07a-dbe5f1356576" """
+        key, end = self.get_quoted_value(line)
+        # Descriptions can have quotes in them, so the value runs to
+        # the last quote on the line
+        value_start = line.find('"', end)
+        value_end = line.rfind('"')
+        if value_start == -1 or value_end <= value_start:
+            raise ValueError(f"No value found in data line: {line}")
+
+        return key, line[value_start + 1 : value_end]
+
+    def iter_entries(self, lines: Iterable[str]) -> Iterator[StatsEntry]:
+        """
+        Parses lines one at a time and yields each entry once the next
+        one starts (or the lines run out). Lines are dispatched on
+        their first token, and anything else (comments, key lines from
+        other stats files) is skipped.
+        """
+        entry: StatsEntry | None = None
+        num_lines = 0
+
+        try:
+            for line in lines:
+                num_lines += 1
+                token, _, rest = line.partition(" ")
+
+                try:
+                    if token == "new" and rest.startswith("entry"):
+                        if entry is not None:
+                            yield entry
+                        # Reset first, so a bad name doesn't get the
+                        # next entry's fields added to the last one
+                        entry = None
+                        entry = StatsEntry(name=self.get_quoted_value(line)[0])
+                        continue
+
+                    if entry is None:
+                        continue
+
+                    if token == "data":
+                        key, value = self.get_data_field(line)
+                        entry.data[key] = value
+                    elif token == "type":
+                        entry.type = self.get_quoted_value(line)[0]
+                    elif token == "using":
+                        entry.using = self.get_quoted_value(line)[0]
+                except ValueError as value_err:
+                    self.logger.error(
+                        f"ValueError encountered in iter_entries: {value_err}"
+                    )
+        finally:
+            self.num_lines = num_lines
+
+        if entry is not None:
+            yield entry
+
+    def parse_stats(self, lines: Iterable[str]) -> dict[str, StatsEntry]:
+        """
+        Parses lines into stats name => StatsEntry. When a name appears
+        more than once the last entry wins, as it does in game.
+        """
+        stats_map: dict[str, StatsEntry] = {}
+
+        for entry in self.iter_entries(lines):
+            stats_map[entry.name] = entry
+
+        self.logger.debug(
+            f"Parsed {len(stats_map)} stats entries from {self.num_lines} lines"
+        )
+
+        return stats_map
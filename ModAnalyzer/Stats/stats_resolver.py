@@ -0,0 +1,117 @@
+import logging
+from collections.abc import Iterable
+from pathlib import Path
+
+from ModAnalyzer.Stats.models import StatsEntry
+from ModAnalyzer.Stats.stats_parser import StatsParser
+from ModAnalyzer.TreasureTable.treasure_table_reader import TreasureTableReader
+
+
+class StatsResolver:
+    """
+    Flattens stats entries through their using chains, so each entry
+    has every field it sets or inherits
+
+    new entry "OBJ_RUNE_ROF_BONE_ARMOR"
+    using "OBJ_RUNE_BASE"
+
+    Stats maps are given in load order (vanilla first, then each mod),
+    and a later entry with the same name replaces the earlier one.
+
+    Each entry is flattened once and remembered, and a chain is walked
+    only until it reaches an entry that is already flattened, so
+    resolving everything is linear in the number of entries. A chain
+    that ends at a missing parent or loops back on itself stops there,
+    and the entry keeps what it inherited up to that point.
+    """
+
+    def __init__(self, stats_maps: Iterable[dict[str, StatsEntry]]):
+        self.logger = logging.getLogger(__name__)
+        self.entries: dict[str, StatsEntry] = {}
+        for stats_map in stats_maps:
+            self.entries.update(stats_map)
+
+        self.resolved: dict[str, StatsEntry] = {}
+        # Entry => the parent it names that doesn't exist
+        self.missing_parents: dict[str, str] = {}
+        # Entry => the loop it is in, starting and ending with the same name
+        self.cycles: dict[str, list[str]] = {}
+
+    @classmethod
+    def from_stats_dirs(cls, stats_dirs: Iterable[str]) -> "StatsResolver":
+        """Reads every *.txt in each Stats/Generated/Data dir, in order"""
+        stats_parser = StatsParser()
+        reader = TreasureTableReader()
+        stats_maps: list[dict[str, StatsEntry]] = []
+        for stats_dir in stats_dirs:
+            for stats_path in sorted(Path(stats_dir).glob("*.txt")):
+                stats_maps.append(
+                    stats_parser.parse_stats(reader.iter_lines(stats_path))
+                )
+        return cls(stats_maps)
+
+    def get_chain(self, entry_name: str) -> list[str]:
+        """
+        Returns entry_name and its ancestors up to (but not including)
+        the first one that is already flattened, recording missing
+        parents and cycles on the way
+        """
+        chain: list[str] = []
+        positions: dict[str, int] = {}
+        name = entry_name
+
+        while name not in self.resolved:
+            if name in positions:
+                cycle = chain[positions[name] :] + [name]
+                self.logger.error(f"Stats inheritance loop: {' > '.join(cycle)}")
+                for cycle_name in cycle[:-1]:
+                    self.cycles[cycle_name] = cycle
+                break
+
+            positions[name] = len(chain)
+            chain.append(name)
+            parent_name = self.entries[name].using
+            if not parent_name:
+                break
+            if parent_name not in self.entries:
+                self.missing_parents[name] = parent_name
+                break
+            name = parent_name
+
+        return chain
+
+    def resolve(self, entry_name: str) -> StatsEntry:
+        """
+        Returns the entry with its inherited type and data filled in.
+        Raises KeyError if there is no entry with that name.
+        """
+        resolved = self.resolved.get(entry_name)
+        if resolved is not None:
+            return resolved
+
+        chain = self.get_chain(entry_name)
+        # Flatten from the top of the chain down, each entry on top of
+        # its parent's flattened fields. The top entry's parent is
+        # either flattened already, missing or the start of a loop.
+        for name in reversed(chain):
+            entry = self.entries[name]
+            parent = self.resolved.get(entry.using)
+            if parent is None:
+                self.resolved[name] = StatsEntry(
+                    name=name, type=entry.type, using=entry.using, data=dict(entry.data)
+                )
+                continue
+
+            self.resolved[name] = StatsEntry(
+                name=name,
+                type=entry.type or parent.type,
+                using=entry.using,
+                data={**parent.data, **entry.data},
+            )
+
+        return self.resolved[entry_name]
+
+    def resolve_all(self) -> dict[str, StatsEntry]:
+        for entry_name in self.entries:
+            self.resolve(entry_name)
+        return self.resolved
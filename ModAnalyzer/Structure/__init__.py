@@ -1,4 +1,26 @@
-from .mod_linker import ModLinker  # noqa: F401
-from .path_analyzer import PathAnalyzer  # noqa: F401
-from .structure_analyzer import StructureAnalyzer, StructureReport  # noqa: F401
-from .structure_generator import StructureGenerator  # noqa: F401
+from typing import TYPE_CHECKING
+
+from ModAnalyzer.lazy_imports import get_lazy_getattr
+
+# StructureGenerator pulls in jinja2 and directory_tree, which analysis
+# never needs, so nothing here is imported until it is used
+if TYPE_CHECKING:
+    from .mod_linker import ModLinker  # noqa: F401
+    from .mod_tree_index import ModTreeIndex  # noqa: F401
+    from .path_analyzer import PathAnalyzer  # noqa: F401
+    from .structure_analyzer import StructureAnalyzer, StructureReport  # noqa: F401
+    from .structure_generator import StructureGenerator  # noqa: F401
+    from .synthetic_mod_generator import SyntheticModGenerator  # noqa: F401
+
+__getattr__, __dir__ = get_lazy_getattr(
+    __name__,
+    {
+        "ModLinker": ".mod_linker",
+        "ModTreeIndex": ".mod_tree_index",
+        "PathAnalyzer": ".path_analyzer",
+        "StructureAnalyzer": ".structure_analyzer",
+        "StructureReport": ".structure_analyzer",
+        "StructureGenerator": ".structure_generator",
+        "SyntheticModGenerator": ".synthetic_mod_generator",
+    },
+)
@@ -13,14 +13,16 @@ class ModLinker:
     - Link public
     """
 
+    DEFAULT_GAME_DATA_DIR = (
+        "C:\\Program Files (x86)\\Steam\\steamapps\\common\\Baldurs Gate 3"
+    )
+
     game_data_dir: Path
     game_data_path: Path
 
     def __init__(self, game_data_dir_override: str = ""):
         self.logger = logging.getLogger(__file__)
-        self.game_data_dir = Path(
-            "C:\\Program Files (x86)\\Steam\\steamapps\\common\\Baldurs Gate 3"
-        )
+        self.game_data_dir = Path(self.DEFAULT_GAME_DATA_DIR)
 
         if game_data_dir_override:
             self.game_data_dir = Path(game_data_dir_override)
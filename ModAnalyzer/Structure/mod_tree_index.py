@@ -0,0 +1,175 @@
+import logging
+import os
+import posixpath
+from collections.abc import Iterable, Iterator
+
+
+class ModTreeIndex:
+    """
+    Index of every path in a mod directory, built in a single
+    pass.
+
+    Paths are normalized to forward slashes so that paths built
+    with os.path.join can be looked up regardless of which
+    separator was used to build the index. Existence checks are
+    set lookups, and directory listings come from a map of each
+    directory to its children, so nothing has to re-scan the
+    whole tree.
+    """
+
+    def __init__(self, paths: Iterable[str] | None = None):
+        self.logger = logging.getLogger(__file__)
+        # Insertion ordered so iteration matches scan order
+        self.paths: dict[str, None] = {}
+        self.dirs: set[str] = set()
+        self.children: dict[str, dict[str, None]] = {}
+        # (mtime_ns, size) of each file, only filled in when requested
+        self.stats: dict[str, tuple[int, int]] = {}
+        # Directory that was scanned. Empty when built from a list of
+        # paths, since then we can't tell what is missing
+        self.root = ""
+
+        if paths is not None:
+            for path in paths:
+                self.add_path(str(path))
+
+    @staticmethod
+    def normalize_path(path: str) -> str:
+        normalized = posixpath.normpath(str(path).replace("\\", "/"))
+        return "" if normalized == "." else normalized
+
+    @classmethod
+    def from_directory(cls, root: str, with_stats: bool = False) -> "ModTreeIndex":
+        """
+        Walks root with os.scandir. Each entry is stat'd at most
+        once by scandir itself, and symlinked directories are not
+        followed. with_stats also records the mtime and size of
+        every file, which costs an extra stat per file on POSIX.
+        """
+        index = cls()
+        index.root = index.normalize_path(root)
+        pending: list[str] = [root]
+
+        while pending:
+            current = pending.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        index.add_path(entry.path, is_dir)
+                        if is_dir:
+                            pending.append(entry.path)
+                        elif with_stats:
+                            stat = entry.stat(follow_symlinks=False)
+                            index.stats[index.normalize_path(entry.path)] = (
+                                stat.st_mtime_ns,
+                                stat.st_size,
+                            )
+            except OSError as err:
+                index.logger.error(f"Unable to scan {current}: {err}")
+
+        return index
+
+    def add_path(self, path: str, is_dir: bool = False):
+        normalized = self.normalize_path(path)
+        if not normalized:
+            return
+
+        if is_dir:
+            self.dirs.add(normalized)
+
+        if normalized in self.paths:
+            return
+
+        self.paths[normalized] = None
+
+        # Register with every parent so listings work for lists
+        # of paths that do not include their parent directories
+        child = normalized
+        parent = posixpath.dirname(child)
+        while parent:
+            self.dirs.add(parent)
+            siblings = self.children.setdefault(parent, {})
+            name = posixpath.basename(child)
+            if name in siblings:
+                break
+            siblings[name] = None
+            child = parent
+            parent = posixpath.dirname(child)
+
+    def __contains__(self, path: object) -> bool:
+        return isinstance(path, str) and self.normalize_path(path) in self.paths
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.paths)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def exists(self, path: str) -> bool:
+        return path in self
+
+    def get_scanned_existence(self, path: str) -> bool | None:
+        """
+        Returns whether path exists if it is inside the scanned root,
+        otherwise None because the scan can't answer
+        """
+        if not self.root or not self.is_in_directory(path, self.root):
+            return None
+        return self.normalize_path(path) == self.root or path in self
+
+    def is_dir(self, path: str) -> bool:
+        return self.normalize_path(path) in self.dirs
+
+    def is_file(self, path: str) -> bool:
+        normalized = self.normalize_path(path)
+        return normalized in self.paths and normalized not in self.dirs
+
+    def get_children(self, directory: str) -> list[str]:
+        """Returns the names of entries directly inside directory"""
+        return list(self.children.get(self.normalize_path(directory), {}))
+
+    def get_files_with_extension(
+        self,
+        directory: str,
+        extension: str,
+        recursive: bool = False,
+        case_sensitive: bool = True,
+    ) -> list[str]:
+        """
+        Returns normalized paths of files in directory that end with
+        extension. Only the directory's own subtree is visited.
+        """
+        files: list[str] = []
+        if not case_sensitive:
+            extension = extension.lower()
+
+        pending: list[str] = [self.normalize_path(directory)]
+        while pending:
+            current = pending.pop()
+            for name in self.children.get(current, {}):
+                path = f"{current}/{name}"
+                if path in self.dirs:
+                    if recursive:
+                        pending.append(path)
+                    continue
+
+                file_name = name if case_sensitive else name.lower()
+                if file_name.endswith(extension):
+                    files.append(path)
+
+        return files
+
+    @classmethod
+    def is_in_directory(cls, path: str, directory: str) -> bool:
+        """True if path is directory itself or anywhere below it"""
+        normalized = cls.normalize_path(path)
+        normalized_dir = cls.normalize_path(directory)
+        return normalized == normalized_dir or normalized.startswith(
+            f"{normalized_dir}/"
+        )
+
+    def has_file_with_extension(
+        self, directory: str, extension: str, recursive: bool = False
+    ) -> bool:
+        return len(self.get_files_with_extension(directory, extension, recursive)) > 0
@@ -4,6 +4,9 @@ from dataclasses import dataclass
 
 import typer
 
+from ModAnalyzer.mod_fs import DirectoryModFS, ModFS
+from ModAnalyzer.Structure.mod_tree_index import ModTreeIndex
+
 
 @dataclass(init=False)
 class bcolors:
@@ -31,20 +34,52 @@ class PathAnalyzer:
     """
     Displays a directory path with colors
     to indicate which part doesn't exist
+
+    Reports share prefixes, so whether each prefix exists is cached.
+    Prefixes inside a scanned mod dir are answered by its ModTreeIndex
+    without touching the filesystem.
     """
 
     EXISTS_COLOR: str
     NON_EXISTENT_COLOR: str
     using_typer: bool = False
+    exists_cache: dict[str, bool]
+    mod_tree_index: ModTreeIndex | None
+    fs: ModFS
 
     def __init__(self, **kwargs):
         self.EXISTS_COLOR = bcolors.OKGREEN
         self.NON_EXISTENT_COLOR = bcolors.FAIL
         self.logger = logging.getLogger(__name__)
+        self.exists_cache = {}
+        self.mod_tree_index = None
+        self.fs = kwargs.get("fs") or DirectoryModFS()
 
         if "using_typer" in kwargs:
             self.using_typer = kwargs["using_typer"]
 
+    def set_mod_tree_index(self, mod_tree_index: ModTreeIndex | None):
+        """Uses a new scan for existence checks and forgets cached results"""
+        self.mod_tree_index = mod_tree_index
+        self.clear_cache()
+
+    def clear_cache(self):
+        self.exists_cache = {}
+
+    def path_exists(self, path: str) -> bool:
+        if path in self.exists_cache:
+            return self.exists_cache[path]
+
+        exists = None
+        if self.mod_tree_index is not None:
+            exists = self.mod_tree_index.get_scanned_existence(path)
+
+        if exists is None:
+            exists = self.fs.exists(path)
+
+        self.exists_cache[path] = exists
+        return exists
+
     def get_colored_path(self, path: str):
         report = self.get_path_report(path)
         return report.colored_path
@@ -73,21 +108,22 @@ class PathAnalyzer:
         report = PathAnalyzerReport()
         path_parts = path.split(os.sep)
         colored_paths = []
-        existent_paths = []
+        existent_path = ""
         encountered_non_existent_dir = False
 
         for p in path_parts:
             exists = False
             color = bcolors.FAIL
-            test_path = p
+            # Absolute paths start with an empty part
+            test_path = p or os.sep
 
-            if len(existent_paths) > 0:
-                test_path = os.path.join(*existent_paths, p)
+            if existent_path:
+                test_path = os.path.join(existent_path, p)
 
-            if not encountered_non_existent_dir and os.path.exists(test_path):
+            if not encountered_non_existent_dir and self.path_exists(test_path):
                 exists = True
                 color = bcolors.OKGREEN
-                existent_paths.append(p)
+                existent_path = test_path
             else:
                 encountered_non_existent_dir = True
 
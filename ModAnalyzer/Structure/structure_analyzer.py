@@ -4,9 +4,13 @@ import xml.etree.ElementTree as ET
 from dataclasses import dataclass
 from pathlib import Path
 
+from ModAnalyzer.analysis_cache import AnalysisCache
+from ModAnalyzer.mod_fs import DirectoryModFS, ModFS
+from ModAnalyzer.Structure.mod_tree_index import ModTreeIndex
 from ModAnalyzer.Structure.models import Tag
 from ModAnalyzer.Structure.path_analyzer import PathAnalyzer
 from ModAnalyzer.Structure.xml_utils import get_tag_with_id_from_node
+from ModAnalyzer.timings import Timings
 
 
 @dataclass
@@ -41,19 +45,30 @@ class StructureAnalyzer:
     9. ModDir/Mods/ModName/Public/Stats/Generated/TreasureTable.txt
     8. ModDir/Mods/ModName/Public/Tags
 
-    Decide if structure is valid based on required directories. Glob
-    tells us what is in the structure, so we do not have to perform lots
-    of calls to exists
+    Decide if structure is valid based on required directories. A single
+    scan of the mod dir builds a ModTreeIndex, which tells us what is in
+    the structure, so we do not have to perform lots of calls to exists
     """
 
     mod_dir_name: str = ""
     mod_name: str = ""
-    mod_dirs: list[str] = []
+    # ModName in Mods/ModName, when it isn't the mod dir's name
+    mod_folder_name: str = ""
+    mod_dirs: ModTreeIndex
+    fs: ModFS
+    cache: AnalysisCache
+    timings: Timings
 
     def __init__(self, **kwargs):
         self.logger = logging.getLogger(__file__)
+        self.cache = kwargs.get("cache") or AnalysisCache(enabled=False)
+        self.timings = kwargs.get("timings") or Timings()
+        self.fs = kwargs.get("fs") or DirectoryModFS()
         self.mod_dir_name = ""
-        self.path_analyzer = PathAnalyzer()
+        self.mod_dirs = ModTreeIndex()
+        self._mod_dirs_source: list[str] | None = None
+        self._mod_dirs_source_index = self.mod_dirs
+        self.path_analyzer = kwargs.get("path_analyzer") or PathAnalyzer(fs=self.fs)
 
         if "mod_dir_name" in kwargs:
             self.mod_dir_name = self.get_mod_dir_without_dir_seps(
@@ -64,6 +79,9 @@ class StructureAnalyzer:
         if "mod_name" in kwargs:
             self.mod_name = kwargs["mod_name"]
 
+        if "mod_folder_name" in kwargs:
+            self.mod_folder_name = kwargs["mod_folder_name"]
+
     def get_mod_dir_without_dir_seps(self, mod_dir_name: str) -> str:
         mod_name = mod_dir_name.rstrip(os.sep)
         mod_name = mod_name.rstrip("/")
@@ -72,14 +90,13 @@ class StructureAnalyzer:
     def generate_report(
         self,
         mod_dir_name: str,
-        mod_dirs_override: list[str] | None = None,
+        mod_dirs_override: list[str] | ModTreeIndex | None = None,
     ) -> StructureReport:
         """
         Main entry method containing various checks.
 
-        - Use glob to get entire directory structure from supplied mod dir
-        - Convert to list of strings
-        - Early return upon finding the one we want
+        - Scan entire directory structure from supplied mod dir once
+        - Index the paths so each check is a set lookup
         - Check each directory starting from the beginning
         - Do not perform additional checks if the first directories
         do not exist, because then we know others also do not exist
@@ -89,13 +106,13 @@ class StructureAnalyzer:
         self.mod_dir_name = self.get_mod_dir_without_dir_seps(mod_dir_name)
 
         # Check exists
-        report.mod_dir_exists = os.path.exists(self.mod_dir_name)
+        report.mod_dir_exists = self.fs.exists(self.mod_dir_name)
         if not report.mod_dir_exists:
             self.logger.error(f"{self.mod_dir_name} does not exist")
             return report
 
         # Check is dir
-        report.mod_dir_is_dir = os.path.isdir(self.mod_dir_name)
+        report.mod_dir_is_dir = self.fs.is_dir(self.mod_dir_name)
         if not report.mod_dir_is_dir:
             self.logger.error(f"{self.mod_dir_name} is not a directory")
             return report
@@ -107,54 +124,118 @@ class StructureAnalyzer:
                 raise ValueError(
                     "Empty mod dirs supplied to StructureAnalyzer.generate_report"
                 )
-            self.mod_dirs = mod_dirs_override
-            for d in mod_dirs_override:
-                if "Treasure" in d:
-                    self.logger.debug(f"mod_dirs tt path = {d}")
+            self.mod_dirs = self.get_mod_tree_index(mod_dirs_override)
         else:
             self.logger.debug("Determining mod dirs path")
-            mod_dirs_paths: list[Path] = self.get_mod_dirs(Path(mod_dir_name))
-            self.mod_dirs: list[str] = [str(d) for d in mod_dirs_paths]
+            with self.timings.span("scan"):
+                self.mod_dirs = self.get_mod_dirs(Path(mod_dir_name))
+
+            if self.timings.enabled:
+                self.timings.count(
+                    "files_scanned",
+                    sum(1 for path in self.mod_dirs if self.mod_dirs.is_file(path)),
+                )
 
-        report.has_mods_modname = self.has_mods_modname(self.mod_dirs)
+        # Colored paths can use the scan instead of checking each prefix
+        self.path_analyzer.set_mod_tree_index(self.mod_dirs)
 
-        if not report.has_mods_modname:
-            self.logger.info("No mod root dir!")
-            return report
+        with self.timings.span("checks"):
+            report.has_mods_modname = self.has_mods_modname(self.mod_dirs)
 
-        # If they do not have the mod root dir, then they won't have this stuff either
-        report.has_meta_file = self.has_meta(self.mod_dirs)
-        report.has_public = self.has_public(self.mod_dirs)
-        report.has_root_templates = self.has_root_templates(self.mod_dirs)
-        report.has_treasure_table = self.has_treasure_table(self.mod_dirs)
-        report.has_tags = self.has_tags(self.mod_dirs)
+            if not report.has_mods_modname:
+                self.logger.info("No mod root dir!")
+                return report
+
+            # If they do not have the mod root dir, then they won't have this stuff either
+            report.has_meta_file = self.has_meta(self.mod_dirs)
+            report.has_public = self.has_public(self.mod_dirs)
+            report.has_root_templates = self.has_root_templates(self.mod_dirs)
+            report.has_treasure_table = self.has_treasure_table(self.mod_dirs)
+            report.has_tags = self.has_tags(self.mod_dirs)
 
         return report
 
-    def is_path_in_mod_dirs(self, mod_dirs: list[str], path: str) -> bool:
-        return path in mod_dirs
+    def get_mod_tree_index(self, mod_dirs: list[str] | ModTreeIndex) -> ModTreeIndex:
+        """
+        Returns mod_dirs as an index, reusing the current one when
+        the same list is passed in again
+        """
+        if isinstance(mod_dirs, ModTreeIndex):
+            return mod_dirs
+
+        if mod_dirs is not self._mod_dirs_source:
+            self._mod_dirs_source = mod_dirs
+            self._mod_dirs_source_index = ModTreeIndex(mod_dirs)
+
+        return self._mod_dirs_source_index
+
+    def is_path_in_mod_dirs(
+        self, mod_dirs: list[str] | ModTreeIndex, path: str
+    ) -> bool:
+        return path in self.get_mod_tree_index(mod_dirs)
 
     def get_lsx_files_in_dir(self, directory: Path) -> list[Path]:
         # TODO: check if extension needs to be case sensitive
         lsx_files = []
+
+        # Use the index if this directory was part of the scan
+        if self.mod_dirs.is_dir(str(directory)):
+            return [
+                Path(path)
+                for path in self.mod_dirs.get_files_with_extension(
+                    str(directory), ".lsx", case_sensitive=False
+                )
+            ]
+
         try:
-            lsf_lsx_files = list(directory.glob("*.lsf.lsx"))
-            lsx_files = (
-                list(directory.glob("*.lsx", case_sensitive=False)) + lsf_lsx_files
-            )
+            lsx_files = [
+                Path(path) for path in self.fs.get_files(str(directory), ".lsx")
+            ]
         except Exception as err:
             self.logger.error(f"Unexpected error in get_lsx_files_in_dir: {err}")
         finally:
             return lsx_files
 
-    def get_mod_dirs(self, mod_dir: Path) -> list[Path]:
-        """Used initially to create list of mod dirs"""
-        return list(mod_dir.glob("**\\*"))
+    def get_resource_files_in_dir(self, directory: Path) -> list[Path]:
+        """LSX files and binary .lsf files, which can be read directly"""
+        lsf_files: list[Path] = []
+
+        if self.mod_dirs.is_dir(str(directory)):
+            lsf_files = [
+                Path(path)
+                for path in self.mod_dirs.get_files_with_extension(
+                    str(directory), ".lsf", case_sensitive=False
+                )
+            ]
+        else:
+            try:
+                lsf_files = [
+                    Path(path) for path in self.fs.get_files(str(directory), ".lsf")
+                ]
+            except Exception as err:
+                self.logger.error(
+                    f"Unexpected error in get_resource_files_in_dir: {err}"
+                )
+
+        return self.get_lsx_files_in_dir(directory) + lsf_files
+
+    def get_mod_dirs(self, mod_dir: Path) -> ModTreeIndex:
+        """Used initially to create index of mod dirs"""
+        return self.fs.get_tree_index(str(mod_dir))
+
+    def get_mod_folder_name(self) -> str:
+        """
+        Mods/ModName and Public/ModName use the name of the mod folder,
+        which is only the last part of mod_dir_name when the mod is
+        not in the working directory. Archives can be named anything,
+        so they pass in mod_folder_name.
+        """
+        return self.mod_folder_name or self.get_mod_name_from_dir(self.mod_dir_name)
 
     def get_mods_modname_path(self) -> str:
         if not self.mod_dir_name:
             raise ValueError("Mod dir name is empty")
-        return os.path.join(self.mod_dir_name, "Mods", self.mod_dir_name)
+        return os.path.join(self.mod_dir_name, "Mods", self.get_mod_folder_name())
 
     def get_public_path(self) -> str:
         if not self.mod_dir_name:
@@ -164,7 +245,7 @@ class StructureAnalyzer:
     def get_stats_path(self) -> str:
         if not self.mod_dir_name:
             raise ValueError("Mod dir name is empty")
-        return os.path.join(self.get_public_path(), self.mod_dir_name, "Stats")
+        return os.path.join(self.get_public_path(), self.get_mod_folder_name(), "Stats")
 
     def get_generated_path(self) -> str:
         return os.path.join(self.get_stats_path(), "Generated")
@@ -179,7 +260,7 @@ class StructureAnalyzer:
         return os.path.join(self.get_generated_path(), "Equipment.txt")
 
     def get_tags_path(self) -> str:
-        return os.path.join(self.get_public_path(), self.mod_dir_name, "Tags")
+        return os.path.join(self.get_public_path(), self.get_mod_folder_name(), "Tags")
 
     def get_localization_dir_path(self) -> str:
         return os.path.join(*[self.mod_dir_name, "Localization", "English"])
@@ -192,7 +273,9 @@ class StructureAnalyzer:
 
     # RunesOfFaerun\Public\RunesOfFaerun\RootTemplates
     def get_rt_dir(self) -> str:
-        return os.path.join(self.get_public_path(), self.mod_dir_name, "RootTemplates")
+        return os.path.join(
+            self.get_public_path(), self.get_mod_folder_name(), "RootTemplates"
+        )
 
     def get_rt_dir_path(self) -> Path:
         return Path(self.get_rt_dir())
@@ -200,9 +283,9 @@ class StructureAnalyzer:
     def get_root_templates(self) -> list[Path]:
         rts: list[Path] = []
         rt_dir = self.get_rt_dir_path()
-        if os.path.isdir(rt_dir):
+        if self.fs.is_dir(str(rt_dir)):
             self.logger.info("RootTemplates dir exists")
-            rts = self.get_lsx_files_in_dir(rt_dir)
+            rts = self.get_resource_files_in_dir(rt_dir)
             self.logger.info(f"LSX files in RT dir: {rts}")
         else:
             self.logger.info(f"RT dir does not exist: {rt_dir}")
@@ -215,19 +298,19 @@ class StructureAnalyzer:
     # Directory checks              #
     #################################
 
-    def has_treasure_table(self, mod_dirs: list[str]) -> bool:
+    def has_treasure_table(self, mod_dirs: list[str] | ModTreeIndex) -> bool:
         tt_path = self.get_treasure_table_file_path()
         return self.is_path_in_mod_dirs(mod_dirs, tt_path)
 
-    def has_mods_modname(self, mod_dirs: list[str]) -> bool:
+    def has_mods_modname(self, mod_dirs: list[str] | ModTreeIndex) -> bool:
         path = self.get_mods_modname_path()
         return self.is_path_in_mod_dirs(mod_dirs, path)
 
-    def has_public(self, mod_dirs: list[str]) -> bool:
+    def has_public(self, mod_dirs: list[str] | ModTreeIndex) -> bool:
         public_path = self.get_public_path()
         return self.is_path_in_mod_dirs(mod_dirs, public_path)
 
-    def has_localization(self, mod_dirs: list[str]) -> bool:
+    def has_localization(self, mod_dirs: list[str] | ModTreeIndex) -> bool:
         return self.is_path_in_mod_dirs(mod_dirs, self.mod_dir_name)
 
     @staticmethod
@@ -240,7 +323,10 @@ class StructureAnalyzer:
     def get_mt_meta_path(self) -> str:
         return os.path.join(self.get_mods_modname_path(), "meta.lsf.lsx")
 
-    def has_meta(self, mod_dirs: list[str]) -> bool:
+    def get_binary_meta_path(self) -> str:
+        return os.path.join(self.get_mods_modname_path(), "meta.lsf")
+
+    def has_meta(self, mod_dirs: list[str] | ModTreeIndex) -> bool:
         """This file does not need to be converted"""
         meta_path = self.get_meta_path()
         meta_mt_path = self.get_mt_meta_path()
@@ -248,27 +334,29 @@ class StructureAnalyzer:
         # Maybe glob this
         meta_exists = self.is_path_in_mod_dirs(mod_dirs, meta_path)
         meta_mt_exists = self.is_path_in_mod_dirs(mod_dirs, meta_mt_path)
+        # Packed mods have the binary one, which is read as is
+        meta_lsf_exists = self.is_path_in_mod_dirs(
+            mod_dirs, self.get_binary_meta_path()
+        )
 
-        return meta_exists or meta_mt_exists
+        return meta_exists or meta_mt_exists or meta_lsf_exists
 
-    def has_root_templates(self, mod_dirs: list[str]) -> bool:
-        rt_dir = os.path.join(
-            self.get_public_path(), self.mod_dir_name, "RootTemplates"
-        )
-        has_rt_dir = self.is_path_in_mod_dirs(mod_dirs, rt_dir)
+    def has_root_templates(self, mod_dirs: list[str] | ModTreeIndex) -> bool:
+        rt_dir = self.get_rt_dir()
+        mod_tree_index = self.get_mod_tree_index(mod_dirs)
 
-        if has_rt_dir:
-            for mod_dir in mod_dirs:
-                if mod_dir.startswith(rt_dir) and mod_dir.endswith(".lsx"):
-                    return True
+        if rt_dir in mod_tree_index:
+            return mod_tree_index.has_file_with_extension(
+                rt_dir, ".lsx", True
+            ) or mod_tree_index.has_file_with_extension(rt_dir, ".lsf", True)
 
         return False
 
-    def has_goals(self, mod_dirs: list[str]) -> bool:
-        goals_path_parts = self.get_goals_path_parts()
-        return self.is_path_in_mod_dirs(mod_dirs, *goals_path_parts)
+    def has_goals(self, mod_dirs: list[str] | ModTreeIndex) -> bool:
+        goals_path = os.path.join(*self.get_goals_path_parts())
+        return self.is_path_in_mod_dirs(mod_dirs, goals_path)
 
-    def has_tags(self, mod_dirs) -> bool:
+    def has_tags(self, mod_dirs: list[str] | ModTreeIndex) -> bool:
         tags_path = self.get_tags_path()
         return self.is_path_in_mod_dirs(mod_dirs, tags_path)
 
@@ -365,6 +453,11 @@ class StructureAnalyzer:
 
         return tag
 
+    def get_tag_from_file(self, tag_path: str) -> Tag | None:
+        return self.cache.get_or_parse(
+            "tag", tag_path, lambda: self.get_tag_from_lsx(self.fs.read_text(tag_path))
+        )
+
     def get_tag_category_list_from_tag(self, tag: Tag) -> str:
         """Returns comma separated list of tag names"""
         return ", ".join(sorted(tag.categories))
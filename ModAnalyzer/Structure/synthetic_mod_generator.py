@@ -0,0 +1,218 @@
+import os
+import random
+import uuid
+from pathlib import Path
+from xml.sax.saxutils import quoteattr
+
+from ModAnalyzer.ScriptExtender import SEAnalyzer
+from ModAnalyzer.Structure.structure_analyzer import StructureAnalyzer
+from ModAnalyzer.Structure.structure_generator import StructureGenerator
+
+
+class SyntheticModGenerator(StructureGenerator):
+    """
+    Generates a mod with the basic structure plus as many root
+    templates, treasure tables, tags and SE Lua files as requested,
+    so the analyzers can be measured on something bigger than TestMod.
+
+    Everything is derived from the seed, so the same settings always
+    produce the same files.
+    """
+
+    num_root_templates: int = 1000
+    templates_per_file: int = 250
+    num_treasure_tables: int = 100
+    num_tags: int = 20
+    num_lua_files: int = 20
+    # Share of templates marked with DevComment Ignore
+    ignored_ratio: float = 0.05
+    # Share of items that are deliberately left out of every treasure table
+    inaccessible_ratio: float = 0.0
+    seed: int = 0
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        for setting in [
+            "num_root_templates",
+            "templates_per_file",
+            "num_treasure_tables",
+            "num_tags",
+            "num_lua_files",
+            "ignored_ratio",
+            "inaccessible_ratio",
+            "seed",
+        ]:
+            if setting in kwargs:
+                setattr(self, setting, kwargs[setting])
+
+        self.rng = random.Random(self.seed)
+
+    def get_uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def generate_handle(self) -> str:
+        return f"h{self.get_uuid()}".replace("-", "g")
+
+    def get_stats_name(self, index: int) -> str:
+        return f"OBJ_SYNTHETIC_ITEM_{index}"
+
+    def get_root_template_node(self, index: int) -> str:
+        attributes = [
+            ("Description", "TranslatedString", None),
+            ("DisplayName", "TranslatedString", None),
+            ("Icon", "FixedString", "Item_LOOT_MF_Rune_Tablet_A"),
+            ("LevelName", "FixedString", ""),
+            ("MapKey", "FixedString", self.get_uuid()),
+            ("Name", "LSString", f"Synthetic_Item_{index}"),
+            ("ParentTemplateId", "FixedString", self.get_uuid()),
+            ("Stats", "FixedString", self.get_stats_name(index)),
+            ("Type", "FixedString", "item"),
+        ]
+        if self.rng.random() < self.ignored_ratio:
+            attributes.append(("DevComment", "LSString", "Ignore"))
+
+        lines = ['                <node id="GameObjects">']
+        for attr_id, attr_type, value in attributes:
+            if value is None:
+                lines.append(
+                    f'                    <attribute id="{attr_id}" type="{attr_type}" '
+                    f'handle="{self.generate_handle()}" version="1" />'
+                )
+            else:
+                lines.append(
+                    f'                    <attribute id="{attr_id}" type="{attr_type}" '
+                    f"value={quoteattr(value)} />"
+                )
+        lines.append("                </node>")
+
+        return os.linesep.join(lines)
+
+    def create_synthetic_root_templates(self, rt_dir: str) -> list[str]:
+        """Splits the templates over as many files as needed"""
+        filenames: list[str] = []
+        templates_per_file = max(1, self.templates_per_file)
+        # The basic structure only has an empty placeholder, which isn't valid XML
+        Path(os.path.join(rt_dir, "merged.lsx")).unlink(missing_ok=True)
+
+        for start in range(0, self.num_root_templates, templates_per_file):
+            end = min(start + templates_per_file, self.num_root_templates)
+            nodes = [self.get_root_template_node(index) for index in range(start, end)]
+            contents = os.linesep.join(
+                [
+                    '<?xml version="1.0" encoding="utf-8"?>',
+                    "<save>",
+                    '    <version major="4" minor="0" revision="6" build="5" />',
+                    '    <region id="Templates">',
+                    '        <node id="Templates">',
+                    "            <children>",
+                    *nodes,
+                    "            </children>",
+                    "        </node>",
+                    "    </region>",
+                    "</save>",
+                ]
+            )
+            filename = os.path.join(rt_dir, f"synthetic_{len(filenames)}.lsx")
+            Path(filename).write_text(contents, encoding="UTF-8")
+            filenames.append(filename)
+
+        self.logger.debug(
+            f"Wrote {self.num_root_templates} RTs to {len(filenames)} files"
+        )
+
+        return filenames
+
+    def create_synthetic_treasure_table(self, tt_path: str):
+        """
+        Every item lands in at least one table, apart from the
+        inaccessible share, and some are added to a few more
+        """
+        num_tables = max(1, self.num_treasure_tables)
+        # Dicts keep insertion order and make the membership check cheap
+        tables: list[dict[str, None]] = [{} for _ in range(num_tables)]
+
+        for index in range(self.num_root_templates):
+            if self.rng.random() < self.inaccessible_ratio:
+                continue
+
+            category_name = f"I_{self.get_stats_name(index)}"
+            tables[index % num_tables][category_name] = None
+            for _ in range(self.rng.randint(0, 2)):
+                tables[self.rng.randrange(num_tables)][category_name] = None
+
+        lines: list[str] = []
+        for table_index, category_names in enumerate(tables):
+            lines.append(f"// Synthetic table {table_index} //")
+            lines.append(f'new treasuretable "Synthetic_TT_{table_index}"')
+            if self.rng.random() < 0.5:
+                lines.append("CanMerge 1")
+            for category_name in category_names:
+                lines.append('new subtable "1,1"')
+                lines.append(f'object category "{category_name}",1,0,0,0,0,0,0,0')
+            lines.append("")
+
+        Path(tt_path).write_text(os.linesep.join(lines), encoding="UTF-8")
+
+    def create_synthetic_tags(self, tags_path: str):
+        Path(tags_path).mkdir(parents=True, exist_ok=True)
+
+        for index in range(self.num_tags):
+            replacements = {
+                "MA_TAG_DISPLAY_DESCRIPTION_HANDLE": self.generate_handle(),
+                "MA_TAG_DESCRIPTION": f"Synthetic tag {index}",
+                "MA_TAG_DISPLAY_NAME_HANDLE": self.generate_handle(),
+                "MA_TAG_ICON_NAME": "",
+                "MA_TAG_NAME": f"SYNTHETIC_TAG_{index}",
+                "MA_TAG_UUID": self.get_uuid(),
+            }
+            template = self.get_template_with_replacements(replacements, "tag.lsx")
+            Path(os.path.join(tags_path, f"SyntheticTag_{index}.lsx")).write_text(
+                template, encoding="UTF-8"
+            )
+
+    def create_synthetic_lua_files(self, server_dir: str):
+        server_path = Path(server_dir)
+        server_path.mkdir(parents=True, exist_ok=True)
+
+        for index in range(self.num_lua_files):
+            lines = [f"-- Synthetic module {index}"]
+            for function_index in range(self.rng.randint(5, 30)):
+                lines += [
+                    f"local function Synthetic_{index}_{function_index}(value)",
+                    f'    Ext.Utils.Print("Synthetic {index}.{function_index}", value)',
+                    "    return value",
+                    "end",
+                    "",
+                ]
+            (server_path / f"Synthetic_{index}.lua").write_text(
+                os.linesep.join(lines), encoding="UTF-8"
+            )
+
+    def create_synthetic_mod(self, mod_dir: str) -> bool:
+        """Creates the basic structure, then fills it with synthetic files"""
+        created = self.create_structure(
+            mod_dir=mod_dir,
+            mod_uuid=self.get_uuid(),
+            display_tree=False,
+            mod_author_name="ModAnalyzer",
+            mod_description="Synthetic mod for benchmarks",
+        )
+
+        if not created:
+            self.logger.error(f"Failed to create synthetic mod at {mod_dir}")
+            return False
+
+        structure_analyzer = StructureAnalyzer(
+            mod_dir_name=mod_dir, mod_name=self.mod_name
+        )
+        se_analyzer = SEAnalyzer(structure_analyzer=structure_analyzer)
+
+        self.create_synthetic_root_templates(structure_analyzer.get_rt_dir())
+        self.create_synthetic_treasure_table(
+            structure_analyzer.get_treasure_table_file_path()
+        )
+        self.create_synthetic_tags(structure_analyzer.get_tags_path())
+        self.create_synthetic_lua_files(se_analyzer.get_server_dir())
+
+        return True
@@ -1,7 +1,29 @@
-from .root_template_parser import RootTemplateParser  # noqa: F401
-from .treasure_table_analyzer import (  # noqa: F401
-    TreasureTableAnalyzer,
-    TreasureTableReport,
+from typing import TYPE_CHECKING
+
+from ModAnalyzer.lazy_imports import get_lazy_getattr
+
+if TYPE_CHECKING:
+    from .conflict_analyzer import (  # noqa: F401
+        ConflictReport,
+        TreasureTableConflictAnalyzer,
+    )
+    from .root_template_parser import RootTemplateParser  # noqa: F401
+    from .treasure_table_analyzer import (  # noqa: F401
+        TreasureTableAnalyzer,
+        TreasureTableReport,
+    )
+    from .treasure_table_parser import TreasureTableParser  # noqa: F401
+    from .treasure_table_reader import TreasureTableReader  # noqa: F401
+
+__getattr__, __dir__ = get_lazy_getattr(
+    __name__,
+    {
+        "ConflictReport": ".conflict_analyzer",
+        "TreasureTableConflictAnalyzer": ".conflict_analyzer",
+        "RootTemplateParser": ".root_template_parser",
+        "TreasureTableAnalyzer": ".treasure_table_analyzer",
+        "TreasureTableReport": ".treasure_table_analyzer",
+        "TreasureTableParser": ".treasure_table_parser",
+        "TreasureTableReader": ".treasure_table_reader",
+    },
 )
-from .treasure_table_parser import TreasureTableParser  # noqa: F401
-from .treasure_table_reader import TreasureTableReader  # noqa: F401
@@ -0,0 +1,224 @@
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from ModAnalyzer.analysis_cache import AnalysisCache
+from ModAnalyzer.Structure.structure_analyzer import StructureAnalyzer
+from ModAnalyzer.TreasureTable.models import TreasureTable
+from ModAnalyzer.TreasureTable.treasure_table_parser import TreasureTableParser
+from ModAnalyzer.TreasureTable.treasure_table_reader import TreasureTableReader
+
+if TYPE_CHECKING:
+    from ModAnalyzer.GameData import VanillaIndex
+
+VANILLA = "Vanilla"
+
+
+@dataclass(slots=True)
+class TableContribution:
+    """One mod's version of a treasure table"""
+
+    mod_dir: str
+    can_merge: bool
+    entries: list[str]
+
+
+@dataclass
+class TableConflict:
+    table_name: str
+    # In load order
+    contributions: list[TableContribution]
+    # The last mod that replaced the table, if any did
+    winner: str = ""
+    # Mod => entries it added that a later replacement dropped
+    lost_entries: dict[str, list[str]] = field(default_factory=dict)
+
+    def get_mod_dirs(self) -> list[str]:
+        return [contribution.mod_dir for contribution in self.contributions]
+
+
+@dataclass
+class ConflictReport:
+    # Only tables where a replacement dropped entries from another mod
+    conflicts: list[TableConflict] = field(default_factory=list)
+    num_mods: int = 0
+    num_tables: int = 0
+    num_entries: int = 0
+
+
+class TreasureTableConflictAnalyzer:
+    """
+    Finds treasure tables that several mods in a load order change,
+    where one of them replaces the table and drops what earlier mods
+    (or vanilla) put in it.
+
+    Tables with CanMerge 1 add their entries to the table, anything
+    else replaces the whole table, and later mods win. Every mod's
+    tables go into one inverted index, table name => contributions in
+    load order, which is then replayed once per table, so the work is
+    linear in the total number of entries.
+    """
+
+    cache: AnalysisCache
+    # Seeds tables with their vanilla entries, so replacing a vanilla
+    # table shows what it drops
+    vanilla_index: "VanillaIndex | None" = None
+
+    def __init__(self, **kwargs):
+        self.logger = logging.getLogger(__name__)
+        self.cache = kwargs.get("cache") or AnalysisCache(enabled=False)
+
+        if "vanilla_index" in kwargs:
+            self.vanilla_index = kwargs["vanilla_index"]
+
+    def get_treasure_table_path(self, mod_dir: str) -> str:
+        structure_analyzer = StructureAnalyzer(
+            mod_dir_name=mod_dir,
+            mod_name=StructureAnalyzer.get_mod_name_from_dir(mod_dir),
+        )
+        return structure_analyzer.get_treasure_table_file_path()
+
+    def get_tables(self, tt_path: str) -> list[TreasureTable]:
+        """
+        Every table in the file, which unlike the TT map keeps CanMerge
+        for tables without entries
+        """
+
+        def parse() -> list[TreasureTable]:
+            tt_parser = TreasureTableParser()
+            try:
+                return list(
+                    tt_parser.iter_treasure_tables(
+                        TreasureTableReader().iter_lines(tt_path)
+                    )
+                )
+            except (OSError, UnicodeDecodeError) as err:
+                self.logger.error(f"Error reading file: {err}")
+                return []
+
+        return self.cache.get_or_parse("treasure_tables", tt_path, parse)
+
+    def get_contributions(
+        self, mod_dirs: list[str]
+    ) -> dict[str, list[TableContribution]]:
+        """Builds table name => contributions, in load order"""
+        table_index: dict[str, list[TableContribution]] = {}
+
+        for mod_dir in mod_dirs:
+            tt_path = self.get_treasure_table_path(mod_dir)
+            if not os.path.isfile(tt_path):
+                continue
+
+            # A table can appear more than once in a file
+            mod_contributions: dict[str, TableContribution] = {}
+            for table in self.get_tables(tt_path):
+                entries = [entry.object_category_name for entry in table.entries]
+                contribution = mod_contributions.get(table.name)
+                if contribution is None:
+                    contribution = mod_contributions[table.name] = TableContribution(
+                        mod_dir=mod_dir, can_merge=table.can_merge, entries=entries
+                    )
+                    table_index.setdefault(table.name, []).append(contribution)
+                    continue
+
+                # Any part without CanMerge replaces the table
+                contribution.can_merge = contribution.can_merge and table.can_merge
+                contribution.entries += [
+                    entry for entry in entries if entry not in contribution.entries
+                ]
+
+        return table_index
+
+    def get_conflict(
+        self, table_name: str, contributions: list[TableContribution]
+    ) -> TableConflict:
+        """Replays the contributions in load order"""
+        conflict = TableConflict(table_name=table_name, contributions=contributions)
+        # Entry => the mod that added it, in the order they were added
+        current: dict[str, str] = {}
+
+        if self.vanilla_index is not None:
+            for entry in self.vanilla_index.get_table_entries(table_name):
+                current[entry] = VANILLA
+
+        for contribution in contributions:
+            if contribution.can_merge:
+                for entry in contribution.entries:
+                    current.setdefault(entry, contribution.mod_dir)
+                continue
+
+            kept = set(contribution.entries)
+            for entry, mod_dir in current.items():
+                if entry not in kept and mod_dir != contribution.mod_dir:
+                    conflict.lost_entries.setdefault(mod_dir, []).append(entry)
+
+            conflict.winner = contribution.mod_dir
+            current = {entry: contribution.mod_dir for entry in contribution.entries}
+
+        return conflict
+
+    def generate_report(self, mod_dirs: list[str]) -> ConflictReport:
+        """mod_dirs must be in load order"""
+        table_index = self.get_contributions(mod_dirs)
+        report = ConflictReport(num_mods=len(mod_dirs), num_tables=len(table_index))
+
+        for table_name, contributions in table_index.items():
+            report.num_entries += sum(
+                len(contribution.entries) for contribution in contributions
+            )
+            # One mod can only drop vanilla entries, by replacing
+            if len(contributions) < 2 and (
+                self.vanilla_index is None or contributions[0].can_merge
+            ):
+                continue
+
+            conflict = self.get_conflict(table_name, contributions)
+            if conflict.lost_entries:
+                report.conflicts.append(conflict)
+
+        self.logger.info(
+            f"Found {len(report.conflicts)} conflicting tables out of "
+            f"{report.num_tables} in {report.num_mods} mods"
+        )
+
+        return report
+
+    def print_report(self, report: ConflictReport):
+        import typer
+        from tabulate import tabulate
+
+        table: list[list[str]] = []
+        for conflict in report.conflicts:
+            lost = [
+                f"{os.path.basename(mod_dir)}: {', '.join(entries)}"
+                for mod_dir, entries in conflict.lost_entries.items()
+            ]
+            table.append(
+                [
+                    conflict.table_name,
+                    " > ".join(
+                        os.path.basename(mod_dir) for mod_dir in conflict.get_mod_dirs()
+                    ),
+                    typer.style(
+                        os.path.basename(conflict.winner), fg=typer.colors.YELLOW
+                    ),
+                    os.linesep.join(lost),
+                ]
+            )
+
+        if table:
+            typer.echo(
+                tabulate(
+                    table,
+                    headers=["Treasure Table", "Load Order", "Wins", "Lost Entries"],
+                )
+            )
+            typer.echo(os.linesep)
+
+        conflicts_color = typer.colors.RED if report.conflicts else typer.colors.GREEN
+        typer.echo(
+            f"{typer.style(len(report.conflicts), fg=conflicts_color, bold=True)} "
+            f"conflicting tables out of {report.num_tables} "
+            f"({report.num_entries} entries in {report.num_mods} mods)"
+        )
@@ -1,2 +1,7 @@
-from .treasure_table import ItemSummary, TreasureTable  # noqa: F401
+from .template_record import TemplateRecord  # noqa: F401
+from .treasure_table import TemplateRecordSummary, TreasureTable  # noqa: F401
 from .treasure_table_entry import TreasureTableEntry  # noqa: F401
+from .treasure_table_store import (  # noqa: F401
+    TreasureTableEntryView,
+    TreasureTableStore,
+)
@@ -0,0 +1,30 @@
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class TemplateRecord:
+    """
+    The parts of a RootTemplate GameObjects node that the analyzers
+    use, so the XML element does not have to be kept around
+
+    <node id="GameObjects">
+        <attribute id="MapKey" type="FixedString" value="e5e39521-2b95-4b18-b07a-dbe5f1356576" />
+        <attribute id="Name" type="LSString" value="ROF_Rune_of_Bone_Armor" />
+        <attribute id="ParentTemplateId" type="FixedString" value="2874eaa0-dcc7-48c0-9d96-dc50c5149aa2" />
+        <attribute id="Stats" type="FixedString" value="OBJ_RUNE_ROF_BONE_ARMOR" />
+        <attribute id="DevComment" type="LSString" value="Ignore" />
+        <attribute id="DisplayName" type="TranslatedString" handle="h339303faca4d483f970a0f16c082aef5869b" version="1" />
+    </node>
+    """
+
+    name: str = ""
+    map_key: str = ""
+    stats: str = ""
+    dev_comment: str = ""
+    parent_template_id: str = ""
+    # Attribute id => handle, for every TranslatedString attribute
+    handles: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def is_ignored(self) -> bool:
+        return self.dev_comment == "Ignore"
@@ -1,7 +1,7 @@
-import xml.etree.ElementTree as ET
 from dataclasses import dataclass
 from typing import TypedDict
 
+from ModAnalyzer.TreasureTable.models.template_record import TemplateRecord
 from ModAnalyzer.TreasureTable.models.treasure_table_entry import TreasureTableEntry
 
 
@@ -18,6 +18,7 @@ class TreasureTable:
         return len(self.entries) < len(other.entries)
 
 
-ItemSummary = TypedDict(
-    "ItemSummary", {"verified": list[ET.Element], "ignored": list[ET.Element]}
+TemplateRecordSummary = TypedDict(
+    "TemplateRecordSummary",
+    {"verified": list[TemplateRecord], "ignored": list[TemplateRecord]},
 )
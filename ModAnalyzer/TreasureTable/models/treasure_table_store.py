@@ -0,0 +1,236 @@
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+
+from ModAnalyzer.TreasureTable.models.treasure_table import TreasureTable
+from ModAnalyzer.TreasureTable.models.treasure_table_entry import TreasureTableEntry
+
+
+class TreasureTableEntryView:
+    """
+    Read-only view of one row in a TreasureTableStore. It has the same
+    attributes as TreasureTableEntry, but only holds the store and a
+    row number.
+    """
+
+    __slots__ = ("store", "row")
+
+    def __init__(self, store: "TreasureTableStore", row: int):
+        self.store = store
+        self.row = row
+
+    @property
+    def can_merge(self) -> bool:
+        return bool(self.store.flags[self.row] & TreasureTableStore.CAN_MERGE)
+
+    @property
+    def is_valid(self) -> bool:
+        return bool(self.store.flags[self.row] & TreasureTableStore.IS_VALID)
+
+    @property
+    def subtable_position(self) -> str:
+        return self.store.strings[self.store.subtable_ids[self.row]]
+
+    @property
+    def object_category_name(self) -> str:
+        return self.store.strings[self.store.category_ids[self.row]]
+
+    @property
+    def table_name(self) -> str:
+        return self.store.strings[self.store.table_ids[self.row]]
+
+    @property
+    def options(self) -> list[int]:
+        return self.store.get_options(self.store.option_ids[self.row])
+
+    def to_entry(self) -> TreasureTableEntry:
+        return TreasureTableEntry(
+            can_merge=self.can_merge,
+            subtable_position=self.subtable_position,
+            object_category_name=self.object_category_name,
+            is_valid=self.is_valid,
+            options=self.options,
+        )
+
+    def __eq__(self, other):
+        # Same as TreasureTableEntry, entries are compared by name
+        if isinstance(other, TreasureTableEntryView):
+            other = other.object_category_name
+        return self.object_category_name == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return (
+            f"TreasureTableEntryView({self.table_name!r}, "
+            f"{self.object_category_name!r})"
+        )
+
+
+class TreasureTableStore:
+    """
+    Column oriented storage for treasure table entries
+
+    A dict of TreasureTableEntry lists costs a few hundred bytes per
+    entry: the object, its __dict__, and an options list of eight ints.
+    Here each entry is one slot in a few typed arrays:
+
+    - Table, category and subtable names are interned into one string
+      table and stored as ids
+    - can_merge and is_valid are bit flags in a bytearray
+    - Option lists are almost always the same handful of values, so
+      each distinct list is packed once into an int array and rows
+      store its id
+
+    Rows of the same table keep the order they were added in, and an
+    entry name is only added once per table, like parse_treasure_table.
+    """
+
+    CAN_MERGE = 1
+    IS_VALID = 2
+
+    def __init__(self):
+        self.strings: list[str] = []
+        self.string_ids: dict[str, int] = {}
+        # One item per row
+        self.table_ids = array("I")
+        self.category_ids = array("I")
+        self.subtable_ids = array("I")
+        self.option_ids = array("I")
+        self.flags = bytearray()
+        # Distinct option lists, option set n is
+        # packed_options[option_offsets[n] : option_offsets[n + 1]]
+        self.packed_options = array("i")
+        self.option_offsets = array("I", [0])
+        self.option_set_ids: dict[tuple[int, ...], int] = {}
+        # Table name id => row numbers, in the order tables were added
+        self.table_rows: dict[int, array] = {}
+        # Tables added with add_table that have CanMerge 1, which
+        # holds for tables without entries too
+        self.merge_table_ids: set[int] = set()
+
+    @classmethod
+    def from_tables(cls, tables: Iterable[TreasureTable]) -> "TreasureTableStore":
+        store = cls()
+        for table in tables:
+            store.add_table(table)
+        return store
+
+    @classmethod
+    def from_tt_map(
+        cls, tt_map: dict[str, list[TreasureTableEntry]]
+    ) -> "TreasureTableStore":
+        store = cls()
+        for tt_name in tt_map:
+            store.add_entries(tt_name, tt_map[tt_name])
+        return store
+
+    def intern(self, value: str) -> int:
+        string_id = self.string_ids.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings.append(sys.intern(value))
+            self.string_ids[value] = string_id
+        return string_id
+
+    def get_option_set_id(self, options: Iterable[int]) -> int:
+        key = tuple(options)
+        option_set_id = self.option_set_ids.get(key)
+        if option_set_id is None:
+            option_set_id = len(self.option_offsets) - 1
+            self.packed_options.extend(key)
+            self.option_offsets.append(len(self.packed_options))
+            self.option_set_ids[key] = option_set_id
+        return option_set_id
+
+    def get_options(self, option_set_id: int) -> list[int]:
+        start = self.option_offsets[option_set_id]
+        end = self.option_offsets[option_set_id + 1]
+        return self.packed_options[start:end].tolist()
+
+    def add_table(self, table: TreasureTable):
+        table_id = self.intern(table.name)
+        is_new_table = table_id not in self.table_rows
+        self.add_entries(table.name, table.entries)
+        # Any part without CanMerge replaces the table
+        if table.can_merge and (is_new_table or table_id in self.merge_table_ids):
+            self.merge_table_ids.add(table_id)
+        else:
+            self.merge_table_ids.discard(table_id)
+
+    def add_entries(self, table_name: str, entries: Iterable[TreasureTableEntry]):
+        table_id = self.intern(table_name)
+        rows = self.table_rows.get(table_id)
+        if rows is None:
+            rows = self.table_rows[table_id] = array("I")
+
+        # Only needed while adding, so it isn't kept per table
+        seen_category_ids = {self.category_ids[row] for row in rows}
+
+        for entry in entries:
+            category_id = self.intern(entry.object_category_name)
+            if category_id in seen_category_ids:
+                continue
+
+            seen_category_ids.add(category_id)
+            rows.append(len(self.flags))
+            self.table_ids.append(table_id)
+            self.category_ids.append(category_id)
+            self.subtable_ids.append(self.intern(entry.subtable_position))
+            self.option_ids.append(self.get_option_set_id(entry.options))
+            self.flags.append(
+                (self.CAN_MERGE if entry.can_merge else 0)
+                | (self.IS_VALID if entry.is_valid else 0)
+            )
+
+    def __len__(self) -> int:
+        return len(self.flags)
+
+    def __iter__(self) -> Iterator[TreasureTableEntryView]:
+        for row in range(len(self)):
+            yield TreasureTableEntryView(self, row)
+
+    def __contains__(self, table_name: object) -> bool:
+        return (
+            isinstance(table_name, str)
+            and self.string_ids.get(table_name) in self.table_rows
+        )
+
+    def get_table_names(self) -> list[str]:
+        return [self.strings[table_id] for table_id in self.table_rows]
+
+    def can_merge(self, table_name: str) -> bool:
+        return self.string_ids.get(table_name, -1) in self.merge_table_ids
+
+    def get_entries(self, table_name: str) -> list[TreasureTableEntryView]:
+        rows = self.table_rows.get(self.string_ids.get(table_name, -1), [])
+        return [TreasureTableEntryView(self, row) for row in rows]
+
+    def get_summary(self) -> dict[str, list[str]]:
+        """Same as TreasureTableParser.get_summary_from_tt_map"""
+        tt_summary: dict[str, list[str]] = {}
+        for table_id, rows in self.table_rows.items():
+            tt_name = self.strings[table_id]
+            for row in rows:
+                category_name = self.strings[self.category_ids[row]]
+                tt_summary.setdefault(category_name, []).append(tt_name)
+        return tt_summary
+
+    def get_category_names(self, flag: int, is_set: bool) -> set[str]:
+        return {
+            self.strings[self.category_ids[row]]
+            for row, flags in enumerate(self.flags)
+            if bool(flags & flag) == is_set
+        }
+
+    def get_invalid_entries(self) -> set[str]:
+        return self.get_category_names(self.IS_VALID, False)
+
+    def get_replacement_entries(self) -> set[str]:
+        return self.get_category_names(self.CAN_MERGE, False)
+
+    def to_tt_map(self) -> dict[str, list[TreasureTableEntry]]:
+        return {
+            tt_name: [view.to_entry() for view in self.get_entries(tt_name)]
+            for tt_name in self.get_table_names()
+        }
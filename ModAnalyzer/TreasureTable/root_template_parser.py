@@ -1,12 +1,14 @@
 import logging
 import os
 import xml.etree.ElementTree as ET
+from collections.abc import Iterable, Iterator
 from pathlib import Path
+from typing import BinaryIO
 
-from ModAnalyzer.TreasureTable.models import ItemSummary
+from ModAnalyzer.Larian.lsf_reader import LSFReader
+from ModAnalyzer.TreasureTable.models import TemplateRecord, TemplateRecordSummary
 
 from .xml_utils import (
-    attr_is_ignore_comment,
     get_comment_preserving_parser,
     get_error_message,
     get_tag_with_id_from_node,
@@ -18,6 +20,15 @@ class RootTemplateParser:
     Handles parsing XML in root templates
     """
 
+    # Attribute id => TemplateRecord field
+    RECORD_FIELDS = {
+        "Name": "name",
+        "MapKey": "map_key",
+        "Stats": "stats",
+        "DevComment": "dev_comment",
+        "ParentTemplateId": "parent_template_id",
+    }
+
     def __init__(self):
         self.filename = ""
         self.tree: ET.ElementTree
@@ -37,59 +48,112 @@ class RootTemplateParser:
 
         return stats_names
 
-    def get_map_key_from_attributes(self, attrs: list[ET.Element]) -> str:
+    def get_template_record(self, node: ET.Element) -> TemplateRecord:
+        """Copies the attributes we care about out of a GameObjects node"""
+        record = TemplateRecord()
+        for attr_node in node.iterfind("attribute"):
+            attr_id = attr_node.get("id")
+            if attr_id in self.RECORD_FIELDS:
+                setattr(record, self.RECORD_FIELDS[attr_id], attr_node.get("value", ""))
+            elif attr_node.get("type") == "TranslatedString":
+                record.handles[attr_id] = attr_node.get("handle", "")
+        return record
+
+    def is_template_node(self, node: ET.Element, ancestors: list[ET.Element]) -> bool:
         """
-        We have to go through all attributes and get the map key first, because
-        we are using it as a key. There could be a scenario where the ignore attribute
-        comes before the map key, and then we can't build the ignore map. Doing it this way
-        means iterating the attributes twice, but it's not like this process is going to be
-        running a lot. It's surely a better alternative to including an ignored node
+        <region id="Templates">
+            <node id="Templates">
+                <children>
+                    <node id="GameObjects">
         """
-        map_key = ""
+        return (
+            node.tag == "node"
+            and len(ancestors) >= 3
+            and ancestors[-1].tag == "children"
+            and ancestors[-2].tag == "node"
+            and ancestors[-2].get("id") == "Templates"
+            and ancestors[-3].tag == "region"
+            and ancestors[-3].get("id") == "Templates"
+        )
 
-        try:
-            for attr in attrs:
-                if attr.attrib["id"] == "MapKey":
-                    map_key = attr.attrib["value"]
-                    break
-        except Exception as err:
-            self.logger.error(
-                f"Unexpected error while trying to find map key for get_valid_nodes: {err}"
-            )
+    def iter_template_records(
+        self, source: str | os.PathLike | BinaryIO
+    ) -> Iterator[TemplateRecord]:
+        """
+        Pull parses a root template and yields one record per template.
+        Each template node is dropped from the tree as soon as its record
+        is built, so memory use does not grow with the size of the file.
+        """
+        ancestors: list[ET.Element] = []
+
+        for event, element in ET.iterparse(source, events=("start", "end")):
+            if event == "start":
+                ancestors.append(element)
+                continue
+
+            ancestors.pop()
+            if self.is_template_node(element, ancestors):
+                yield self.get_template_record(element)
+                element.clear()
+                ancestors[-1].remove(element)
 
-        return map_key
+    def iter_template_records_from_root(
+        self, root: ET.Element
+    ) -> Iterator[TemplateRecord]:
+        """Same as iter_template_records, for an already parsed tree"""
+        node_children = self.get_templates_children(root)
+        if node_children is not None:
+            for node_child in node_children.iterfind("node"):
+                yield self.get_template_record(node_child)
 
-    def get_verified_nodes(self, root: ET.Element) -> ItemSummary:
+    def get_template_record_from_lsf(
+        self, lsf: LSFReader, node_index: int
+    ) -> TemplateRecord:
+        """Same as get_template_record, only decoding the values it keeps"""
+        record = TemplateRecord()
+        for attribute_index in lsf.iter_attribute_indexes(node_index):
+            attr_id = lsf.get_attribute_name(attribute_index)
+            if attr_id in self.RECORD_FIELDS:
+                value = lsf.get_attribute(attribute_index).value
+                setattr(record, self.RECORD_FIELDS[attr_id], str(value))
+            elif lsf.get_attribute_type_name(attribute_index) == "TranslatedString":
+                record.handles[attr_id] = lsf.get_attribute(attribute_index).value
+        return record
+
+    def iter_template_records_from_lsf(
+        self, lsf: LSFReader
+    ) -> Iterator[TemplateRecord]:
+        """Same as iter_template_records, for a binary .lsf root template"""
+        templates_region = lsf.get_region("Templates")
+        if templates_region >= 0:
+            for node_index in lsf.get_children(templates_region):
+                yield self.get_template_record_from_lsf(lsf, node_index)
+
+    def get_record_summary(
+        self, records: Iterable[TemplateRecord]
+    ) -> TemplateRecordSummary:
         """
-        Gets templates children and filters nodes with a DevComment set to
-        Ignore
+        Splits records into verified and ignored templates. Once a MapKey
+        has been ignored, later templates with that MapKey are ignored too.
         """
-        verified_nodes: list[ET.Element] = []
-        ignored_nodes_map: dict[str, bool] = {}
-        ignored_nodes: list[ET.Element] = []
-        node_children = self.get_templates_children(root)
-        has_ignored_attr = False
+        summary: TemplateRecordSummary = {"verified": [], "ignored": []}
+        ignored_map_keys: set[str] = set()
 
-        if node_children is not None:
-            for node_child in node_children:
-                has_ignored_attr = False
-                attributes = node_child.findall("attribute")
-                map_key = self.get_map_key_from_attributes(attributes)
+        for record in records:
+            if record.is_ignored:
+                ignored_map_keys.add(record.map_key)
 
-                # Get ignored nodes
-                for attr_node in attributes:
-                    has_ignored_attr = attr_is_ignore_comment(attr_node)
-                    if has_ignored_attr:
-                        ignored_nodes_map[map_key] = True
+            if record.map_key in ignored_map_keys:
+                summary["ignored"].append(record)
+            else:
+                summary["verified"].append(record)
 
-                if map_key in ignored_nodes_map:
-                    ignored_nodes.append(node_child)
-                else:
-                    verified_nodes.append(node_child)
+        self.logger.info(f"Found {len(summary['verified'])} templates in RT")
 
-        self.logger.info(f"Found {len(verified_nodes)} nodes in RT")
+        return summary
 
-        return {"verified": verified_nodes, "ignored": ignored_nodes}
+    def get_stats_names_from_records(self, records: list[TemplateRecord]) -> set[str]:
+        return {record.stats for record in records if record.stats}
 
     def get_templates_children(self, root: ET.Element) -> ET.Element | None:
         # Get region#Templates
@@ -1,19 +1,90 @@
 import logging
+import os
 import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from itertools import repeat
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from ModAnalyzer import Structure, TreasureTable
+from ModAnalyzer.analysis_cache import AnalysisCache
+from ModAnalyzer.Larian.lsf_reader import LSFReader
+from ModAnalyzer.mod_fs import DirectoryModFS, ModFS
+from ModAnalyzer.Stats.models import StatsEntry
+from ModAnalyzer.Stats.stats_parser import StatsParser
+from ModAnalyzer.Stats.stats_resolver import StatsResolver
 from ModAnalyzer.Structure import PathAnalyzer
-from ModAnalyzer.TreasureTable.models import ItemSummary, TreasureTableEntry
+from ModAnalyzer.TreasureTable.models import (
+    TemplateRecord,
+    TemplateRecordSummary,
+    TreasureTableEntry,
+)
+from ModAnalyzer.TreasureTable.root_template_parser import RootTemplateParser
+from ModAnalyzer.TreasureTable.treasure_table_parser import TreasureTableParser
+from ModAnalyzer.timings import Timings
 
+if TYPE_CHECKING:
+    from ModAnalyzer.GameData import VanillaIndex
 
+
+def parse_rt_file_records(
+    rt_path: str, streaming: bool = False, fs: ModFS | None = None
+) -> TemplateRecordSummary:
+    """
+    Parses one RT into records. This runs in worker processes, so it
+    has to be a module level function and its result must be picklable.
+    Workers only read from disk, so they use the default fs.
+
+    Streaming pull parses the file so only one template is in memory at
+    a time. Otherwise the whole tree is parsed at once, which is faster
+    for typical mod sized files, and dropped once the records are built.
+    Binary .lsf files are read directly.
+    """
+    fs = fs or DirectoryModFS()
+    rt_parser = RootTemplateParser()
+    if rt_path.lower().endswith(".lsf"):
+        # Files on disk are mapped instead of read
+        local_path = fs.get_local_path(rt_path)
+        with LSFReader(local_path or fs.read_bytes(rt_path)) as lsf:
+            return rt_parser.get_record_summary(
+                rt_parser.iter_template_records_from_lsf(lsf)
+            )
+
+    if streaming:
+        with fs.open(rt_path) as rt_file:
+            return rt_parser.get_record_summary(
+                rt_parser.iter_template_records(rt_file)
+            )
+
+    root_node = ET.fromstring(fs.read_bytes(rt_path))
+    records = rt_parser.iter_template_records_from_root(root_node)
+
+    return rt_parser.get_record_summary(records)
+
+
+@dataclass
 class TreasureTableReport:
-    verified_items: list[ET.Element] = []
-    ignored_items: list[ET.Element] = []
-    treasure_table_entries: list[TreasureTableEntry] = []
-    inaccessible_items: list[str] = []
-    replacement_entries: set[str] = set()
-    invalid_entries: set[str] = set()
+    verified_items: list[TemplateRecord] = field(default_factory=list)
+    ignored_items: list[TemplateRecord] = field(default_factory=list)
+    treasure_table_entries: list[TreasureTableEntry] = field(default_factory=list)
+    inaccessible_items: list[str] = field(default_factory=list)
+    replacement_entries: set[str] = field(default_factory=set)
+    invalid_entries: set[str] = field(default_factory=set)
+    # T_ entries naming a table that is neither in the mod nor vanilla.
+    # Only checked when there is a vanilla index.
+    unknown_table_references: set[str] = field(default_factory=set)
+    # False when the mod has no stats files, so nothing was checked
+    has_stats: bool = False
+    # RT Stats values with no entry in the mod's stats (or vanilla)
+    unknown_stats: set[str] = field(default_factory=set)
+    # I_ entries with no stats entry. Without a vanilla index these
+    # include items that are only in vanilla.
+    unknown_object_categories: set[str] = field(default_factory=set)
+    # Stats entry => the using parent that doesn't exist. Without a
+    # vanilla index these include vanilla parents.
+    missing_stats_parents: dict[str, str] = field(default_factory=dict)
+    # Stats entry => the using loop it is in
+    stats_cycles: dict[str, list[str]] = field(default_factory=dict)
 
 
 class TreasureTableAnalyzer:
@@ -24,49 +95,254 @@ class TreasureTableAnalyzer:
 
     path_analyzer: PathAnalyzer
     logger: logging.Logger
+    fs: ModFS
+    cache: AnalysisCache
+    timings: Timings
+    # Pull parse RTs instead of parsing whole trees
+    streaming: bool = False
+    # Processes used to parse RTs. Worker startup costs more than it
+    # saves on small mods, so RT dirs below the threshold are parsed
+    # serially.
+    workers: int = 1
+    parallel_threshold_bytes: int = 2 * 1024 * 1024
+    # Lets items placed in vanilla tables count as accessible
+    vanilla_index: "VanillaIndex | None" = None
 
     def __init__(self, **kwargs):
         self.logger = logging.getLogger(__name__)
-        self.path_analyzer = PathAnalyzer(**kwargs)
+        self.fs = kwargs.get("fs") or DirectoryModFS()
+        self.path_analyzer = kwargs.get("path_analyzer") or PathAnalyzer(**kwargs)
+        self.cache = kwargs.get("cache") or AnalysisCache(enabled=False)
+        self.timings = kwargs.get("timings") or Timings()
+
+        if "streaming" in kwargs:
+            self.streaming = kwargs["streaming"]
+
+        if "workers" in kwargs:
+            self.workers = max(1, kwargs["workers"] or os.cpu_count() or 1)
+
+        if "parallel_threshold_bytes" in kwargs:
+            self.parallel_threshold_bytes = kwargs["parallel_threshold_bytes"]
+
+        if "vanilla_index" in kwargs:
+            self.vanilla_index = kwargs["vanilla_index"]
+
+    def should_parse_in_parallel(self, rt_paths: list[Path]) -> bool:
+        # Workers read RTs from disk themselves
+        if self.workers < 2 or len(rt_paths) < 2 or not self.fs.is_local:
+            return False
+
+        total_bytes = sum(self.fs.stat(str(rt_path)).size for rt_path in rt_paths)
+        return total_bytes >= self.parallel_threshold_bytes
+
+    def get_rt_record_summaries(
+        self, rt_paths: list[Path]
+    ) -> list[TemplateRecordSummary]:
+        """
+        Returns a record summary for each RT, in the same order as
+        rt_paths. Cached files are looked up here, and the rest are
+        shared out over a process pool when there is enough to parse.
+        """
+        summaries: dict[int, TemplateRecordSummary] = {}
+        uncached: list[int] = []
+
+        for index, rt_path in enumerate(rt_paths):
+            found, summary = self.cache.lookup("root_template_records", str(rt_path))
+            if found:
+                summaries[index] = summary
+            else:
+                uncached.append(index)
+
+        uncached_paths = [rt_paths[index] for index in uncached]
+        self.timings.count("rt_files_cached", len(summaries))
+        self.timings.count("rt_files_parsed", len(uncached_paths))
+        if self.timings.enabled:
+            self.timings.count(
+                "bytes_read",
+                sum(self.fs.stat(str(rt_path)).size for rt_path in uncached_paths),
+            )
+
+        if self.should_parse_in_parallel(uncached_paths):
+            # Pulls in multiprocessing, which most mods are too small to need
+            from concurrent.futures import ProcessPoolExecutor
+
+            workers = min(self.workers, len(uncached_paths))
+            self.logger.debug(f"Parsing {len(uncached_paths)} RTs in {workers} workers")
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parsed = list(
+                    executor.map(
+                        parse_rt_file_records,
+                        map(str, uncached_paths),
+                        repeat(self.streaming),
+                    )
+                )
+        else:
+            parsed = [
+                parse_rt_file_records(str(rt_path), self.streaming, self.fs)
+                for rt_path in uncached_paths
+            ]
+
+        for index, summary in zip(uncached, parsed):
+            self.timings.count(
+                "template_nodes_parsed",
+                len(summary["verified"]) + len(summary["ignored"]),
+            )
+            self.cache.store("root_template_records", str(rt_paths[index]), summary)
+            summaries[index] = summary
+
+        return [summaries[index] for index in range(len(rt_paths))]
+
+    def get_tt_map(
+        self, tt_parser: TreasureTableParser, tt_filename: str
+    ) -> dict[str, list[TreasureTableEntry]] | None:
+        """Returns None if there are no lines in the TT file"""
+
+        def parse() -> dict[str, list[TreasureTableEntry]] | None:
+            reader = TreasureTable.TreasureTableReader()
+            try:
+                with self.fs.open(tt_filename) as tt_file:
+                    tt_map = tt_parser.parse_treasure_table(reader.iter_lines(tt_file))
+            except (OSError, UnicodeDecodeError) as err:
+                self.logger.error(f"Error reading file: {err}")
+                return None
+
+            self.timings.count("bytes_read", self.fs.stat(tt_filename).size)
+            self.timings.count("tt_lines_processed", tt_parser.num_lines)
+            self.timings.count("tt_tables", len(tt_map))
 
-    def get_item_list(
-        self, rt_parser: TreasureTable.RootTemplateParser, rt_dir: str
-    ) -> ItemSummary:
+            if tt_parser.num_lines > 0:
+                return tt_map
+
+        with self.timings.span("tt_parse"):
+            return self.cache.get_or_parse("treasure_table", tt_filename, parse)
+
+    def get_stats_dir(self, tt_filename: str) -> str:
+        """Stats files are in Data, next to the treasure table"""
+        return os.path.join(os.path.dirname(tt_filename), "Data")
+
+    def get_stats_map(self, stats_dir: str) -> dict[str, StatsEntry] | None:
+        """
+        Returns stats name => StatsEntry from every file in stats_dir,
+        or None if there are no stats files
+        """
+        if not self.fs.is_dir(stats_dir):
+            return None
+        stats_paths = self.fs.get_files(stats_dir, ".txt")
+        if not stats_paths:
+            return None
+
+        stats_parser = StatsParser()
+        reader = TreasureTable.TreasureTableReader()
+
+        def parse(stats_path: str) -> dict[str, StatsEntry]:
+            try:
+                with self.fs.open(stats_path) as stats_file:
+                    file_stats = stats_parser.parse_stats(reader.iter_lines(stats_file))
+            except (OSError, UnicodeDecodeError) as err:
+                self.logger.error(f"Error reading stats file {stats_path}: {err}")
+                return {}
+            self.timings.count("bytes_read", self.fs.stat(stats_path).size)
+            return file_stats
+
+        stats_map: dict[str, StatsEntry] = {}
+        with self.timings.span("stats_parse"):
+            for stats_path in stats_paths:
+                stats_map.update(
+                    self.cache.get_or_parse(
+                        "stats_entries", stats_path, lambda: parse(stats_path)
+                    )
+                )
+        self.timings.count("stats_entries", len(stats_map))
+
+        return stats_map
+
+    def has_stats(self, stats_name: str, stats_map: dict[str, StatsEntry]) -> bool:
+        """Checks the mod's stats, then vanilla's"""
+        if stats_name in stats_map:
+            return True
+        return self.vanilla_index is not None and self.vanilla_index.has_stats(
+            stats_name
+        )
+
+    def get_unknown_stats(
+        self, stats_names: set[str], stats_map: dict[str, StatsEntry]
+    ) -> set[str]:
+        return {
+            stats_name
+            for stats_name in stats_names
+            if not self.has_stats(stats_name, stats_map)
+        }
+
+    def get_unknown_object_categories(
+        self,
+        tt_map: dict[str, list[TreasureTableEntry]],
+        stats_map: dict[str, StatsEntry],
+    ) -> set[str]:
+        """I_OBJ_RUNE_ROF_BONE_ARMOR needs a stats entry OBJ_RUNE_ROF_BONE_ARMOR"""
+        unknown_categories: set[str] = set()
+
+        for tt_name in tt_map:
+            for entry in tt_map[tt_name]:
+                name = entry.object_category_name
+                if name.startswith("I_") and not self.has_stats(name[2:], stats_map):
+                    unknown_categories.add(name)
+
+        return unknown_categories
+
+    def get_stats_resolver(self, stats_map: dict[str, StatsEntry]) -> StatsResolver:
+        """Resolves every using chain, to find missing parents and loops"""
+        stats_resolver = StatsResolver([stats_map])
+        stats_resolver.resolve_all()
+        if self.vanilla_index is not None:
+            stats_resolver.missing_parents = {
+                entry_name: parent_name
+                for entry_name, parent_name in stats_resolver.missing_parents.items()
+                if not self.vanilla_index.has_stats(parent_name)
+            }
+        return stats_resolver
+
+    def get_item_list(self, rt_dir: str) -> TemplateRecordSummary:
         """
         1. Find LSX files in RT dir
         2. Parse the XML from each file
-        3. Get nodes from each file
+        3. Get template records from each file
         4. Add to list
         """
-        item_summary: ItemSummary = {"verified": [], "ignored": []}
-        verified_nodes: list[ET.Element] = []
-        ignored_nodes: list[ET.Element] = []
-        structure_analyzer = Structure.StructureAnalyzer()
+        item_summary: TemplateRecordSummary = {"verified": [], "ignored": []}
+        verified_nodes: list[TemplateRecord] = []
+        ignored_nodes: list[TemplateRecord] = []
+        structure_analyzer = Structure.StructureAnalyzer(fs=self.fs)
         rt_dir_path = Path(rt_dir)
         try:
-            if rt_dir_path.exists() and rt_dir_path.is_dir():
-                root_templates = structure_analyzer.get_lsx_files_in_dir(rt_dir_path)
+            if self.fs.is_dir(rt_dir):
+                # Sorted so the merged results don't depend on scan order
+                root_templates = sorted(
+                    structure_analyzer.get_resource_files_in_dir(rt_dir_path)
+                )
 
                 if len(root_templates) > 0:
+                    rt_paths: list[Path] = []
                     for rt in root_templates:
                         rt_path = Path(rt)
 
-                        if rt_path.exists():
-                            rt_xml = rt_path.read_text()
-                            root_node = ET.fromstring(rt_xml)
-                            file_summary = rt_parser.get_verified_nodes(root_node)
-                            # All verified nodes
-                            verified_nodes += file_summary["verified"]
-                            # All ignored nodes
-                            ignored_nodes += file_summary["ignored"]
-
-                            log_msg = f"Added {len(file_summary["verified"])} ({len(file_summary["ignored"])} ignored)"
-                            log_msg += " nodes from {rt_path.stem}{rt_path.suffix}"
-                            self.logger.debug(log_msg)
+                        if self.fs.exists(str(rt_path)):
+                            rt_paths.append(rt_path)
                         else:
                             self.logger.error(
                                 f"TreasureTableAnalyzer: RT path {self.path_analyzer.get_colored_path(str(rt_path))} does not exist"
                             )
+
+                    file_summaries = self.get_rt_record_summaries(rt_paths)
+
+                    for rt_path, file_summary in zip(rt_paths, file_summaries):
+                        # All verified nodes
+                        verified_nodes += file_summary["verified"]
+                        # All ignored nodes
+                        ignored_nodes += file_summary["ignored"]
+
+                        log_msg = f"Added {len(file_summary["verified"])} ({len(file_summary["ignored"])} ignored)"
+                        log_msg += f" nodes from {rt_path.stem}{rt_path.suffix}"
+                        self.logger.debug(log_msg)
                     item_summary["verified"] = verified_nodes
                     item_summary["ignored"] = ignored_nodes
                 else:
@@ -113,53 +389,100 @@ class TreasureTableAnalyzer:
 
         return invalid_entries
 
-    def generate_report(self, tt_filename: str, rt_dir: str) -> TreasureTableReport:
+    def get_unknown_table_references(
+        self, tt_map: dict[str, list[TreasureTableEntry]]
+    ) -> set[str]:
+        """
+        Entries starting with T_ drop from another treasure table, which
+        has to exist in the mod or in vanilla
+        """
+        unknown_references: set[str] = set()
+        if self.vanilla_index is None:
+            return unknown_references
+
+        for tt_name in tt_map:
+            for entry in tt_map[tt_name]:
+                name = entry.object_category_name
+                if not name.startswith("T_"):
+                    continue
+                table_name = name[2:]
+                if table_name not in tt_map and not self.vanilla_index.has_table(
+                    table_name
+                ):
+                    unknown_references.add(name)
+
+        return unknown_references
+
+    def generate_report(
+        self, tt_filename: str, rt_dir: str, stats_dir: str | None = None
+    ) -> TreasureTableReport:
+        """
+        stats_dir defaults to Data next to the treasure table. Root
+        template Stats values are checked against it even when the mod
+        has no treasure table.
+        """
         report = TreasureTableReport()
 
         # Read/parse treasure tables
-        reader = TreasureTable.TreasureTableReader()
         tt_parser = TreasureTable.TreasureTableParser()
-        tt_lines = reader.read_from_file(tt_filename)
-        items_verified: bool = False
+        tt_map = None
+        if self.fs.exists(tt_filename):
+            tt_map = self.get_tt_map(tt_parser, tt_filename)
 
-        if len(tt_lines) > 0:
-            tt_map: dict[str, list[TreasureTableEntry]] = (
-                tt_parser.parse_treasure_table(tt_lines)
-            )
-            tt_summary: dict[str, list[str]] = tt_parser.get_summary_from_tt_map(tt_map)
-            # Read/parse RTs
-            rt_parser = TreasureTable.RootTemplateParser()
-            item_summary: ItemSummary = self.get_item_list(rt_parser, rt_dir)
-            rt_nodes = item_summary["verified"]
+        stats_map = self.get_stats_map(stats_dir or self.get_stats_dir(tt_filename))
+        report.has_stats = stats_map is not None
+        if stats_map is not None:
+            if tt_map is not None:
+                report.unknown_object_categories = self.get_unknown_object_categories(
+                    tt_map, stats_map
+                )
+            stats_resolver = self.get_stats_resolver(stats_map)
+            report.missing_stats_parents = stats_resolver.missing_parents
+            report.stats_cycles = stats_resolver.cycles
 
+        if tt_map is None:
+            self.logger.info("0 treasure table entries found")
+            if stats_map is None:
+                return report
+        else:
             report.invalid_entries = self.get_invalid_entries(tt_map)
             report.replacement_entries = self.get_replacement_entries_from_map(tt_map)
+            report.unknown_table_references = self.get_unknown_table_references(tt_map)
 
-            self.logger.debug(f"rt_nodes: {rt_nodes}")
+        # Read/parse RTs
+        rt_parser = TreasureTable.RootTemplateParser()
+        with self.timings.span("rt_parse"):
+            item_summary = self.get_item_list(rt_dir)
+        rt_nodes = item_summary["verified"]
+        self.logger.debug(f"rt_nodes: {rt_nodes}")
 
-            if len(rt_nodes) > 0:
-                stats_names = rt_parser.get_stats_names_from_node_children(rt_nodes)
-                # Verify stats names against treasure tables
-                verified_stat_names: list[str] = self.check_items(
-                    stats_names, tt_summary
-                )
-                items_verified: bool = len(verified_stat_names) == len(stats_names)
+        if len(rt_nodes) == 0:
+            self.logger.info("0 nodes found from LSX files")
+            return report
 
-                report.verified_items = item_summary["verified"]
-                report.ignored_items = item_summary["ignored"]
-                report.treasure_table_entries = tt_parser.get_flattened_map(tt_map)
+        with self.timings.span("verify"):
+            stats_names = rt_parser.get_stats_names_from_records(rt_nodes)
+            if stats_map is not None:
+                report.unknown_stats = self.get_unknown_stats(stats_names, stats_map)
+            if tt_map is None:
+                return report
 
-                if not items_verified:
-                    report.inaccessible_items = [
-                        item for item in stats_names if item not in verified_stat_names
-                    ]
-                    self.logger.error(
-                        f"Items not in a treasure table: {report.inaccessible_items} ({len(verified_stat_names)}, {len(stats_names)})"
-                    )
-            else:
-                self.logger.info("0 nodes found from LSX files")
-        else:
-            self.logger.info("0 treasure table entries found")
+            # Verify stats names against treasure tables
+            tt_summary: dict[str, list[str]] = tt_parser.get_summary_from_tt_map(tt_map)
+            verified_stat_names: list[str] = self.check_items(stats_names, tt_summary)
+        items_verified: bool = len(verified_stat_names) == len(stats_names)
+
+        report.verified_items = item_summary["verified"]
+        report.ignored_items = item_summary["ignored"]
+        report.treasure_table_entries = tt_parser.get_flattened_map(tt_map)
+
+        if not items_verified:
+            report.inaccessible_items = [
+                item for item in stats_names if item not in verified_stat_names
+            ]
+            self.logger.error(
+                f"Items not in a treasure table: {report.inaccessible_items} ({len(verified_stat_names)}, {len(stats_names)})"
+            )
 
         return report
 
@@ -178,9 +501,11 @@ class TreasureTableAnalyzer:
     def item_in_treasure_table(
         self, object_category_name: str, tt_summary: dict[str, list[str]]
     ) -> bool:
-        """Checks if stats name is in summary"""
+        """Checks if stats name is in summary, or in a vanilla table"""
         exists = False
         tt_entry_name = f"I_{object_category_name}"
         if tt_entry_name in tt_summary.keys():
             exists = len(tt_summary[tt_entry_name]) > 0
+        if not exists and self.vanilla_index is not None:
+            exists = self.vanilla_index.has_category(tt_entry_name)
         return exists
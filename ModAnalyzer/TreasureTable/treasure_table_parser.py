@@ -1,6 +1,11 @@
 import logging
+from collections.abc import Iterable, Iterator
 
-from ModAnalyzer.TreasureTable.models import TreasureTableEntry
+from ModAnalyzer.TreasureTable.models import (
+    TreasureTable,
+    TreasureTableEntry,
+    TreasureTableStore,
+)
 
 
 class TreasureTableParser:
@@ -16,8 +21,13 @@ class TreasureTableParser:
     object category "I_OBJ_RUNE_ROF_BONE_ARMOR",1,0,0,0,0,0,0,0
     """
 
+    # Lines read by the last parse
+    num_lines: int = 0
+
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        # Nearly every entry has the same options, so only parse each once
+        self.options_cache: dict[str, list[int]] = {}
 
     def get_quoted_values(self, input: str) -> list[str]:
         values = input.split('"')[1::]
@@ -25,11 +35,17 @@ class TreasureTableParser:
 
     def get_value_from_line_in_quotes(self, input: str) -> str:
         """Parses value from within quotes"""
-        if '"' not in input:
+        start = input.find('"')
+        if start == -1:
             raise ValueError(f"No quotes found in value: {input}")
 
+        # Almost always the first quoted value, so skip splitting the line
+        end = input.find('"', start + 1)
+        value = input[start + 1 : end if end != -1 else None].strip()
+        if value:
+            return value
+
         values: list[str] = self.get_quoted_values(input)
-        value = ""
         if len(values):
             value = values[0]
         return value
@@ -42,98 +58,149 @@ class TreasureTableParser:
             tt_entries.append(tt_map[tt_name])
         return tt_entries
 
-    def parse_treasure_table(
-        self, lines: list[str]
-    ) -> dict[str, list[TreasureTableEntry]]:
+    def get_entry_options(self, line: str) -> list[int]:
+        """object category "I_OBJ_RUNE_ROF_BONE_ARMOR",1,0,0,0,0,0,0,0"""
+        last_quote_location = line.rfind('"')
+        # 1,0,0,0,0,0,0,0
+        option_string = line[last_quote_location + 2 : :]
+        options = self.options_cache.get(option_string)
+        if options is None:
+            options = [int(option) for option in option_string.split(",")]
+            self.options_cache[option_string] = options
+        return list(options)
+
+    def iter_treasure_tables(self, lines: Iterable[str]) -> Iterator[TreasureTable]:
         """
-        Parses a list of strings into a TreasureTableEntry list
+        Parses lines one at a time and yields each treasure table once
+        the next one starts (or the lines run out). Each line is
+        dispatched on its first token instead of trying every prefix.
 
-        tt_name => [
-            TreasureTableEntry,
-        ]
+        A table name can appear more than once in a file, and each
+        occurrence is yielded separately.
         """
-        tt_map: dict[str, list[TreasureTableEntry]] = {}
-        tt_name: str = ""
-        can_merge: bool = False
+        table: TreasureTable | None = None
+        entry_names: set[str] = set()
         subtable_position: str = ""
         object_category_name: str = ""
-        tt_entry_map: dict[str, dict[str, bool]] = {}
-        entry_valid = False
         entry_options: list[int] = []
-
-        self.logger.info(f"Parsing {len(lines)} lines")
-
-        for line in lines:
-            if line.startswith("//"):
-                continue
-
-            """
-            Each time there is a new treasure table we must reset
-            everything, otherwise the next entry will have items
-            from the previous one.
-            """
-            try:
-                if line.startswith("new treasuretable"):
-                    tt_name = self.get_value_from_line_in_quotes(line)
-                    can_merge = False
-                    subtable_position = ""
-                    object_category_name = ""
-                    entry_valid = False
-                    entry_options = []
-
-                if tt_name:
-                    if tt_name not in tt_map:
-                        tt_map[tt_name] = []
-
-                    if line.startswith("CanMerge"):
-                        can_merge = True
-
-                    if line.startswith("new subtable"):
+        num_lines = 0
+
+        try:
+            for line in lines:
+                num_lines += 1
+                token, _, rest = line.partition(" ")
+
+                """
+                Each time there is a new treasure table we must reset
+                everything, otherwise the next entry will have items
+                from the previous one.
+                """
+                try:
+                    if token == "new" and rest.startswith("treasuretable"):
+                        tt_name = self.get_value_from_line_in_quotes(line)
+                        if table is not None:
+                            yield table
+
+                        table = None
+                        if tt_name:
+                            table = TreasureTable(
+                                name=tt_name, can_merge=False, entries=[]
+                            )
+                        entry_names = set()
+                        subtable_position = ""
+                        object_category_name = ""
+                        entry_options = []
+                        continue
+
+                    if table is None:
+                        continue
+
+                    if token == "CanMerge":
+                        table.can_merge = True
+                    elif token == "new" and rest.startswith("subtable"):
                         subtable_position = self.get_value_from_line_in_quotes(line)
-
-                    if line.startswith("object category"):
+                    elif token == "object" and rest.startswith("category"):
                         object_category_name = self.get_value_from_line_in_quotes(line)
-                        last_quote_location = line.rfind('"')
-                        if last_quote_location:
-                            # 1,0,0,0,0,0,0,0
-                            option_string = line[last_quote_location + 2 : :]
-                            entry_options = [
-                                int(option) for option in option_string.split(",")
-                            ]
-
-                    if object_category_name and subtable_position:
-                        if tt_name not in tt_entry_map:
-                            tt_entry_map[tt_name] = {}
-
-                        if object_category_name[0:2] != "I_":
+                        entry_options = self.get_entry_options(line)
+
+                    if (
+                        object_category_name
+                        and subtable_position
+                        and object_category_name not in entry_names
+                    ):
+                        entry_valid = object_category_name[0:2] == "I_"
+                        if not entry_valid:
                             self.logger.error(
                                 f"Invalid object category name: {object_category_name}"
                             )
-                            entry_valid = False
-                        else:
-                            entry_valid = True
 
-                        if object_category_name not in tt_entry_map[tt_name].keys():
-                            tt_entry = TreasureTableEntry(
-                                can_merge=can_merge,
+                        table.entries.append(
+                            TreasureTableEntry(
+                                can_merge=table.can_merge,
                                 subtable_position=subtable_position,
                                 object_category_name=object_category_name,
                                 is_valid=entry_valid,
                                 options=entry_options,
                             )
-                            tt_map[tt_name].append(tt_entry)
-                            tt_entry_map[tt_name][object_category_name] = True
-            except ValueError as value_err:
-                self.logger.error(
-                    f"ValueError encountered in parse_treasure_table: {value_err}"
-                )
-            except Exception:
-                self.logger.error("Unexpected error: {err}")
+                        )
+                        entry_names.add(object_category_name)
+                except ValueError as value_err:
+                    self.logger.error(
+                        f"ValueError encountered in parse_treasure_table: {value_err}"
+                    )
+                except Exception as err:
+                    self.logger.error(f"Unexpected error: {err}")
+        finally:
+            self.num_lines = num_lines
+
+        if table is not None:
+            yield table
+
+    def parse_treasure_table(
+        self, lines: Iterable[str]
+    ) -> dict[str, list[TreasureTableEntry]]:
+        """
+        Parses lines into a TreasureTableEntry list per table
+
+        tt_name => [
+            TreasureTableEntry,
+        ]
+        """
+        tt_map: dict[str, list[TreasureTableEntry]] = {}
+
+        for table in self.iter_treasure_tables(lines):
+            if table.name not in tt_map:
+                tt_map[table.name] = table.entries
+                continue
 
-        self.logger.info(f"Parsed {len(tt_map.keys())} treasure tables")
+            # Same table again, only add entries we have not seen
+            entries = tt_map[table.name]
+            existing_names = {entry.object_category_name for entry in entries}
+            for entry in table.entries:
+                if entry.object_category_name not in existing_names:
+                    entries.append(entry)
+                    existing_names.add(entry.object_category_name)
+
+        self.logger.info(
+            f"Parsed {len(tt_map.keys())} treasure tables from {self.num_lines} lines"
+        )
 
         return tt_map
 
+    def parse_treasure_table_store(self, lines: Iterable[str]) -> TreasureTableStore:
+        """
+        Same as parse_treasure_table, but into a TreasureTableStore.
+        Only one table's entries exist as objects at a time, so this
+        is the one to use for large files like the vanilla tables.
+        """
+        store = TreasureTableStore.from_tables(self.iter_treasure_tables(lines))
+
+        self.logger.info(
+            f"Parsed {len(store.table_rows)} treasure tables from {self.num_lines} lines"
+        )
+
+        return store
+
     def get_summary_from_tt_map(
         self, tt_map: dict[str, list[TreasureTableEntry]]
     ) -> dict[str, list[str]]:
@@ -1,18 +1,47 @@
+import io
 import logging
+import os
+from collections.abc import Iterator
+from typing import IO
+
+TreasureTableSource = str | os.PathLike | IO[str] | IO[bytes] | bytes | memoryview
 
 
 class TreasureTableReader:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
 
+    def iter_lines(self, source: TreasureTableSource) -> Iterator[str]:
+        """
+        Yields stripped lines from a TT file path, an open file (text or
+        binary) or a byte buffer without reading the whole file first
+        """
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = io.BytesIO(source)
+
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "r", encoding="UTF-8") as file:
+                self.logger.debug(f"Reading TT file: {source}")
+                yield from map(str.strip, file)
+            return
+
+        if isinstance(source, io.TextIOBase):
+            yield from map(str.strip, source)
+            return
+
+        text_source = io.TextIOWrapper(source, encoding="UTF-8")
+        try:
+            yield from map(str.strip, text_source)
+        finally:
+            # Leave the caller's file open
+            text_source.detach()
+
     def read_from_file(self, filename: str) -> list[str]:
         """Returns list of lines from TT file"""
         lines: list[str] = []
         try:
-            with open(filename, "r", encoding="UTF-8") as file:
-                self.logger.debug(f"Reading TT file: {filename}")
-                while line := file.readline():
-                    lines.append(line.strip())
+            for line in self.iter_lines(filename):
+                lines.append(line)
         except Exception as err:
             self.logger.error(f"Error reading file: {err}")
 
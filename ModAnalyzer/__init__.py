@@ -1 +1,22 @@
-from .analyzer import Analyzer  # noqa: F401
+from typing import TYPE_CHECKING
+
+from .lazy_imports import get_lazy_getattr
+
+# Submodules are imported on first use, so the CLI only loads what
+# the command it runs needs
+if TYPE_CHECKING:
+    from .analysis_api import AnalysisResult, analyze_mod  # noqa: F401
+    from .analyzer import Analyzer, AnalyzerReport  # noqa: F401
+    from .collection_analyzer import CollectionAnalyzer, CollectionReport  # noqa: F401
+
+__getattr__, __dir__ = get_lazy_getattr(
+    __name__,
+    {
+        "AnalysisResult": ".analysis_api",
+        "analyze_mod": ".analysis_api",
+        "Analyzer": ".analyzer",
+        "AnalyzerReport": ".analyzer",
+        "CollectionAnalyzer": ".collection_analyzer",
+        "CollectionReport": ".collection_analyzer",
+    },
+)
@@ -0,0 +1,70 @@
+import logging
+import time
+from dataclasses import dataclass
+
+from ModAnalyzer.analyzer import Analyzer, AnalyzerReport
+from ModAnalyzer.mod_fs import get_mod_fs
+from ModAnalyzer.report_json import SCHEMA_VERSION, get_report_dict
+from ModAnalyzer.Structure import StructureReport
+from ModAnalyzer.timings import Timings
+
+
+@dataclass
+class AnalysisResult:
+    mod_path: str
+    report: AnalyzerReport
+    elapsed_ms: float = 0.0
+    # Stage timings and counters, when they were recorded
+    timings: dict | None = None
+
+    @property
+    def error(self) -> str:
+        return self.report.error
+
+    def to_dict(self) -> dict:
+        """Same as analyze --format json, plus elapsed_ms"""
+        return {
+            "schema_version": SCHEMA_VERSION,
+            **get_report_dict(self.report),
+            "elapsed_ms": self.elapsed_ms,
+        }
+
+
+def analyze_mod(
+    mod_path: str, record_timings: bool = False, **kwargs
+) -> AnalysisResult:
+    """
+    Analyzes a mod directory, .zip or .pak without printing anything
+
+    result = analyze_mod("RunesOfFaerun.zip", vanilla_index=vanilla_index)
+    result.report.TreasureTable.inaccessible_items
+
+    This can run from many threads at once. Each call opens its own
+    ModFS and builds its own Analyzer, reports and Timings, so nothing
+    one call finds is seen by another. The only objects calls share
+    are the ones passed in: an AnalysisCache locks around its database
+    and memory entries, and a VanillaIndex is only read.
+
+    kwargs are passed on to the Analyzer, e.g. cache, vanilla_index,
+    streaming or rt_workers. An error during the analysis is returned
+    in result.error instead of being raised.
+    """
+    start_time = time.perf_counter()
+    timings = Timings(enabled=record_timings)
+
+    try:
+        with get_mod_fs(mod_path) as fs:
+            analyzer = Analyzer(fs=fs, timings=timings, **kwargs)
+            report = analyzer.generate_report(fs.get_mod_dir(mod_path))
+    except Exception as err:
+        logging.getLogger(__name__).error(f"Unable to analyze {mod_path}: {err}")
+        report = AnalyzerReport(
+            mod_dir=mod_path, Structure=StructureReport(), error=str(err)
+        )
+
+    return AnalysisResult(
+        mod_path=mod_path,
+        report=report,
+        elapsed_ms=round((time.perf_counter() - start_time) * 1000, 2),
+        timings=timings.to_dict() if record_timings else None,
+    )
@@ -0,0 +1,276 @@
+import hashlib
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class AnalysisCache:
+    """
+    Stores parsed file contents in SQLite so unchanged files do not
+    have to be parsed again on the next run.
+
+    Entries are keyed on the kind of parse and the file path. An entry
+    is reused when the file size and mtime match. If only the mtime
+    changed (e.g. the file was copied or touched), a content hash is
+    compared before giving up on the entry.
+
+    Bump CACHE_VERSION whenever the shape of a cached value changes,
+    which drops every existing entry the next time the cache is opened.
+    """
+
+    CACHE_VERSION = 3
+    DEFAULT_CACHE_DIR = ".modanalyzer"
+    DEFAULT_MAX_SIZE_BYTES = 256 * 1024 * 1024
+
+    enabled: bool = False
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES,
+        enabled: bool = True,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.connection: sqlite3.Connection | None = None
+
+        if self.enabled:
+            try:
+                self.connection = self.connect()
+            except (OSError, sqlite3.Error) as err:
+                self.logger.error(f"Unable to open analysis cache, disabling: {err}")
+                self.enabled = False
+
+    def get_db_path(self) -> str:
+        return os.path.join(self.cache_dir, "cache.sqlite3")
+
+    def connect(self) -> sqlite3.Connection:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        connection = sqlite3.connect(
+            self.get_db_path(), timeout=30, check_same_thread=False
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                kind TEXT NOT NULL,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                data BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (kind, path)
+            )
+            """)
+
+        row = connection.execute(
+            "SELECT value FROM meta WHERE key = 'version'"
+        ).fetchone()
+        if row is None or row[0] != str(self.CACHE_VERSION):
+            self.logger.debug(f"Cache version changed, clearing {self.get_db_path()}")
+            connection.execute("DELETE FROM entries")
+            connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                (str(self.CACHE_VERSION),),
+            )
+        connection.commit()
+
+        return connection
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+            self.enabled = False
+
+    @staticmethod
+    def get_content_hash(path: str) -> str:
+        with open(path, "rb") as file:
+            return hashlib.file_digest(file, "blake2b").hexdigest()
+
+    def get_key_path(self, path: str) -> str:
+        return os.path.abspath(path)
+
+    def lookup(self, kind: str, path: str) -> tuple[bool, Any]:
+        """Returns (True, value) when there is a current entry for path"""
+        if not self.enabled or self.connection is None:
+            return False, None
+
+        try:
+            stat = os.stat(path)
+            key_path = self.get_key_path(path)
+            with self.lock:
+                row = self.connection.execute(
+                    "SELECT size, mtime_ns, content_hash, data FROM entries "
+                    "WHERE kind = ? AND path = ?",
+                    (kind, key_path),
+                ).fetchone()
+
+                if row is None:
+                    return False, None
+
+                size, mtime_ns, content_hash, data = row
+                if size != stat.st_size:
+                    return False, None
+
+                if mtime_ns != stat.st_mtime_ns:
+                    if content_hash != self.get_content_hash(path):
+                        return False, None
+
+                self.connection.execute(
+                    "UPDATE entries SET mtime_ns = ?, last_used = ? "
+                    "WHERE kind = ? AND path = ?",
+                    (stat.st_mtime_ns, time.time(), kind, key_path),
+                )
+                self.connection.commit()
+
+            return True, pickle.loads(data)
+        except FileNotFoundError:
+            # Reported by whoever tries to parse it
+            return False, None
+        except (OSError, sqlite3.Error, pickle.UnpicklingError) as err:
+            self.logger.error(f"Cache lookup failed for {path}: {err}")
+            return False, None
+
+    def store(self, kind: str, path: str, value: Any):
+        if not self.enabled or self.connection is None:
+            return
+
+        try:
+            stat = os.stat(path)
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            content_hash = self.get_content_hash(path)
+            with self.lock:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO entries "
+                    "(kind, path, size, mtime_ns, content_hash, data, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        kind,
+                        self.get_key_path(path),
+                        stat.st_size,
+                        stat.st_mtime_ns,
+                        content_hash,
+                        data,
+                        time.time(),
+                    ),
+                )
+                self.evict()
+                self.connection.commit()
+        except FileNotFoundError:
+            pass
+        except (OSError, sqlite3.Error, pickle.PicklingError) as err:
+            self.logger.error(f"Cache store failed for {path}: {err}")
+
+    def evict(self):
+        """Removes least recently used entries until the cache fits"""
+        total_size = self.connection.execute(
+            "SELECT COALESCE(SUM(LENGTH(data)), 0) FROM entries"
+        ).fetchone()[0]
+
+        if total_size <= self.max_size_bytes:
+            return
+
+        rows = self.connection.execute(
+            "SELECT kind, path, LENGTH(data) FROM entries ORDER BY last_used ASC"
+        ).fetchall()
+        for kind, path, size in rows:
+            if total_size <= self.max_size_bytes:
+                break
+            self.connection.execute(
+                "DELETE FROM entries WHERE kind = ? AND path = ?", (kind, path)
+            )
+            total_size -= size
+
+    def get_or_parse(self, kind: str, path: str, parse: Callable[[], T]) -> T:
+        """
+        Returns the cached value for path, otherwise parses and stores
+        it. Exceptions from parse are not cached.
+        """
+        found, value = self.lookup(kind, path)
+        if found:
+            self.logger.debug(f"Cache hit ({kind}): {path}")
+            return value
+
+        value = parse()
+        self.store(kind, path, value)
+        return value
+
+
+class MemoryAnalysisCache(AnalysisCache):
+    """
+    Keeps parsed values in memory in front of the SQLite cache, for
+    processes that analyze the same mods over and over, like serve.
+
+    Memory entries are checked against size and mtime only, and the
+    least recently used ones are dropped past max_entries. Values are
+    shared between callers, so they must not be modified.
+    """
+
+    DEFAULT_MAX_ENTRIES = 10_000
+
+    def __init__(
+        self,
+        cache_dir: str = AnalysisCache.DEFAULT_CACHE_DIR,
+        max_size_bytes: int = AnalysisCache.DEFAULT_MAX_SIZE_BYTES,
+        enabled: bool = True,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        # enabled only controls the SQLite cache, memory is always used
+        super().__init__(cache_dir, max_size_bytes, enabled)
+        self.max_entries = max_entries
+        # (kind, path) => (size, mtime_ns, value), least recently used first
+        self.memory_entries: OrderedDict[tuple[str, str], tuple[int, int, Any]] = (
+            OrderedDict()
+        )
+
+    def remember(self, key: tuple[str, str], stat: os.stat_result, value: Any):
+        with self.lock:
+            self.memory_entries[key] = (stat.st_size, stat.st_mtime_ns, value)
+            self.memory_entries.move_to_end(key)
+            while len(self.memory_entries) > self.max_entries:
+                self.memory_entries.popitem(last=False)
+
+    def lookup(self, kind: str, path: str) -> tuple[bool, Any]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False, None
+
+        key = (kind, self.get_key_path(path))
+        with self.lock:
+            entry = self.memory_entries.get(key)
+            if entry is not None:
+                size, mtime_ns, value = entry
+                if size == stat.st_size and mtime_ns == stat.st_mtime_ns:
+                    self.memory_entries.move_to_end(key)
+                    return True, value
+
+        found, value = super().lookup(kind, path)
+        if found:
+            self.remember(key, stat, value)
+        return found, value
+
+    def store(self, kind: str, path: str, value: Any):
+        super().store(kind, path, value)
+        try:
+            self.remember((kind, self.get_key_path(path)), os.stat(path), value)
+        except OSError:
+            pass
+
+    def clear_memory(self):
+        with self.lock:
+            self.memory_entries.clear()
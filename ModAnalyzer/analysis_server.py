@@ -0,0 +1,173 @@
+import json
+import logging
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from ModAnalyzer.analysis_api import analyze_mod
+from ModAnalyzer.analysis_cache import AnalysisCache, MemoryAnalysisCache
+
+
+class AnalysisServer:
+    """
+    Local HTTP server that keeps parsed files in memory between
+    requests, so editors can re-run the analysis without paying for
+    startup and parsing every time.
+
+    POST /analyze {"mod_dir": "..."} or GET /analyze?mod_dir=...
+    returns the same JSON as analyze --format json. mod_dir can also
+    be a .zip or .pak, which is read in place without extracting it.
+    GET /health returns the number of requests served.
+
+    Each request runs analyze_mod, so only the cache is shared.
+    Requests for the same mod dir run one at a time so they don't
+    parse the same files twice.
+    """
+
+    DEFAULT_HOST = "127.0.0.1"
+    DEFAULT_PORT = 8765
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        cache_dir: str | None = AnalysisCache.DEFAULT_CACHE_DIR,
+        **kwargs,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.host = host
+        self.port = port
+        # None keeps parsed files in memory only
+        self.cache = MemoryAnalysisCache(
+            cache_dir or AnalysisCache.DEFAULT_CACHE_DIR,
+            enabled=cache_dir is not None,
+        )
+        # Passed on to each Analyzer, e.g. streaming, rt_workers or
+        # vanilla_index, which every request reads
+        self.analyzer_kwargs = kwargs
+        self.num_requests = 0
+        self.lock = threading.Lock()
+        self.mod_dir_locks: dict[str, threading.Lock] = {}
+        # Requests holding or waiting for each mod dir lock
+        self.mod_dir_users: dict[str, int] = {}
+        self.http_server: ThreadingHTTPServer | None = None
+
+    @contextmanager
+    def lock_mod_dir(self, mod_dir: str) -> Iterator[None]:
+        """
+        Runs requests for the same mod dir one at a time. A lock is
+        dropped once nothing holds or waits for it, so a server that
+        sees a new path every request doesn't keep a lock for each.
+        """
+        key = os.path.abspath(mod_dir)
+        with self.lock:
+            self.num_requests += 1
+            mod_dir_lock = self.mod_dir_locks.setdefault(key, threading.Lock())
+            self.mod_dir_users[key] = self.mod_dir_users.get(key, 0) + 1
+
+        try:
+            with mod_dir_lock:
+                yield
+        finally:
+            with self.lock:
+                self.mod_dir_users[key] -= 1
+                if self.mod_dir_users[key] == 0:
+                    del self.mod_dir_users[key]
+                    del self.mod_dir_locks[key]
+
+    def analyze(self, mod_dir: str) -> dict:
+        """Raises RuntimeError if the analysis failed"""
+        with self.lock_mod_dir(mod_dir):
+            result = analyze_mod(mod_dir, cache=self.cache, **self.analyzer_kwargs)
+
+        if result.error:
+            raise RuntimeError(result.error)
+
+        self.logger.info(f"Analyzed {mod_dir} in {result.elapsed_ms} ms")
+        return result.to_dict()
+
+    def get_health(self) -> dict:
+        with self.lock:
+            return {"status": "ok", "requests": self.num_requests}
+
+    def create_http_server(self) -> ThreadingHTTPServer:
+        http_server = ThreadingHTTPServer(
+            (self.host, self.port), AnalysisRequestHandler
+        )
+        http_server.daemon_threads = True
+        http_server.analysis_server = self
+        # Port 0 picks a free port, so read back the real one
+        self.port = http_server.server_address[1]
+        self.http_server = http_server
+        return http_server
+
+    def serve_forever(self):
+        http_server = self.http_server or self.create_http_server()
+        try:
+            http_server.serve_forever()
+        finally:
+            http_server.server_close()
+            self.cache.close()
+            vanilla_index = self.analyzer_kwargs.get("vanilla_index")
+            if vanilla_index is not None:
+                vanilla_index.close()
+
+    def shutdown(self):
+        if self.http_server is not None:
+            self.http_server.shutdown()
+
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    server: ThreadingHTTPServer
+
+    def send_json(self, status: HTTPStatus, body: dict):
+        contents = json.dumps(body).encode("UTF-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(contents)))
+        self.end_headers()
+        self.wfile.write(contents)
+
+    def handle_analyze(self, mod_dir: str | None):
+        if not mod_dir:
+            self.send_json(HTTPStatus.BAD_REQUEST, {"error": "mod_dir is required"})
+            return
+
+        try:
+            report = self.server.analysis_server.analyze(mod_dir)
+        except Exception as err:
+            logging.getLogger(__name__).error(f"Failed to analyze {mod_dir}: {err}")
+            self.send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(err)})
+            return
+
+        self.send_json(HTTPStatus.OK, report)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/health":
+            self.send_json(HTTPStatus.OK, self.server.analysis_server.get_health())
+        elif url.path == "/analyze":
+            self.handle_analyze(parse_qs(url.query).get("mod_dir", [None])[0])
+        else:
+            self.send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {url.path}"})
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/analyze":
+            self.send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as err:
+            self.send_json(HTTPStatus.BAD_REQUEST, {"error": f"Invalid JSON: {err}"})
+            return
+
+        self.handle_analyze(body.get("mod_dir") if isinstance(body, dict) else None)
+
+    def log_message(self, format: str, *args):
+        logging.getLogger(__name__).debug(format % args)
@@ -1,27 +1,41 @@
 import os
-import pprint
 import time
-import xml.etree.ElementTree as ET
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import typer
-from tabulate import tabulate
 
 from ModAnalyzer import Structure
+from ModAnalyzer.analysis_cache import AnalysisCache
+from ModAnalyzer.Localization import LocalizationAnalyzer
+from ModAnalyzer.Localization.localization_analyzer import LocalizationReport
+from ModAnalyzer.mod_fs import DirectoryModFS, ModFS
 from ModAnalyzer.ScriptExtender import SEAnalyzer
-from ModAnalyzer.Structure import StructureReport
+from ModAnalyzer.ScriptExtender.se_analyzer import SEReport
+from ModAnalyzer.Structure import ModTreeIndex, StructureReport
 from ModAnalyzer.Structure.path_analyzer import PathAnalyzer
 from ModAnalyzer.Structure.structure_analyzer import StructureAnalyzer
 from ModAnalyzer.TreasureTable import (
     TreasureTableAnalyzer,
     TreasureTableReport,
 )
+from ModAnalyzer.TreasureTable.models import TemplateRecord
+from ModAnalyzer.timings import Timings
 
+if TYPE_CHECKING:
+    from ModAnalyzer.GameData import VanillaIndex
 
+
+@dataclass
 class AnalyzerReport:
-    # TreasureTable: TreasureTableReport
+    mod_dir: str
     Structure: StructureReport
-    TreasureTable: TreasureTableReport
+    TreasureTable: TreasureTableReport | None = None
+    ScriptExtender: SEReport | None = None
+    Localization: LocalizationReport | None = None
+    # Set when the analysis itself failed
+    error: str = ""
 
 
 class Analyzer:
@@ -30,17 +44,42 @@ class Analyzer:
     """
 
     using_typer: bool = False
+    streaming: bool = False
+    # Processes used to parse root templates
+    rt_workers: int = 1
+    # Where mods are read from, directories on disk by default
+    fs: ModFS
+    cache: AnalysisCache
+    timings: Timings
+    vanilla_index: "VanillaIndex | None" = None
 
     def __init__(self, **kwargs):
+        self.fs = kwargs.get("fs") or DirectoryModFS()
         self.path_analyzer = PathAnalyzer(**kwargs)
+        self.cache = kwargs.get("cache") or AnalysisCache(enabled=False)
+        # Cache entries are keyed on files on disk
+        if not self.fs.is_local:
+            self.cache = AnalysisCache(enabled=False)
+        self.timings = kwargs.get("timings") or Timings()
 
         if "using_typer" in kwargs:
             self.using_typer = kwargs["using_typer"]
 
+        if "streaming" in kwargs:
+            self.streaming = kwargs["streaming"]
+
+        if "rt_workers" in kwargs:
+            self.rt_workers = kwargs["rt_workers"]
+
+        if "vanilla_index" in kwargs:
+            self.vanilla_index = kwargs["vanilla_index"]
+
     def print(self, input_str: str):
         if self.using_typer:
             typer.echo(input_str)
         else:
+            import pprint
+
             pprint.pp(input_str)
 
     def get_colored_status(
@@ -58,38 +97,37 @@ class Analyzer:
 
     def get_meta_csv_path(self, analyzer: StructureAnalyzer) -> str:
         """
-        Gets both meta paths as a comma separated string
+        Gets every meta path as a comma separated string
         """
         return ", ".join(
             [
                 analyzer.path_analyzer.get_colored_path(analyzer.get_meta_path()),
                 analyzer.path_analyzer.get_colored_path(analyzer.get_mt_meta_path()),
+                analyzer.path_analyzer.get_colored_path(
+                    analyzer.get_binary_meta_path()
+                ),
             ]
         )
 
     def print_debug_info(self, analyzer: StructureAnalyzer):
+        from tabulate import tabulate
+
         debug_tbl = []
 
         if len(analyzer.mod_dirs) > 0:
             for mod_dir in analyzer.mod_dirs:
                 debug_tbl.append([mod_dir])
 
-            typer.echo(tabulate(debug_tbl, headers=["Mod Directories"]))
+            with self.timings.span("render"):
+                typer.echo(tabulate(debug_tbl, headers=["Mod Directories"]))
         else:
             typer.echo("No mod directories found")
 
         typer.echo(os.linesep)
 
-    def get_list_of_ignored_items(self, items: list[ET.Element]) -> str:
-        names: list[str] = []
+    def get_list_of_ignored_items(self, items: list[TemplateRecord]) -> str:
+        names = [item.name for item in items if item.name]
         output = ""
-        for item in items:
-            attributes = item.findall("attribute")
-
-            # Get ignored nodes
-            for attr_node in attributes:
-                if "id" in attr_node.attrib and attr_node.attrib["id"] == "Name":
-                    names.append(attr_node.attrib["value"])
 
         if len(names) > 0:
             output = ", ".join(names)
@@ -116,6 +154,10 @@ class Analyzer:
         structure_report: StructureReport,
         debug_mode: bool,
     ):
+        # Only imported when there is something to render, which
+        # --format json never does
+        from tabulate import tabulate
+
         if debug_mode:
             self.print_debug_info(structure_analyzer)
 
@@ -153,74 +195,286 @@ class Analyzer:
             ],
         ]
 
-        typer.echo(tabulate(structure_report_table, headers=headers))
-
-    def print_tt_report(self, has_tt: bool, tt_filename: str, rt_dir: str):
-        # Treasure table report
-        if has_tt:
-            tt_report = self.get_tt_report(tt_filename, rt_dir)
+        with self.timings.span("render"):
+            typer.echo(tabulate(structure_report_table, headers=headers))
 
-            num_verified_items = typer.style(
-                len(tt_report.verified_items), typer.colors.GREEN
-            )
-            tt_report_table = [
-                [
-                    "Verified treasure items",
-                    self.get_colored_status(True, ok_str="OK", fail_str="FAIL"),
-                    f"{num_verified_items} items present in treasure tables",
-                ]
+    def get_tt_rows(self, tt_report: TreasureTableReport) -> list[list[str]]:
+        """Rows about the treasure table itself"""
+        num_verified_items = typer.style(
+            len(tt_report.verified_items), typer.colors.GREEN
+        )
+        tt_report_table: list[list[str]] = [
+            [
+                "Verified treasure items",
+                self.get_colored_status(True, ok_str="OK", fail_str="FAIL"),
+                f"{num_verified_items} items present in treasure tables",
             ]
+        ]
 
-            num_ignored = typer.style(
-                len(tt_report.ignored_items), fg=typer.colors.GREEN
-            )
-            ignored_items_csv = self.get_list_of_ignored_items(tt_report.ignored_items)
-            ignored_items_with_paren = (
-                f"({ignored_items_csv})" if ignored_items_csv else ""
-            )
-            tt_report_table.append(
-                [
-                    "Ignored treasure items",
-                    # This isn't really ok/fail
-                    self.get_colored_status(True, ok_str="OK", fail_str="FAIL"),
-                    f"{str(num_ignored)} items ignored {ignored_items_with_paren}",
-                ],
-            )
+        num_ignored = typer.style(len(tt_report.ignored_items), fg=typer.colors.GREEN)
+        ignored_items_csv = self.get_list_of_ignored_items(tt_report.ignored_items)
+        ignored_items_with_paren = f"({ignored_items_csv})" if ignored_items_csv else ""
+        tt_report_table.append(
+            [
+                "Ignored treasure items",
+                # This isn't really ok/fail
+                self.get_colored_status(True, ok_str="OK", fail_str="FAIL"),
+                f"{str(num_ignored)} items ignored {ignored_items_with_paren}",
+            ],
+        )
 
-            num_tt_entries = typer.style(
-                len(tt_report.treasure_table_entries), fg=typer.colors.GREEN
-            )
+        num_tt_entries = typer.style(
+            len(tt_report.treasure_table_entries), fg=typer.colors.GREEN
+        )
+        tt_report_table.append(
+            [
+                "Treasure table entries",
+                self.get_colored_status(True, ok_str="OK", fail_str="FAIL"),
+                f"{num_tt_entries} entries",
+            ],
+        )
+
+        num_inaccessible = typer.style(
+            len(tt_report.inaccessible_items), fg=typer.colors.GREEN
+        )
+        tt_report_table.append(
+            [
+                "Items not in treasure file",
+                self.get_colored_status(True, ok_str="OK", fail_str="FAIL"),
+                f"{num_inaccessible} items may not be accessible",
+            ],
+        )
+
+        if self.vanilla_index is not None:
+            unknown_references = tt_report.unknown_table_references
             tt_report_table.append(
                 [
-                    "Treasure table entries",
-                    self.get_colored_status(True, ok_str="OK", fail_str="FAIL"),
-                    f"{num_tt_entries} entries",
+                    "Table references",
+                    self.get_colored_status(
+                        not unknown_references, ok_str="OK", fail_str="FAIL"
+                    ),
+                    (
+                        f"Not in the mod or vanilla: {', '.join(sorted(unknown_references))}"
+                        if unknown_references
+                        else "All referenced tables exist"
+                    ),
                 ],
             )
 
-            num_inaccessible = typer.style(
-                len(tt_report.inaccessible_items), fg=typer.colors.GREEN
-            )
-            tt_report_table.append(
-                [
-                    "Items not in treasure file",
-                    self.get_colored_status(True, ok_str="OK", fail_str="FAIL"),
-                    f"{num_inaccessible} items may not be accessible",
-                ],
+        return tt_report_table
+
+    def print_tt_report(
+        self,
+        has_tt: bool,
+        tt_filename: str,
+        rt_dir: str,
+        stats_dir: str | None = None,
+        has_root_templates: bool = False,
+    ) -> TreasureTableReport | None:
+        from tabulate import tabulate
+
+        tt_report = None
+        # Treasure table report. Without a treasure table, only root
+        # template stats are checked.
+        if has_tt or has_root_templates:
+            tt_report = self.get_tt_report(tt_filename, rt_dir, stats_dir)
+            tt_report_table = self.get_tt_rows(tt_report) if has_tt else []
+
+            if tt_report.has_stats:
+                unknown_stats = tt_report.unknown_stats
+                tt_report_table.append(
+                    [
+                        "Root template stats",
+                        self.get_colored_status(
+                            not unknown_stats, ok_str="OK", fail_str="FAIL"
+                        ),
+                        (
+                            f"No stats entry: {', '.join(sorted(unknown_stats))}"
+                            if unknown_stats
+                            else "Every Stats value has an entry"
+                        ),
+                    ],
+                )
+
+                # Entries are only checked in the mod's treasure table
+                if has_tt:
+                    unknown_categories = tt_report.unknown_object_categories
+                    tt_report_table.append(
+                        [
+                            "Treasure table stats",
+                            # Without the index, these could be vanilla items
+                            self.get_colored_status(
+                                not unknown_categories,
+                                ok_str="OK",
+                                fail_str="FAIL" if self.vanilla_index else "WARN",
+                                fail_color=(
+                                    typer.colors.RED
+                                    if self.vanilla_index
+                                    else typer.colors.YELLOW
+                                ),
+                            ),
+                            (
+                                f"No stats entry: {', '.join(sorted(unknown_categories))}"
+                                if unknown_categories
+                                else "Every entry has a stats entry"
+                            ),
+                        ],
+                    )
+
+                inheritance_errors = [
+                    f"{entry_name} uses missing {parent_name}"
+                    for entry_name, parent_name in sorted(
+                        tt_report.missing_stats_parents.items()
+                    )
+                ] + sorted(
+                    {
+                        f"Loop: {' > '.join(cycle)}"
+                        for cycle in tt_report.stats_cycles.values()
+                    }
+                )
+                tt_report_table.append(
+                    [
+                        "Stats inheritance",
+                        self.get_colored_status(
+                            not inheritance_errors,
+                            ok_str="OK",
+                            fail_str=(
+                                "FAIL"
+                                if self.vanilla_index or tt_report.stats_cycles
+                                else "WARN"
+                            ),
+                            fail_color=(
+                                typer.colors.RED
+                                if self.vanilla_index or tt_report.stats_cycles
+                                else typer.colors.YELLOW
+                            ),
+                        ),
+                        (
+                            os.linesep.join(inheritance_errors)
+                            if inheritance_errors
+                            else "Every using parent exists"
+                        ),
+                    ],
+                )
+
+            if tt_report_table:
+                with self.timings.span("render"):
+                    typer.echo(os.linesep)
+                    typer.echo(
+                        tabulate(
+                            tt_report_table,
+                            headers=["Treasure Table Report", "Status", "Details"],
+                        )
+                    )
+
+        return tt_report
+
+    def get_localization_report(
+        self,
+        structure_analyzer: StructureAnalyzer,
+        tt_report: TreasureTableReport | None = None,
+    ) -> LocalizationReport:
+        localization_analyzer = LocalizationAnalyzer(
+            structure_analyzer=structure_analyzer,
+            cache=self.cache,
+            timings=self.timings,
+        )
+        # Reuse the templates the treasure table stage already parsed
+        template_records = None
+        if tt_report is not None and (
+            tt_report.verified_items or tt_report.ignored_items
+        ):
+            template_records = tt_report.verified_items + tt_report.ignored_items
+        return localization_analyzer.generate_report(template_records)
+
+    def print_localization_report(
+        self,
+        structure_analyzer: StructureAnalyzer,
+        tt_report: TreasureTableReport | None = None,
+    ):
+        from tabulate import tabulate
+
+        loca_report = self.get_localization_report(structure_analyzer, tt_report)
+        loca_report_table = [
+            [
+                "Localization files",
+                self.get_colored_status(loca_report.has_localization),
+                os.linesep.join(
+                    [
+                        self.path_analyzer.get_colored_path(loca_file)
+                        for loca_file in loca_report.localization_files
+                    ]
+                    + [f"{loca_report.num_entries} entries"]
+                ),
+            ]
+        ]
+
+        missing_handles = loca_report.missing_handles
+        # The first few are enough to find the problem
+        missing_details = [
+            f"{handle} ({', '.join(sources)})"
+            for handle, sources in list(missing_handles.items())[:5]
+        ]
+        if len(missing_handles) > len(missing_details):
+            missing_details.append(
+                f"and {len(missing_handles) - len(missing_details)} more"
             )
+        loca_report_table.append(
+            [
+                "Missing handles",
+                self.get_colored_status(
+                    not missing_handles, ok_str="OK", fail_str="FAIL"
+                ),
+                (
+                    os.linesep.join(missing_details)
+                    if missing_details
+                    else "Every handle has an entry"
+                ),
+            ]
+        )
+        loca_report_table.append(
+            [
+                "Duplicate handles",
+                self.get_colored_status(
+                    not loca_report.duplicate_handles,
+                    ok_str="OK",
+                    fail_str="WARN",
+                    fail_color=typer.colors.YELLOW,
+                ),
+                f"{len(loca_report.duplicate_handles)} handles have more than one entry",
+            ]
+        )
+        loca_report_table.append(
+            [
+                "Unused handles",
+                self.get_colored_status(
+                    not loca_report.unused_handles,
+                    ok_str="OK",
+                    fail_str="WARN",
+                    fail_color=typer.colors.YELLOW,
+                ),
+                f"{len(loca_report.unused_handles)} entries are not used by root templates, tags or stats",
+            ]
+        )
 
-            typer.echo(os.linesep)
+        with self.timings.span("render"):
             typer.echo(
                 tabulate(
-                    tt_report_table,
-                    headers=["Treasure Table Report", "Status", "Details"],
+                    loca_report_table,
+                    headers=["Localization Report", "Status", "Details"],
                 )
             )
 
     def print_se_report(
-        self, mod_dirs: list[str], structure_analyzer: StructureAnalyzer
+        self, mod_dirs: ModTreeIndex, structure_analyzer: StructureAnalyzer
     ):
-        se_analyzer = SEAnalyzer(structure_analyzer=structure_analyzer)
+        from tabulate import tabulate
+
+        se_analyzer = SEAnalyzer(
+            structure_analyzer=structure_analyzer,
+            cache=self.cache,
+            timings=self.timings,
+        )
         se_report = se_analyzer.generate_report(mod_dirs)
 
         """
@@ -372,12 +626,13 @@ class Analyzer:
                     ]
                 )
 
-        typer.echo(
-            tabulate(
-                se_report_table,
-                headers=["Script Extender Report", "Status", "Details"],
+        with self.timings.span("render"):
+            typer.echo(
+                tabulate(
+                    se_report_table,
+                    headers=["Script Extender Report", "Status", "Details"],
+                )
             )
-        )
 
     def print_analysis_duration(self, start_time: float):
         # Show elapsed time
@@ -388,41 +643,127 @@ class Analyzer:
         typer.echo(f"Analysis complete in {elapsed_desc} seconds")
         typer.echo(os.linesep)
 
-    def analyze(self, mod_dir: str, **kwargs):
-        start_time: float = time.time()
-        mod_name = StructureAnalyzer.get_mod_name_from_dir(mod_dir)
-        structure_analyzer = Structure.StructureAnalyzer(mod_name=mod_name)
+    def get_structure_analyzer(self, mod_dir: str) -> tuple[str, StructureAnalyzer]:
+        """
+        Returns the normalized mod dir and a StructureAnalyzer for it
+        """
+        # Archives name the mod in Mods/ModName, not in their own name
+        mod_folder_name = self.fs.get_mod_name()
+        mod_name = mod_folder_name or StructureAnalyzer.get_mod_name_from_dir(mod_dir)
+        structure_analyzer = Structure.StructureAnalyzer(
+            mod_name=mod_name,
+            mod_folder_name=mod_folder_name,
+            cache=self.cache,
+            fs=self.fs,
+            path_analyzer=self.path_analyzer,
+            timings=self.timings,
+        )
 
-        # Resolve if relative path
-        if "." in mod_dir:
+        # Resolve if relative path. Archive paths are relative to the
+        # archive, so they are left as they are.
+        if self.fs.is_local and "." in mod_dir:
             mod_dir = str(Path(mod_dir).resolve())
 
         mod_dir = structure_analyzer.get_mod_dir_without_dir_seps(mod_dir)
-        structure_report = structure_analyzer.generate_report(mod_dir)
+        return mod_dir, structure_analyzer
+
+    def generate_report(self, mod_dir: str) -> AnalyzerReport:
+        """
+        Runs every stage for a single mod without printing anything
+        """
+        with self.timings.span("generate_report"):
+            mod_dir, structure_analyzer = self.get_structure_analyzer(mod_dir)
+            with self.timings.span("structure"):
+                structure_report = structure_analyzer.generate_report(mod_dir)
+            report = AnalyzerReport(mod_dir=mod_dir, Structure=structure_report)
+
+            if report.Structure.mod_dir_exists:
+                # Root template stats are checked without a treasure table too
+                if (
+                    report.Structure.has_treasure_table
+                    or report.Structure.has_root_templates
+                ):
+                    with self.timings.span("treasure_table"):
+                        report.TreasureTable = self.get_tt_report(
+                            structure_analyzer.get_treasure_table_file_path(),
+                            structure_analyzer.get_rt_dir(),
+                            structure_analyzer.get_data_path(),
+                        )
+
+                se_analyzer = SEAnalyzer(
+                    structure_analyzer=structure_analyzer,
+                    cache=self.cache,
+                    timings=self.timings,
+                )
+                with self.timings.span("script_extender"):
+                    report.ScriptExtender = se_analyzer.generate_report(
+                        structure_analyzer.mod_dirs
+                    )
+
+                with self.timings.span("localization"):
+                    report.Localization = self.get_localization_report(
+                        structure_analyzer, report.TreasureTable
+                    )
+
+        return report
+
+    def analyze(self, mod_dir: str, **kwargs):
+        start_time: float = time.time()
         debug_mode = False
 
         if "debug_mode" in kwargs:
             debug_mode = kwargs["debug_mode"]
 
-        if structure_report.mod_dir_exists:
-            # Structure
-            self.print_structure_report(
-                mod_dir, structure_analyzer, structure_report, debug_mode
-            )
+        # Each stage span includes printing its table, which is
+        # measured by its render span
+        with self.timings.span("analyze"):
+            mod_dir, structure_analyzer = self.get_structure_analyzer(mod_dir)
+            with self.timings.span("structure"):
+                structure_report = structure_analyzer.generate_report(mod_dir)
 
-            # Treasure table report
-            tt_filename = structure_analyzer.get_treasure_table_file_path()
-            rt_dir = structure_analyzer.get_rt_dir()
-            has_tt = structure_report.has_treasure_table
-            self.print_tt_report(has_tt, tt_filename, rt_dir)
-            typer.echo(os.linesep)
+                if structure_report.mod_dir_exists:
+                    self.print_structure_report(
+                        mod_dir, structure_analyzer, structure_report, debug_mode
+                    )
 
-            # SE
-            self.print_se_report(structure_analyzer.mod_dirs, structure_analyzer)
+            if structure_report.mod_dir_exists:
+                # Treasure table report
+                tt_filename = structure_analyzer.get_treasure_table_file_path()
+                rt_dir = structure_analyzer.get_rt_dir()
+                has_tt = structure_report.has_treasure_table
+                with self.timings.span("treasure_table"):
+                    tt_report = self.print_tt_report(
+                        has_tt,
+                        tt_filename,
+                        rt_dir,
+                        structure_analyzer.get_data_path(),
+                        structure_report.has_root_templates,
+                    )
+                typer.echo(os.linesep)
+
+                # SE
+                with self.timings.span("script_extender"):
+                    self.print_se_report(
+                        structure_analyzer.mod_dirs, structure_analyzer
+                    )
+                typer.echo(os.linesep)
+
+                with self.timings.span("localization"):
+                    self.print_localization_report(structure_analyzer, tt_report)
 
         self.print_analysis_duration(start_time)
 
-    def get_tt_report(self, tt_filename: str, rt_dir: str) -> TreasureTableReport:
-        tt_analyzer = TreasureTableAnalyzer()
-        report = tt_analyzer.generate_report(tt_filename, rt_dir)
+    def get_tt_report(
+        self, tt_filename: str, rt_dir: str, stats_dir: str | None = None
+    ) -> TreasureTableReport:
+        tt_analyzer = TreasureTableAnalyzer(
+            cache=self.cache,
+            fs=self.fs,
+            path_analyzer=self.path_analyzer,
+            streaming=self.streaming,
+            workers=self.rt_workers,
+            timings=self.timings,
+            vanilla_index=self.vanilla_index,
+        )
+        report = tt_analyzer.generate_report(tt_filename, rt_dir, stats_dir)
         return report
@@ -0,0 +1,307 @@
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import typer
+
+from ModAnalyzer.analysis_cache import AnalysisCache
+from ModAnalyzer.analyzer import Analyzer, AnalyzerReport
+from ModAnalyzer.mod_fs import get_mod_fs, is_archive
+from ModAnalyzer.Structure import StructureReport
+
+if TYPE_CHECKING:
+    from ModAnalyzer.GameData import VanillaIndex
+
+# Index path => the index, opened once per worker process and shared
+# by every mod it analyzes
+vanilla_indexes: dict[str, "VanillaIndex | None"] = {}
+
+
+def get_vanilla_index(index_path: str | None) -> "VanillaIndex | None":
+    if not index_path:
+        return None
+
+    if index_path not in vanilla_indexes:
+        from ModAnalyzer.GameData import VanillaIndex
+
+        vanilla_indexes[index_path] = VanillaIndex.open_if_exists(index_path)
+    return vanilla_indexes[index_path]
+
+
+def generate_mod_report(
+    mod_dir: str, cache_dir: str | None = None, vanilla_index_path: str | None = None
+) -> AnalyzerReport:
+    """
+    Analyzes one mod. This runs in worker processes, so it has to
+    be a module level function and its result must be picklable.
+    Each worker opens its own connection to the cache, and archives
+    are read in place.
+    """
+    cache = AnalysisCache(cache_dir, enabled=cache_dir is not None)
+    try:
+        with get_mod_fs(mod_dir) as fs:
+            analyzer = Analyzer(
+                cache=cache,
+                fs=fs,
+                vanilla_index=get_vanilla_index(vanilla_index_path),
+            )
+            return analyzer.generate_report(fs.get_mod_dir(mod_dir))
+    finally:
+        cache.close()
+
+
+@dataclass
+class CollectionReport:
+    reports: list[AnalyzerReport] = field(default_factory=list)
+    workers: int = 1
+    elapsed_seconds: float = 0.0
+
+    def get_total_verified_items(self) -> int:
+        return sum(
+            len(report.TreasureTable.verified_items)
+            for report in self.reports
+            if report.TreasureTable
+        )
+
+    def get_total_inaccessible_items(self) -> int:
+        return sum(
+            len(report.TreasureTable.inaccessible_items)
+            for report in self.reports
+            if report.TreasureTable
+        )
+
+
+class CollectionAnalyzer:
+    """
+    Analyzes a collection of mods, one mod per worker process
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        cache_dir: str | None = None,
+        vanilla_index_path: str | None = None,
+        **kwargs,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.workers = workers or os.cpu_count() or 1
+        # None disables the analysis cache
+        self.cache_dir = cache_dir
+        # Workers open the index themselves instead of unpickling it
+        # for every mod
+        self.vanilla_index_path = vanilla_index_path
+        self.analyzer = Analyzer(**kwargs)
+
+    def get_mod_dirs(self, paths: list[str]) -> list[str]:
+        """
+        Each path is either a mod or a folder of mods. Anything with
+        a Mods directory is a mod, and so is a .zip or .pak. Otherwise
+        every visible directory or archive inside it is treated as one.
+        """
+        mod_dirs: list[str] = []
+
+        for path in paths:
+            if os.path.isdir(os.path.join(path, "Mods")):
+                mod_dirs.append(path)
+            elif is_archive(path) and os.path.isfile(path):
+                mod_dirs.append(path)
+            elif os.path.isdir(path):
+                with os.scandir(path) as entries:
+                    mod_dirs += sorted(
+                        entry.path
+                        for entry in entries
+                        if not entry.name.startswith(".")
+                        and (
+                            entry.is_dir()
+                            or (is_archive(entry.name) and entry.is_file())
+                        )
+                    )
+            else:
+                self.logger.error(f"{path} does not exist or is not a directory")
+
+        return mod_dirs
+
+    def get_failed_report(self, mod_dir: str, err: BaseException) -> AnalyzerReport:
+        self.logger.error(f"Unexpected error analyzing {mod_dir}: {err}")
+        return AnalyzerReport(
+            mod_dir=mod_dir, Structure=StructureReport(), error=str(err)
+        )
+
+    def generate_report(self, paths: list[str]) -> CollectionReport:
+        """
+        Fans the mods out over a process pool. Reports are kept in
+        the same order as the mod dirs regardless of which worker
+        finishes first.
+        """
+        start_time = time.time()
+        mod_dirs = self.get_mod_dirs(paths)
+        workers = max(1, min(self.workers, len(mod_dirs)))
+        report = CollectionReport(workers=workers)
+
+        if workers == 1:
+            for mod_dir in mod_dirs:
+                try:
+                    report.reports.append(
+                        generate_mod_report(
+                            mod_dir, self.cache_dir, self.vanilla_index_path
+                        )
+                    )
+                except Exception as err:
+                    report.reports.append(self.get_failed_report(mod_dir, err))
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        generate_mod_report,
+                        mod_dir,
+                        self.cache_dir,
+                        self.vanilla_index_path,
+                    )
+                    for mod_dir in mod_dirs
+                ]
+                for mod_dir, future in zip(mod_dirs, futures):
+                    try:
+                        report.reports.append(future.result())
+                    except Exception as err:
+                        report.reports.append(self.get_failed_report(mod_dir, err))
+
+        report.elapsed_seconds = round(time.time() - start_time, 2)
+
+        return report
+
+    def get_structure_summary(self, report: AnalyzerReport) -> tuple[bool, str]:
+        structure = report.Structure
+        if report.error:
+            return False, report.error
+
+        if not structure.mod_dir_exists:
+            return False, "Mod dir does not exist"
+
+        # Nothing else is checked without Mods/ModName
+        if not structure.has_mods_modname:
+            return False, "Missing: Mods dir"
+
+        checks = {
+            "Meta file": structure.has_meta_file,
+            "Public directory": structure.has_public,
+            "Root Templates": structure.has_root_templates,
+            "Treasure Table": structure.has_treasure_table,
+        }
+        missing = [name for name in checks if not checks[name]]
+        is_valid = structure.has_meta_file
+
+        return is_valid, f"Missing: {', '.join(missing)}" if missing else ""
+
+    def get_tt_summary(self, report: AnalyzerReport) -> tuple[bool, str]:
+        tt_report = report.TreasureTable
+        if tt_report is None:
+            return True, ""
+
+        details = [
+            f"{len(tt_report.verified_items)} verified",
+            f"{len(tt_report.ignored_items)} ignored",
+            f"{len(tt_report.inaccessible_items)} inaccessible",
+        ]
+        if tt_report.invalid_entries:
+            details.append(f"{len(tt_report.invalid_entries)} invalid entries")
+
+        is_valid = not tt_report.inaccessible_items and not tt_report.invalid_entries
+        return is_valid, ", ".join(details)
+
+    def get_se_summary(self, report: AnalyzerReport) -> tuple[bool, str]:
+        se_report = report.ScriptExtender
+        if se_report is None or not se_report.has_se_dir:
+            return True, ""
+
+        if not se_report.has_config:
+            return False, "Config file not found"
+
+        if se_report.config_parse_error:
+            return False, "Config parse error"
+
+        problems = list(se_report.config_missing_fields) + list(
+            se_report.config_invalid_fields
+        )
+        if problems:
+            return False, f"Config fields: {', '.join(problems)}"
+
+        if not se_report.has_bootstrap_server and not se_report.has_bootstrap_client:
+            return False, "No bootstrap files"
+
+        return True, ""
+
+    def print_report(self, collection_report: CollectionReport):
+        from tabulate import tabulate
+
+        table: list[list[str]] = []
+        num_failed = 0
+
+        for report in collection_report.reports:
+            structure_ok, structure_details = self.get_structure_summary(report)
+            tt_ok, tt_details = self.get_tt_summary(report)
+            se_ok, se_details = self.get_se_summary(report)
+
+            if not (structure_ok and tt_ok and se_ok):
+                num_failed += 1
+
+            table.append(
+                [
+                    report.mod_dir,
+                    self.analyzer.get_colored_status(
+                        structure_ok, ok_str="OK", fail_str="FAIL"
+                    ),
+                    structure_details,
+                    self.analyzer.get_colored_status(
+                        tt_ok, ok_str="OK", fail_str="FAIL"
+                    ),
+                    tt_details,
+                    self.analyzer.get_colored_status(
+                        se_ok, ok_str="OK", fail_str="FAIL"
+                    ),
+                    se_details,
+                ]
+            )
+
+        typer.echo(
+            tabulate(
+                table,
+                headers=[
+                    "Mod",
+                    "Structure",
+                    "Details",
+                    "Treasure Table",
+                    "Details",
+                    "Script Extender",
+                    "Details",
+                ],
+            )
+        )
+
+        num_mods = len(collection_report.reports)
+        failed_color = typer.colors.RED if num_failed else typer.colors.GREEN
+        typer.echo(os.linesep)
+        typer.echo(
+            f"{num_mods} mods analyzed, "
+            f"{typer.style(num_failed, fg=failed_color, bold=True)} with problems"
+        )
+        typer.echo(
+            f"{collection_report.get_total_verified_items()} verified treasure items, "
+            f"{collection_report.get_total_inaccessible_items()} may not be accessible"
+        )
+        elapsed_desc = typer.style(
+            collection_report.elapsed_seconds, typer.colors.GREEN
+        )
+        typer.echo(
+            f"Analysis complete in {elapsed_desc} seconds "
+            f"({collection_report.workers} workers)"
+        )
+        typer.echo(os.linesep)
+
+    def analyze(self, paths: list[str]) -> CollectionReport:
+        collection_report = self.generate_report(paths)
+        self.print_report(collection_report)
+        return collection_report
@@ -0,0 +1,32 @@
+from importlib import import_module
+from typing import Any, Callable
+
+
+def get_lazy_getattr(
+    package_name: str, attributes: dict[str, str]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Returns (__getattr__, __dir__) for a package __init__. Each
+    attribute maps to the submodule it is defined in, which is only
+    imported the first time the attribute is used.
+
+    __getattr__, __dir__ = get_lazy_getattr(
+        __name__, {"StructureGenerator": ".structure_generator"}
+    )
+    """
+    package = import_module(package_name)
+
+    def __getattr__(name: str) -> Any:
+        module_name = attributes.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+
+        value = getattr(import_module(module_name, package_name), name)
+        # Later lookups find it directly and skip __getattr__
+        setattr(package, name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(vars(package)) | set(attributes))
+
+    return __getattr__, __dir__
@@ -0,0 +1,383 @@
+import io
+import os
+import posixpath
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import IO, NamedTuple
+
+from ModAnalyzer.Structure.mod_tree_index import ModTreeIndex
+
+ARCHIVE_EXTENSIONS = (".zip", ".pak")
+# Folders at the top of a mod, as opposed to a folder the mod is in
+MOD_CONTENT_DIRS = ("Localization", "Mods", "Public")
+# Any of these in Mods/ModName names the mod
+META_FILE_NAMES = ("meta.lsx", "meta.lsf", "meta.lsf.lsx")
+
+
+class ModFSStat(NamedTuple):
+    size: int
+    mtime_ns: int
+
+
+class ModFS(ABC):
+    """
+    Read only access to a mod's files, so the analyzers read a
+    directory, an archive or files in memory the same way.
+
+    Paths are the ones the analyzers already build from the mod dir,
+    e.g. RunesOfFaerun/Mods/RunesOfFaerun/meta.lsx, where the mod dir
+    is root.
+    """
+
+    # Files are on disk, so they can be mapped, parsed in worker
+    # processes and cached by path
+    is_local: bool = False
+    root: str = ""
+
+    def __init__(self, root: str = ""):
+        self.root = ModTreeIndex.normalize_path(root)
+
+    @abstractmethod
+    def get_tree_index(self, directory: str = "") -> ModTreeIndex:
+        """Every path under directory, for the structure checks"""
+
+    @abstractmethod
+    def exists(self, path: str) -> bool:
+        pass
+
+    @abstractmethod
+    def is_dir(self, path: str) -> bool:
+        pass
+
+    @abstractmethod
+    def is_file(self, path: str) -> bool:
+        pass
+
+    @abstractmethod
+    def list_dir(self, path: str) -> list[str]:
+        """Names of the entries directly inside path"""
+
+    @abstractmethod
+    def get_files(self, directory: str, extension: str) -> list[str]:
+        """Files directly inside directory ending with extension, any case"""
+
+    @abstractmethod
+    def stat(self, path: str) -> ModFSStat:
+        pass
+
+    @abstractmethod
+    def open(self, path: str) -> IO[bytes]:
+        pass
+
+    def read_bytes(self, path: str) -> bytes:
+        with self.open(path) as file:
+            return file.read()
+
+    def read_text(self, path: str, errors: str = "strict") -> str:
+        return self.read_bytes(path).decode("UTF-8", errors=errors)
+
+    def get_local_path(self, path: str) -> str | None:
+        """A path that can be opened directly, if the file is on disk"""
+        return None
+
+    def get_mod_dir(self, mod_path: str) -> str:
+        """The mod dir to analyze for the path this fs was opened from"""
+        return self.root
+
+    def get_mod_name(self) -> str:
+        """
+        The ModName in Mods/ModName/meta.lsx, or empty when the mod dir
+        is named after the mod
+        """
+        return ""
+
+    def close(self):
+        pass
+
+    def __enter__(self) -> "ModFS":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class DirectoryModFS(ModFS):
+    """
+    Files on disk, read with the os module as before. Nothing is
+    cached, so watch mode sees every change.
+    """
+
+    is_local = True
+
+    def get_tree_index(self, directory: str = "") -> ModTreeIndex:
+        # Scanned on every call, the structure checks scan once per analysis
+        return ModTreeIndex.from_directory(directory or self.root or ".")
+
+    def exists(self, path: str) -> bool:
+        return os.path.exists(path)
+
+    def is_dir(self, path: str) -> bool:
+        return os.path.isdir(path)
+
+    def is_file(self, path: str) -> bool:
+        return os.path.isfile(path)
+
+    def list_dir(self, path: str) -> list[str]:
+        return sorted(os.listdir(path))
+
+    def get_files(self, directory: str, extension: str) -> list[str]:
+        extension = extension.lower()
+        with os.scandir(directory) as entries:
+            return sorted(
+                entry.path
+                for entry in entries
+                if entry.name.lower().endswith(extension)
+                and entry.is_file(follow_symlinks=True)
+            )
+
+    def stat(self, path: str) -> ModFSStat:
+        stat = os.stat(path)
+        return ModFSStat(stat.st_size, stat.st_mtime_ns)
+
+    def open(self, path: str) -> IO[bytes]:
+        return open(path, "rb")
+
+    def get_local_path(self, path: str) -> str | None:
+        return path
+
+    def get_mod_dir(self, mod_path: str) -> str:
+        return mod_path
+
+
+class IndexedModFS(ModFS):
+    """
+    Files that can't change while they are read. Archive and memory
+    implementations list their files once into a ModTreeIndex and
+    answer everything but reads from it.
+    """
+
+    def __init__(self, root: str = ""):
+        super().__init__(root)
+        self.index: ModTreeIndex | None = None
+        self.stats: dict[str, ModFSStat] = {}
+
+    @abstractmethod
+    def iter_entries(self) -> Iterator[tuple[str, bool, ModFSStat]]:
+        """Yields (path relative to root, is dir, stat) for every entry"""
+
+    @abstractmethod
+    def open_entry(self, relative_path: str) -> IO[bytes]:
+        pass
+
+    def get_tree_index(self, directory: str = "") -> ModTreeIndex:
+        """Every path under root, read once"""
+        if self.index is None:
+            index = ModTreeIndex()
+            index.root = self.root
+            for relative_path, is_dir, stat in self.iter_entries():
+                path = index.normalize_path(
+                    f"{self.root}/{relative_path}" if self.root else relative_path
+                )
+                # Archives don't always list directories, but the
+                # structure checks look them up like files
+                self.add_parent_dirs(index, path)
+                index.add_path(path, is_dir)
+                if not is_dir:
+                    self.stats[path] = stat
+                    index.stats[path] = (stat.mtime_ns, stat.size)
+            self.index = index
+        return self.index
+
+    def add_parent_dirs(self, index: ModTreeIndex, path: str):
+        parents: list[str] = []
+        parent = posixpath.dirname(path)
+        while parent and parent != self.root and parent not in index.paths:
+            parents.append(parent)
+            parent = posixpath.dirname(parent)
+        for parent in reversed(parents):
+            index.add_path(parent, is_dir=True)
+
+    def get_relative_path(self, path: str) -> str:
+        """Raises FileNotFoundError for paths outside root"""
+        normalized = ModTreeIndex.normalize_path(path)
+        if not self.root:
+            return normalized
+        if not normalized.startswith(f"{self.root}/"):
+            raise FileNotFoundError(path)
+        return normalized[len(self.root) + 1 :]
+
+    def exists(self, path: str) -> bool:
+        return self.is_dir(path) or path in self.get_tree_index()
+
+    def is_dir(self, path: str) -> bool:
+        normalized = ModTreeIndex.normalize_path(path)
+        return normalized == self.root or self.get_tree_index().is_dir(normalized)
+
+    def is_file(self, path: str) -> bool:
+        return self.get_tree_index().is_file(path)
+
+    def list_dir(self, path: str) -> list[str]:
+        return self.get_tree_index().get_children(path)
+
+    def get_files(self, directory: str, extension: str) -> list[str]:
+        return sorted(
+            self.get_tree_index().get_files_with_extension(
+                directory, extension, case_sensitive=False
+            )
+        )
+
+    def stat(self, path: str) -> ModFSStat:
+        self.get_tree_index()
+        stat = self.stats.get(ModTreeIndex.normalize_path(path))
+        if stat is None:
+            raise FileNotFoundError(path)
+        return stat
+
+    def open(self, path: str) -> IO[bytes]:
+        if not self.is_file(path):
+            raise FileNotFoundError(path)
+        return self.open_entry(self.get_relative_path(path))
+
+    def get_mod_name(self) -> str:
+        """
+        Archives are often named after a version or an upload, so root
+        can't be used for Mods/ModName and Public/ModName
+        """
+        index = self.get_tree_index()
+        mods_dir = f"{self.root}/Mods" if self.root else "Mods"
+        for name in sorted(index.get_children(mods_dir)):
+            if any(
+                index.is_file(f"{mods_dir}/{name}/{meta_name}")
+                for meta_name in META_FILE_NAMES
+            ):
+                return name
+        return ""
+
+
+class MemoryModFS(IndexedModFS):
+    """
+    Files held in memory, for tests and benchmarks that shouldn't
+    touch the disk
+
+    MemoryModFS({"Mods/TestMod/meta.lsx": b"..."}, root="TestMod")
+    """
+
+    def __init__(self, files: dict[str, bytes | str], root: str = "Mod"):
+        super().__init__(root)
+        self.files = {
+            ModTreeIndex.normalize_path(path): (
+                contents.encode("UTF-8") if isinstance(contents, str) else contents
+            )
+            for path, contents in files.items()
+        }
+
+    def iter_entries(self) -> Iterator[tuple[str, bool, ModFSStat]]:
+        for path, contents in self.files.items():
+            yield path, False, ModFSStat(len(contents), 0)
+
+    def open_entry(self, relative_path: str) -> IO[bytes]:
+        return io.BytesIO(self.files[relative_path])
+
+
+class ZipModFS(IndexedModFS):
+    """
+    A zipped mod, read in place. The central directory is read once
+    when the zip is opened, and members are decompressed as they are
+    read, so nothing is extracted.
+
+    Zips either hold the mod folder (TestMod/Mods/TestMod/meta.lsx) or
+    its contents (Mods/TestMod/meta.lsx). The mod folder becomes root,
+    and contents get the zip's name as root. Either way the mod's
+    name comes from get_mod_name.
+    """
+
+    # Added by macOS to zips made in Finder
+    IGNORED_PREFIX = "__MACOSX/"
+
+    def __init__(self, zip_path: str, root: str | None = None):
+        # Imported here, since it pulls in every compression module
+        import zipfile
+
+        self.zip_path = zip_path
+        self.zip_file = zipfile.ZipFile(zip_path)
+        self.members = {
+            info.filename: info
+            for info in self.zip_file.infolist()
+            if not info.filename.startswith(self.IGNORED_PREFIX)
+        }
+        # Prefix of every member name, when the zip holds the mod folder
+        top_dir = self.get_mod_folder_name(self.members)
+        self.prefix = f"{top_dir}/" if top_dir else ""
+        if root is None:
+            root = top_dir or Path(zip_path).stem
+        super().__init__(root)
+
+    @staticmethod
+    def get_mod_folder_name(names: Iterable[str]) -> str:
+        """The folder every name is in, unless it is part of the mod"""
+        top_dirs = {name.split("/", 1)[0] for name in names}
+        if len(top_dirs) != 1:
+            return ""
+        top_dir = top_dirs.pop()
+        if top_dir in MOD_CONTENT_DIRS or not any("/" in name for name in names):
+            return ""
+        return top_dir
+
+    def iter_entries(self) -> Iterator[tuple[str, bool, ModFSStat]]:
+        for name, info in self.members.items():
+            relative_path = name[len(self.prefix) :]
+            if relative_path:
+                yield relative_path, info.is_dir(), ModFSStat(info.file_size, 0)
+
+    def open_entry(self, relative_path: str) -> IO[bytes]:
+        return self.zip_file.open(self.members[f"{self.prefix}{relative_path}"])
+
+    def close(self):
+        self.zip_file.close()
+
+
+class PakModFS(IndexedModFS):
+    """
+    A packaged mod, read in place with PakReader. Paks hold the mod's
+    contents, so root is the pak's name and the mod's name comes from
+    get_mod_name.
+    """
+
+    def __init__(self, pak_path: str, root: str | None = None):
+        # Imported here, since only pak input needs it
+        from ModAnalyzer.Larian.pak_reader import PakReader
+
+        super().__init__(root if root is not None else Path(pak_path).stem)
+        self.pak = PakReader(pak_path)
+
+    def iter_entries(self) -> Iterator[tuple[str, bool, ModFSStat]]:
+        for name, entry in self.pak.entries.items():
+            yield name, False, ModFSStat(entry.size, 0)
+
+    def open_entry(self, relative_path: str) -> IO[bytes]:
+        return self.pak.open(relative_path)
+
+    def close(self):
+        self.pak.close()
+
+
+def is_archive(mod_path: str) -> bool:
+    return mod_path.lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+def get_mod_fs(mod_path: str) -> ModFS:
+    """
+    Opens archives in place, anything else is a directory. The mod
+    dir to analyze is fs.get_mod_dir(mod_path). Missing archives
+    are left to the structure report, like missing directories.
+    """
+    if not os.path.isfile(mod_path):
+        return DirectoryModFS()
+
+    extension = Path(mod_path).suffix.lower()
+    if extension == ".zip":
+        return ZipModFS(mod_path)
+    if extension == ".pak":
+        return PakModFS(mod_path)
+    return DirectoryModFS()
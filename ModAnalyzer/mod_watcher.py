@@ -0,0 +1,178 @@
+import logging
+import os
+import time
+
+import typer
+
+from ModAnalyzer.analyzer import Analyzer
+from ModAnalyzer.ScriptExtender import SEAnalyzer
+from ModAnalyzer.Structure import ModTreeIndex, StructureReport
+from ModAnalyzer.Structure.structure_analyzer import StructureAnalyzer
+from ModAnalyzer.TreasureTable import TreasureTableReport
+
+
+class ModWatcher:
+    """
+    Polls a mod directory and re-runs only the reports that depend on
+    the files that changed
+
+    - Structure: a file or directory was added or removed
+    - Treasure Table: anything in the RootTemplates dir, the
+      TreasureTable.txt file or the stats Data dir changed
+    - Script Extender: anything in the ScriptExtender dir changed
+    - Localization: anything in the Localization dir changed, or the
+      RTs, tags or stats that use its handles
+    """
+
+    STRUCTURE = "Structure"
+    TREASURE_TABLE = "Treasure Table"
+    SCRIPT_EXTENDER = "Script Extender"
+    LOCALIZATION = "Localization"
+
+    analyzer: Analyzer
+    structure_analyzer: StructureAnalyzer
+    structure_report: StructureReport
+    mod_tree_index: ModTreeIndex
+    # Last treasure table report, so localization can reuse its RTs
+    tt_report: TreasureTableReport | None = None
+
+    def __init__(self, analyzer: Analyzer, mod_dir: str, poll_interval: float = 0.1):
+        self.logger = logging.getLogger(__name__)
+        self.analyzer = analyzer
+        self.poll_interval = poll_interval
+        self.mod_dir, self.structure_analyzer = analyzer.get_structure_analyzer(mod_dir)
+        self.se_analyzer = SEAnalyzer(
+            structure_analyzer=self.structure_analyzer, cache=analyzer.cache
+        )
+        self.mod_tree_index = ModTreeIndex()
+        self.structure_report = StructureReport()
+
+    def get_snapshot(self) -> ModTreeIndex:
+        return ModTreeIndex.from_directory(self.mod_dir, with_stats=True)
+
+    def get_changed_paths(
+        self, old_index: ModTreeIndex, new_index: ModTreeIndex
+    ) -> tuple[set[str], set[str]]:
+        """Returns (added or removed paths, modified files)"""
+        old_paths = set(old_index)
+        new_paths = set(new_index)
+        added_or_removed = old_paths ^ new_paths
+        modified = {
+            path
+            for path in old_paths & new_paths
+            if old_index.stats.get(path) != new_index.stats.get(path)
+        }
+        return added_or_removed, modified
+
+    def get_affected_stages(
+        self, added_or_removed: set[str], modified: set[str]
+    ) -> set[str]:
+        stages: set[str] = set()
+        if added_or_removed:
+            stages.add(self.STRUCTURE)
+
+        rt_dir = self.structure_analyzer.get_rt_dir()
+        tt_file_path = self.structure_analyzer.get_treasure_table_file_path()
+        stats_dir = self.structure_analyzer.get_data_path()
+        se_dir = self.se_analyzer.get_base_path()
+        localization_dir = self.structure_analyzer.get_localization_dir_path()
+        tags_dir = self.structure_analyzer.get_tags_path()
+
+        for path in added_or_removed | modified:
+            if (
+                ModTreeIndex.is_in_directory(path, rt_dir)
+                or ModTreeIndex.is_in_directory(path, tt_file_path)
+                or ModTreeIndex.is_in_directory(path, stats_dir)
+            ):
+                stages.add(self.TREASURE_TABLE)
+            if ModTreeIndex.is_in_directory(path, se_dir):
+                stages.add(self.SCRIPT_EXTENDER)
+            if any(
+                ModTreeIndex.is_in_directory(path, directory)
+                for directory in [localization_dir, rt_dir, stats_dir, tags_dir]
+            ):
+                stages.add(self.LOCALIZATION)
+
+        return stages
+
+    def run_stages(self, stages: set[str]):
+        if self.STRUCTURE in stages:
+            self.structure_report = self.structure_analyzer.generate_report(
+                self.mod_dir, self.mod_tree_index
+            )
+            self.analyzer.print_structure_report(
+                self.mod_dir, self.structure_analyzer, self.structure_report, False
+            )
+            typer.echo(os.linesep)
+
+        if not self.structure_report.mod_dir_exists:
+            return
+
+        if self.TREASURE_TABLE in stages:
+            self.tt_report = self.analyzer.print_tt_report(
+                self.structure_report.has_treasure_table,
+                self.structure_analyzer.get_treasure_table_file_path(),
+                self.structure_analyzer.get_rt_dir(),
+                self.structure_analyzer.get_data_path(),
+                self.structure_report.has_root_templates,
+            )
+            typer.echo(os.linesep)
+
+        if self.SCRIPT_EXTENDER in stages:
+            self.analyzer.print_se_report(self.mod_tree_index, self.structure_analyzer)
+            typer.echo(os.linesep)
+
+        if self.LOCALIZATION in stages:
+            self.analyzer.print_localization_report(
+                self.structure_analyzer, self.tt_report
+            )
+            typer.echo(os.linesep)
+
+    def poll(self) -> set[str]:
+        """Checks for changes once and returns the stages that were re-run"""
+        new_index = self.get_snapshot()
+        added_or_removed, modified = self.get_changed_paths(
+            self.mod_tree_index, new_index
+        )
+        self.mod_tree_index = new_index
+        stages = self.get_affected_stages(added_or_removed, modified)
+
+        if added_or_removed or modified:
+            # Cached path colors may be stale now
+            self.analyzer.path_analyzer.set_mod_tree_index(new_index)
+
+        if stages:
+            start_time = time.perf_counter()
+            num_changes = len(added_or_removed) + len(modified)
+            typer.echo(f"{num_changes} changed paths: {', '.join(sorted(stages))}")
+            self.run_stages(stages)
+            elapsed_ms = round((time.perf_counter() - start_time) * 1000, 1)
+            typer.echo(
+                f"Updated in {typer.style(elapsed_ms, typer.colors.GREEN)} ms"
+                f"{os.linesep}"
+            )
+
+        return stages
+
+    def watch(self):
+        self.mod_tree_index = self.get_snapshot()
+        self.run_stages(
+            {
+                self.STRUCTURE,
+                self.TREASURE_TABLE,
+                self.SCRIPT_EXTENDER,
+                self.LOCALIZATION,
+            }
+        )
+
+        if not self.structure_report.mod_dir_is_dir:
+            return
+
+        typer.echo(f"Watching {self.mod_dir} for changes (Ctrl+C to stop)")
+
+        try:
+            while True:
+                time.sleep(self.poll_interval)
+                self.poll()
+        except KeyboardInterrupt:
+            typer.echo("Stopped watching")
@@ -0,0 +1,153 @@
+"""
+Converts reports into plain dicts for --format json
+
+Fields are listed explicitly instead of using asdict, so the JSON
+only changes when the schema version does. Missing stages are null.
+"""
+
+import json
+from typing import TYPE_CHECKING
+
+from ModAnalyzer.analyzer import AnalyzerReport
+from ModAnalyzer.Localization.localization_analyzer import LocalizationReport
+from ModAnalyzer.ScriptExtender.se_analyzer import SEReport
+from ModAnalyzer.Structure import StructureReport
+from ModAnalyzer.TreasureTable import TreasureTableReport
+from ModAnalyzer.TreasureTable.models import TemplateRecord
+
+if TYPE_CHECKING:
+    from ModAnalyzer.collection_analyzer import CollectionReport
+    from ModAnalyzer.TreasureTable.conflict_analyzer import ConflictReport
+
+# Bump when a field is renamed or removed, so consumers can tell
+SCHEMA_VERSION = 1
+
+
+def get_structure_dict(report: StructureReport) -> dict:
+    return {
+        "mod_dir_exists": report.mod_dir_exists,
+        "mod_dir_is_dir": report.mod_dir_is_dir,
+        "has_mods_modname": report.has_mods_modname,
+        "has_public": report.has_public,
+        "has_tags": report.has_tags,
+        "has_meta_file": report.has_meta_file,
+        "has_root_templates": report.has_root_templates,
+        "has_treasure_table": report.has_treasure_table,
+    }
+
+
+def get_template_record_dict(record: TemplateRecord) -> dict:
+    return {
+        "name": record.name,
+        "map_key": record.map_key,
+        "stats": record.stats,
+        "dev_comment": record.dev_comment,
+        "parent_template_id": record.parent_template_id,
+    }
+
+
+def get_tt_dict(report: TreasureTableReport | None) -> dict | None:
+    if report is None:
+        return None
+
+    return {
+        "verified_items": [
+            get_template_record_dict(item) for item in report.verified_items
+        ],
+        "ignored_items": [
+            get_template_record_dict(item) for item in report.ignored_items
+        ],
+        # Every entry of every table is too much for a report, CI only
+        # needs to know how many there are
+        "treasure_table_entries": len(report.treasure_table_entries),
+        "inaccessible_items": sorted(report.inaccessible_items),
+        "replacement_entries": sorted(report.replacement_entries),
+        "invalid_entries": sorted(report.invalid_entries),
+        "unknown_table_references": sorted(report.unknown_table_references),
+        "has_stats": report.has_stats,
+        "unknown_stats": sorted(report.unknown_stats),
+        "unknown_object_categories": sorted(report.unknown_object_categories),
+        "missing_stats_parents": report.missing_stats_parents,
+        "stats_cycles": report.stats_cycles,
+    }
+
+
+def get_se_dict(report: SEReport | None) -> dict | None:
+    if report is None:
+        return None
+
+    return {
+        "has_se_dir": report.has_se_dir,
+        "has_config": report.has_config,
+        "config_parse_error": report.config_parse_error,
+        "config_missing_fields": list(report.config_missing_fields),
+        "config_invalid_fields": dict(report.config_invalid_fields),
+        "config": report.config,
+        "has_server_dir": report.has_server_dir,
+        "has_bootstrap_server": report.has_bootstrap_server,
+        "has_bootstrap_client": report.has_bootstrap_client,
+    }
+
+
+def get_localization_dict(report: LocalizationReport | None) -> dict | None:
+    if report is None:
+        return None
+
+    return {
+        "has_localization": report.has_localization,
+        "localization_files": list(report.localization_files),
+        "num_entries": report.num_entries,
+        "missing_handles": dict(report.missing_handles),
+        "duplicate_handles": list(report.duplicate_handles),
+        "unused_handles": list(report.unused_handles),
+    }
+
+
+def get_report_dict(report: AnalyzerReport) -> dict:
+    return {
+        "mod_dir": report.mod_dir,
+        "error": report.error,
+        "structure": get_structure_dict(report.Structure),
+        "treasure_table": get_tt_dict(report.TreasureTable),
+        "script_extender": get_se_dict(report.ScriptExtender),
+        "localization": get_localization_dict(report.Localization),
+    }
+
+
+def get_report_json(report: AnalyzerReport) -> str:
+    return json.dumps(
+        {"schema_version": SCHEMA_VERSION, **get_report_dict(report)}, indent=4
+    )
+
+
+def get_collection_json(collection_report: "CollectionReport") -> str:
+    return json.dumps(
+        {
+            "schema_version": SCHEMA_VERSION,
+            "workers": collection_report.workers,
+            "elapsed_seconds": collection_report.elapsed_seconds,
+            "mods": [get_report_dict(report) for report in collection_report.reports],
+        },
+        indent=4,
+    )
+
+
+def get_conflicts_json(conflict_report: "ConflictReport") -> str:
+    return json.dumps(
+        {
+            "schema_version": SCHEMA_VERSION,
+            "num_mods": conflict_report.num_mods,
+            "num_tables": conflict_report.num_tables,
+            "num_entries": conflict_report.num_entries,
+            "conflicts": [
+                {
+                    "table_name": conflict.table_name,
+                    "load_order": conflict.get_mod_dirs(),
+                    "winner": conflict.winner,
+                    "lost_entries": conflict.lost_entries,
+                }
+                for conflict in conflict_report.conflicts
+            ],
+        },
+        indent=4,
+    )
@@ -0,0 +1,99 @@
+import json
+import os
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+
+# Shared by every disabled span, so turning timings off costs one
+# method call and an attribute check per span
+NULL_SPAN = nullcontext()
+
+
+class Timings:
+    """
+    Nested timing spans and counters for an analysis
+
+    Spans started inside another span are recorded under its name, e.g.
+    analyze/treasure_table/rt_parse. The same span can run more than
+    once, and each run adds to its call count and total time.
+
+    with timings.span("rt_parse"):
+        ...
+        timings.count("rt_files_parsed")
+    """
+
+    enabled: bool = False
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        # Span path => [calls, total seconds], in the order spans started
+        self.spans: dict[str, list] = {}
+        self.counters: dict[str, int] = {}
+        self.stack: list[str] = []
+
+    def span(self, name: str) -> AbstractContextManager:
+        if not self.enabled:
+            return NULL_SPAN
+        return self.record_span(name)
+
+    @contextmanager
+    def record_span(self, name: str) -> Iterator[None]:
+        self.stack.append(name)
+        # Added before it runs so parents are listed before children
+        span = self.spans.setdefault("/".join(self.stack), [0, 0.0])
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            span[0] += 1
+            span[1] += time.perf_counter() - start_time
+            self.stack.pop()
+
+    def count(self, name: str, amount: int = 1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def to_dict(self) -> dict:
+        return {
+            "spans": [
+                {
+                    "name": path,
+                    "calls": calls,
+                    "total_ms": round(seconds * 1000, 3),
+                }
+                for path, (calls, seconds) in self.spans.items()
+            ],
+            "counters": dict(self.counters),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=4)
+
+    def get_table(self) -> str:
+        from tabulate import tabulate
+
+        total_seconds = sum(
+            seconds for path, (_, seconds) in self.spans.items() if "/" not in path
+        )
+        span_rows = []
+        for path, (calls, seconds) in self.spans.items():
+            share = f"{seconds / total_seconds * 100:.1f}%" if total_seconds else ""
+            span_rows.append(
+                [
+                    path,
+                    calls,
+                    round(seconds * 1000, 2),
+                    share,
+                ]
+            )
+
+        tables = [tabulate(span_rows, headers=["Span", "Calls", "Time (ms)", "Share"])]
+        if self.counters:
+            tables.append(
+                tabulate(
+                    [[name, value] for name, value in self.counters.items()],
+                    headers=["Counter", "Value"],
+                )
+            )
+
+        return (os.linesep * 2).join(tables)
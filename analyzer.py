@@ -1,29 +1,297 @@
 import os
+from enum import Enum
 from typing import Optional
 
 import typer
 
+from ModAnalyzer.analysis_cache import AnalysisCache
 from ModAnalyzer.analyzer import Analyzer
+from ModAnalyzer.mod_fs import get_mod_fs
+from ModAnalyzer.report_json import get_collection_json, get_report_json
+from ModAnalyzer.timings import Timings
 
 app = typer.Typer()
 
 
+class OutputFormat(str, Enum):
+    table = "table"
+    json = "json"
+
+
+# Same as VanillaIndex.DEFAULT_PATH, without importing it at startup
+VANILLA_INDEX_PATH = os.path.join(AnalysisCache.DEFAULT_CACHE_DIR, "vanilla.idx")
+
+
+def get_vanilla_index(index_path: Optional[str]):
+    if not index_path or not os.path.isfile(index_path):
+        return None
+
+    from ModAnalyzer.GameData import VanillaIndex
+
+    return VanillaIndex.open_if_exists(index_path)
+
+
 @app.command()
 def analyze(
-    mod_directory: str,
+    mod_directory: str = typer.Argument(
+        help="Mod directory, or a .zip or .pak that is read without extracting it"
+    ),
     debug_mode: Optional[bool] = typer.Option(
         False, help="Enables additional debug logging"
     ),
+    cache: Optional[bool] = typer.Option(
+        True, help="Reuses parsed results for files that have not changed"
+    ),
+    cache_dir: Optional[str] = typer.Option(
+        AnalysisCache.DEFAULT_CACHE_DIR, help="Directory for the analysis cache"
+    ),
+    watch: Optional[bool] = typer.Option(
+        False, help="Re-runs affected reports whenever a file changes"
+    ),
+    poll_interval: Optional[float] = typer.Option(
+        0.1, help="Seconds between checks for changes in watch mode"
+    ),
+    streaming: Optional[bool] = typer.Option(
+        False, help="Parses root templates incrementally to keep memory use flat"
+    ),
+    workers: Optional[int] = typer.Option(
+        None,
+        help="Processes used to parse large root template dirs (defaults to the number of CPUs)",
+    ),
+    timings: Optional[bool] = typer.Option(
+        False, help="Prints time spent in each stage and what was processed"
+    ),
+    timings_json: Optional[str] = typer.Option(
+        None, help="Writes stage timings and counters to this JSON file"
+    ),
+    output_format: OutputFormat = typer.Option(
+        OutputFormat.table,
+        "--format",
+        help="json prints the report data without colors or tables",
+    ),
+    vanilla_index: Optional[str] = typer.Option(
+        VANILLA_INDEX_PATH,
+        help="Vanilla index from index-vanilla, used when the file exists",
+    ),
 ):
-    debug_mode_indicator = ""
-    if debug_mode:
-        debug_mode_indicator = "[Debug Mode]"
+    is_json = output_format == OutputFormat.json
+    if is_json and watch:
+        typer.echo(typer.style("--watch only supports table output", fg="red"))
+        raise typer.Exit(1)
+
+    # Imported here, since only archive input can raise it
+    import zipfile
+
+    try:
+        fs = get_mod_fs(mod_directory)
+    except (OSError, ValueError, zipfile.BadZipFile) as err:
+        typer.echo(typer.style(f"Unable to open {mod_directory}: {err}", fg="red"))
+        raise typer.Exit(1)
+    with fs:
+        if watch and not fs.is_local:
+            typer.echo(typer.style("--watch only supports mod directories", fg="red"))
+            raise typer.Exit(1)
+        mod_dir = fs.get_mod_dir(mod_directory)
+
+        debug_mode_indicator = ""
+        if debug_mode:
+            debug_mode_indicator = "[Debug Mode]"
+
+        if not is_json:
+            typer.echo(f"Analyzing {mod_directory} {debug_mode_indicator}")
+            typer.echo(
+                f"=================================================={os.linesep}"
+            )
+        analysis_cache = AnalysisCache(cache_dir, enabled=cache)
+        analysis_timings = Timings(enabled=timings or bool(timings_json))
+        try:
+            analyzer = Analyzer(
+                using_typer=True,
+                cache=analysis_cache,
+                streaming=streaming,
+                rt_workers=workers,
+                timings=analysis_timings,
+                vanilla_index=get_vanilla_index(vanilla_index),
+                fs=fs,
+            )
+
+            if watch:
+                from ModAnalyzer.mod_watcher import ModWatcher
+
+                ModWatcher(analyzer, mod_directory, poll_interval).watch()
+            elif is_json:
+                typer.echo(get_report_json(analyzer.generate_report(mod_dir)))
+            else:
+                analyzer.analyze(mod_dir, debug_mode=debug_mode)
+        finally:
+            analysis_cache.close()
 
-    typer.echo(f"Analyzing {mod_directory} {debug_mode_indicator}")
+    if timings:
+        # Kept off stdout so it can't break the JSON
+        typer.echo(analysis_timings.get_table(), err=is_json)
+
+    if timings_json:
+        with open(timings_json, "w", encoding="UTF-8") as file:
+            file.write(analysis_timings.to_json())
+
+
+@app.command()
+def analyze_all(
+    mod_directories: list[str],
+    workers: Optional[int] = typer.Option(
+        None, help="Number of worker processes (defaults to the number of CPUs)"
+    ),
+    cache: Optional[bool] = typer.Option(
+        True, help="Reuses parsed results for files that have not changed"
+    ),
+    cache_dir: Optional[str] = typer.Option(
+        AnalysisCache.DEFAULT_CACHE_DIR, help="Directory for the analysis cache"
+    ),
+    output_format: OutputFormat = typer.Option(
+        OutputFormat.table,
+        "--format",
+        help="json prints the report data without colors or tables",
+    ),
+    vanilla_index: Optional[str] = typer.Option(
+        VANILLA_INDEX_PATH,
+        help="Vanilla index from index-vanilla, used when the file exists",
+    ),
+):
+    """
+    Analyzes several mods, or every mod inside a folder, in parallel
+    """
+    from ModAnalyzer.collection_analyzer import CollectionAnalyzer
+
+    collection_analyzer = CollectionAnalyzer(
+        workers=workers,
+        cache_dir=cache_dir if cache else None,
+        vanilla_index_path=vanilla_index,
+        using_typer=True,
+    )
+
+    if output_format == OutputFormat.json:
+        collection_report = collection_analyzer.generate_report(mod_directories)
+        typer.echo(get_collection_json(collection_report))
+        return
+
+    typer.echo(f"Analyzing {', '.join(mod_directories)}")
     typer.echo(f"=================================================={os.linesep}")
-    analyzer = Analyzer(using_typer=True)
-    analyzer.analyze(mod_directory, debug_mode=debug_mode)
+    collection_analyzer.analyze(mod_directories)
+
+
+@app.command()
+def conflicts(
+    mod_directories: list[str],
+    cache: Optional[bool] = typer.Option(
+        True, help="Reuses parsed results for files that have not changed"
+    ),
+    cache_dir: Optional[str] = typer.Option(
+        AnalysisCache.DEFAULT_CACHE_DIR, help="Directory for the analysis cache"
+    ),
+    vanilla_index: Optional[str] = typer.Option(
+        VANILLA_INDEX_PATH,
+        help="Vanilla index from index-vanilla, used when the file exists",
+    ),
+    output_format: OutputFormat = typer.Option(
+        OutputFormat.table,
+        "--format",
+        help="json prints the report data without colors or tables",
+    ),
+):
+    """
+    Finds treasure tables that mods replace and drop other mods' entries
+    from. Mods are loaded in the order given, folders of mods by name.
+    """
+    from ModAnalyzer.collection_analyzer import CollectionAnalyzer
+    from ModAnalyzer.report_json import get_conflicts_json
+    from ModAnalyzer.TreasureTable import TreasureTableConflictAnalyzer
+
+    analysis_cache = AnalysisCache(cache_dir, enabled=cache)
+    try:
+        mod_dirs = CollectionAnalyzer().get_mod_dirs(mod_directories)
+        conflict_analyzer = TreasureTableConflictAnalyzer(
+            cache=analysis_cache, vanilla_index=get_vanilla_index(vanilla_index)
+        )
+        conflict_report = conflict_analyzer.generate_report(mod_dirs)
+    finally:
+        analysis_cache.close()
+
+    if output_format == OutputFormat.json:
+        typer.echo(get_conflicts_json(conflict_report))
+    else:
+        conflict_analyzer.print_report(conflict_report)
+
+
+@app.command()
+def index_vanilla(
+    data_dir: Optional[str] = typer.Argument(
+        None,
+        help="Unpacked game data (defaults to the Data dir of the game install)",
+    ),
+    output: str = typer.Option(VANILLA_INDEX_PATH, help="Where to write the index"),
+):
+    """
+    Indexes vanilla treasure tables and stats entries so analyze can
+    check items placed in vanilla tables
+    """
+    from ModAnalyzer.GameData import VanillaIndexBuilder
+    from ModAnalyzer.Structure.mod_linker import ModLinker
+
+    data_dir = data_dir or os.path.join(ModLinker.DEFAULT_GAME_DATA_DIR, "Data")
+    if not os.path.isdir(data_dir):
+        typer.echo(typer.style(f"{data_dir} is not a directory", fg="red"))
+        raise typer.Exit(1)
+
+    typer.echo(f"Indexing {data_dir}")
+    summary = VanillaIndexBuilder(data_dir).build(output)
+    typer.echo(
+        f"Indexed {summary['tables']} treasure tables, {summary['categories']} "
+        f"table entries and {summary['stats']} stats entries into {output}"
+    )
+
+
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", help="Address to listen on"),
+    port: int = typer.Option(8765, help="Port to listen on"),
+    cache: Optional[bool] = typer.Option(
+        True, help="Also keeps parsed results on disk between restarts"
+    ),
+    cache_dir: Optional[str] = typer.Option(
+        AnalysisCache.DEFAULT_CACHE_DIR, help="Directory for the analysis cache"
+    ),
+    streaming: Optional[bool] = typer.Option(
+        False, help="Parses root templates incrementally to keep memory use flat"
+    ),
+    vanilla_index: Optional[str] = typer.Option(
+        VANILLA_INDEX_PATH,
+        help="Vanilla index from index-vanilla, used when the file exists",
+    ),
+):
+    """
+    Keeps parsed files in memory and answers analysis requests over HTTP:
+    POST /analyze with {"mod_dir": "..."}
+    """
+    from ModAnalyzer.analysis_server import AnalysisServer
+
+    server = AnalysisServer(
+        host=host,
+        port=port,
+        cache_dir=cache_dir if cache else None,
+        streaming=streaming,
+        vanilla_index=get_vanilla_index(vanilla_index),
+    )
+    server.create_http_server()
+    typer.echo(f"Serving on http://{server.host}:{server.port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        typer.echo("Stopped")
 
 
 if __name__ == "__main__":
+    import multiprocessing
+
+    # Required for worker processes in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     app()
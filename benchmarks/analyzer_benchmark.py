@@ -0,0 +1,235 @@
+"""
+Times each analyzer stage on a generated mod and writes the results
+as JSON, so runs from different commits can be compared.
+
+    python -m benchmarks.analyzer_benchmark run --output before.json
+    python -m benchmarks.analyzer_benchmark run --output after.json
+    python -m benchmarks.analyzer_benchmark compare before.json after.json
+"""
+
+import contextlib
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+import typer
+from tabulate import tabulate
+
+from ModAnalyzer import Analyzer
+from ModAnalyzer.ScriptExtender import SEAnalyzer
+from ModAnalyzer.Structure import StructureAnalyzer, SyntheticModGenerator
+from ModAnalyzer.TreasureTable import TreasureTableAnalyzer
+
+RESULTS_VERSION = 1
+
+app = typer.Typer()
+
+
+def get_git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def get_stages(mod_dir: str) -> dict[str, Callable[[], object]]:
+    """Each stage builds its own analyzers so nothing is reused between runs"""
+
+    def get_structure_analyzer() -> StructureAnalyzer:
+        return Analyzer().get_structure_analyzer(mod_dir)[1]
+
+    def structure():
+        get_structure_analyzer().generate_report(mod_dir)
+
+    # Paths only depend on the mod dir, so these are worked out once
+    structure_analyzer = get_structure_analyzer()
+    structure_analyzer.generate_report(mod_dir)
+    tt_filename = structure_analyzer.get_treasure_table_file_path()
+    rt_dir = structure_analyzer.get_rt_dir()
+
+    def treasure_table():
+        TreasureTableAnalyzer().generate_report(tt_filename, rt_dir)
+
+    def treasure_table_streaming():
+        TreasureTableAnalyzer(streaming=True).generate_report(tt_filename, rt_dir)
+
+    def script_extender():
+        SEAnalyzer(structure_analyzer=structure_analyzer).generate_report(
+            structure_analyzer.mod_dirs
+        )
+
+    def analyze():
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            Analyzer(using_typer=True).analyze(mod_dir)
+
+    return {
+        "StructureAnalyzer.generate_report": structure,
+        "TreasureTableAnalyzer.generate_report": treasure_table,
+        "TreasureTableAnalyzer.generate_report (streaming)": treasure_table_streaming,
+        "SEAnalyzer.generate_report": script_extender,
+        "Analyzer.analyze": analyze,
+    }
+
+
+def time_stage(run: Callable[[], object], repeat: int) -> dict:
+    runs: list[float] = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        run()
+        runs.append(round((time.perf_counter() - start_time) * 1000, 3))
+
+    return {
+        "runs_ms": runs,
+        "min_ms": min(runs),
+        "median_ms": statistics.median(runs),
+        "mean_ms": round(statistics.fmean(runs), 3),
+    }
+
+
+@app.command()
+def run(
+    root_templates: int = typer.Option(5000, help="Number of root templates"),
+    templates_per_file: int = typer.Option(250, help="Root templates per LSX file"),
+    treasure_tables: int = typer.Option(200, help="Number of treasure tables"),
+    tags: int = typer.Option(50, help="Number of tag files"),
+    lua_files: int = typer.Option(50, help="Number of SE Lua files"),
+    seed: int = typer.Option(0, help="Seed for the generated mod"),
+    repeat: int = typer.Option(5, help="Runs per stage"),
+    output: Optional[str] = typer.Option(
+        None, help="Writes the JSON results here instead of printing them"
+    ),
+    mod_dir: Optional[str] = typer.Option(
+        None, help="Generates the mod here and keeps it instead of a temp dir"
+    ),
+):
+    logging.disable(logging.CRITICAL)
+    parameters = {
+        "root_templates": root_templates,
+        "templates_per_file": templates_per_file,
+        "treasure_tables": treasure_tables,
+        "tags": tags,
+        "lua_files": lua_files,
+        "seed": seed,
+        "repeat": repeat,
+    }
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        target_dir = mod_dir or os.path.join(temp_dir, "SyntheticMod")
+        generator = SyntheticModGenerator(
+            mod_name=os.path.basename(target_dir),
+            num_root_templates=root_templates,
+            templates_per_file=templates_per_file,
+            num_treasure_tables=treasure_tables,
+            num_tags=tags,
+            num_lua_files=lua_files,
+            seed=seed,
+        )
+        # Keep create_structure's own output out of the results
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            created = generator.create_synthetic_mod(target_dir)
+
+        if not created:
+            typer.echo(typer.style(f"Could not generate {target_dir}", fg="red"))
+            raise typer.Exit(1)
+
+        stages = {
+            name: time_stage(stage, repeat)
+            for name, stage in get_stages(target_dir).items()
+        }
+
+    results = {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "git_commit": get_git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "parameters": parameters,
+        "stages": stages,
+    }
+    results_json = json.dumps(results, indent=4)
+
+    if output:
+        with open(output, "w", encoding="UTF-8") as file:
+            file.write(results_json)
+        typer.echo(
+            tabulate(
+                [[name, stage["median_ms"]] for name, stage in stages.items()],
+                headers=["Stage", "Median (ms)"],
+            )
+        )
+        typer.echo(f"{os.linesep}Wrote results to {output}")
+    else:
+        typer.echo(results_json)
+
+
+@app.command()
+def compare(
+    baseline: str,
+    current: str,
+    max_regression: Optional[float] = typer.Option(
+        None, help="Exit with an error if any stage is this many percent slower"
+    ),
+):
+    with open(baseline, encoding="UTF-8") as file:
+        baseline_results = json.load(file)
+    with open(current, encoding="UTF-8") as file:
+        current_results = json.load(file)
+
+    if baseline_results["parameters"] != current_results["parameters"]:
+        typer.echo(
+            typer.style("Warning: results were run with different parameters", "yellow")
+        )
+
+    table: list[list] = []
+    regressions: list[str] = []
+    for name, stage in current_results["stages"].items():
+        if name not in baseline_results["stages"]:
+            table.append([name, "", stage["median_ms"], ""])
+            continue
+
+        baseline_ms = baseline_results["stages"][name]["median_ms"]
+        change = (stage["median_ms"] - baseline_ms) / baseline_ms * 100
+        change_color = typer.colors.RED if change > 0 else typer.colors.GREEN
+        table.append(
+            [
+                name,
+                baseline_ms,
+                stage["median_ms"],
+                typer.style(f"{change:+.1f}%", fg=change_color),
+            ]
+        )
+        if max_regression is not None and change > max_regression:
+            regressions.append(name)
+
+    typer.echo(
+        f"{baseline_results['git_commit'][:10] or baseline} -> "
+        f"{current_results['git_commit'][:10] or current}"
+    )
+    typer.echo(
+        tabulate(
+            table,
+            headers=["Stage", "Baseline (ms)", "Current (ms)", "Change"],
+        )
+    )
+
+    if regressions:
+        typer.echo(
+            typer.style(
+                f"Slower than allowed: {', '.join(regressions)}", typer.colors.RED
+            )
+        )
+        raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,204 @@
+"""
+Compares the streaming TT parser against the original
+read everything, then check every prefix parser on a generated
+vanilla-sized treasure table file.
+
+    python -m benchmarks.treasure_table_benchmark --size-mb 8
+"""
+
+import logging
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Optional
+
+import typer
+from tabulate import tabulate
+
+from ModAnalyzer.TreasureTable import TreasureTableParser, TreasureTableReader
+from ModAnalyzer.TreasureTable.models import TreasureTableEntry
+
+app = typer.Typer()
+
+
+def write_treasure_table(path: str, size_bytes: int, seed: int = 0):
+    """Writes tables shaped like the vanilla TreasureTable.txt"""
+    rng = random.Random(seed)
+    table_index = 0
+    written = 0
+
+    with open(path, "w", encoding="UTF-8") as file:
+        while written < size_bytes:
+            lines = [f'new treasuretable "TT_Generated_{table_index}"']
+            if rng.random() < 0.3:
+                lines.append("CanMerge 1")
+            for subtable in range(rng.randint(1, 4)):
+                lines.append(f'new subtable "{subtable + 1},1"')
+                for _ in range(rng.randint(1, 8)):
+                    item = rng.randint(0, 20000)
+                    lines.append(f'object category "I_OBJ_ITEM_{item}",1,0,0,0,0,0,0,0')
+            lines.append(f"// End of TT_Generated_{table_index} //")
+            lines.append("")
+            block = "\n".join(lines) + "\n"
+            file.write(block)
+            written += len(block)
+            table_index += 1
+
+
+def read_lines_legacy(filename: str) -> list[str]:
+    lines: list[str] = []
+    with open(filename, "r", encoding="UTF-8") as file:
+        while line := file.readline():
+            lines.append(line.strip())
+    return lines
+
+
+def get_value_from_line_in_quotes_legacy(line: str) -> str:
+    if '"' not in line:
+        raise ValueError(f"No quotes found in value: {line}")
+    values = [value.strip() for value in line.split('"')[1::] if value.strip()]
+    return values[0] if len(values) else ""
+
+
+def parse_legacy(lines: list[str]) -> dict[str, list[TreasureTableEntry]]:
+    """The parser as it was before streaming, for comparison"""
+    tt_map: dict[str, list[TreasureTableEntry]] = {}
+    tt_name = ""
+    can_merge = False
+    subtable_position = ""
+    object_category_name = ""
+    tt_entry_map: dict[str, dict[str, bool]] = {}
+    entry_options: list[int] = []
+
+    for line in lines:
+        if line.startswith("//"):
+            continue
+        try:
+            if line.startswith("new treasuretable"):
+                tt_name = get_value_from_line_in_quotes_legacy(line)
+                can_merge = False
+                subtable_position = ""
+                object_category_name = ""
+                entry_options = []
+
+            if tt_name:
+                if tt_name not in tt_map:
+                    tt_map[tt_name] = []
+                if line.startswith("CanMerge"):
+                    can_merge = True
+                if line.startswith("new subtable"):
+                    subtable_position = get_value_from_line_in_quotes_legacy(line)
+                if line.startswith("object category"):
+                    object_category_name = get_value_from_line_in_quotes_legacy(line)
+                    option_string = line[line.rfind('"') + 2 : :]
+                    entry_options = [int(option) for option in option_string.split(",")]
+                if object_category_name and subtable_position:
+                    if tt_name not in tt_entry_map:
+                        tt_entry_map[tt_name] = {}
+                    if object_category_name not in tt_entry_map[tt_name].keys():
+                        tt_map[tt_name].append(
+                            TreasureTableEntry(
+                                can_merge=can_merge,
+                                subtable_position=subtable_position,
+                                object_category_name=object_category_name,
+                                is_valid=object_category_name[0:2] == "I_",
+                                options=entry_options,
+                            )
+                        )
+                        tt_entry_map[tt_name][object_category_name] = True
+        except ValueError:
+            pass
+
+    return tt_map
+
+
+def time_best_of(
+    run: Callable[[], dict[str, list[TreasureTableEntry]]], repeat: int
+) -> tuple[float, dict[str, list[TreasureTableEntry]]]:
+    best = float("inf")
+    result: dict[str, list[TreasureTableEntry]] = {}
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start_time)
+    return best, result
+
+
+def get_peak_mb(run: Callable[[], dict[str, list[TreasureTableEntry]]]) -> float:
+    """Peak traced allocation while parsing, measured in a separate run"""
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+@app.command()
+def benchmark(
+    size_mb: float = typer.Option(8, help="Size of the generated TT file"),
+    repeat: int = typer.Option(3, help="Runs per parser, best time is reported"),
+    tt_file: Optional[str] = typer.Option(
+        None, help="Benchmark an existing TT file instead of generating one"
+    ),
+):
+    # Invalid entries would otherwise flood the output
+    logging.disable(logging.CRITICAL)
+    parser = TreasureTableParser()
+    reader = TreasureTableReader()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if tt_file is None:
+            tt_file = os.path.join(temp_dir, "TreasureTable.txt")
+            write_treasure_table(tt_file, int(size_mb * 1024 * 1024))
+
+        file_size_mb = os.path.getsize(tt_file) / (1024 * 1024)
+
+        with open(tt_file, "rb") as file:
+            buffer = file.read()
+
+        parsers = {
+            "List + prefix checks (file)": lambda: parse_legacy(
+                read_lines_legacy(tt_file)
+            ),
+            "Streaming (file)": lambda: parser.parse_treasure_table(
+                reader.iter_lines(tt_file)
+            ),
+            "Streaming (bytes)": lambda: parser.parse_treasure_table(
+                reader.iter_lines(buffer)
+            ),
+        }
+        results = {name: time_best_of(run, repeat) for name, run in parsers.items()}
+        peaks = {name: get_peak_mb(run) for name, run in parsers.items()}
+
+    tt_maps = [tt_map for _, tt_map in results.values()]
+    if any(tt_map != tt_maps[0] for tt_map in tt_maps):
+        typer.echo(typer.style("Parsers disagree", typer.colors.RED))
+        raise typer.Exit(1)
+
+    legacy_seconds = results["List + prefix checks (file)"][0]
+    typer.echo(
+        f"{file_size_mb:.1f} MB, {len(tt_maps[0])} treasure tables, "
+        f"best of {repeat}"
+    )
+    typer.echo(
+        tabulate(
+            [
+                [
+                    name,
+                    round(seconds * 1000, 1),
+                    round(file_size_mb / seconds, 1),
+                    f"{legacy_seconds / seconds:.2f}x",
+                    round(peaks[name], 1),
+                ]
+                for name, (seconds, _) in results.items()
+            ],
+            headers=["Parser", "Time (ms)", "MB/s", "Speedup", "Peak memory (MB)"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,123 @@
+"""
+Compares the memory retained by a parsed treasure table in each
+model: the original dataclass entries, slotted entries, and the
+columnar TreasureTableStore.
+
+    python -m benchmarks.treasure_table_store_benchmark --size-mb 8
+"""
+
+import logging
+import os
+import pickle
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Optional
+
+import typer
+from tabulate import tabulate
+
+from ModAnalyzer.TreasureTable import TreasureTableParser, TreasureTableReader
+from ModAnalyzer.TreasureTable.models import TreasureTableStore
+from benchmarks.treasure_table_benchmark import write_treasure_table
+
+app = typer.Typer()
+
+
+@dataclass
+class DictTreasureTableEntry:
+    """TreasureTableEntry as it was before it had slots"""
+
+    can_merge: bool
+    subtable_position: str
+    object_category_name: str
+    is_valid: bool
+    options: list[int]
+
+
+def measure(build: Callable[[], Any]) -> tuple[Any, float, float]:
+    """Returns (result, retained MB, seconds) for one build"""
+    tracemalloc.start()
+    try:
+        start_time = time.perf_counter()
+        result = build()
+        seconds = time.perf_counter() - start_time
+        retained = tracemalloc.get_traced_memory()[0] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+    return result, retained, seconds
+
+
+@app.command()
+def benchmark(
+    size_mb: float = typer.Option(8, help="Size of the generated TT file"),
+    tt_file: Optional[str] = typer.Option(
+        None, help="Benchmark an existing TT file instead of generating one"
+    ),
+):
+    logging.disable(logging.CRITICAL)
+    parser = TreasureTableParser()
+    reader = TreasureTableReader()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if tt_file is None:
+            tt_file = os.path.join(temp_dir, "TreasureTable.txt")
+            write_treasure_table(tt_file, int(size_mb * 1024 * 1024))
+
+        def build_dict_entries() -> dict[str, list[DictTreasureTableEntry]]:
+            tt_map = parser.parse_treasure_table(reader.iter_lines(tt_file))
+            return {
+                tt_name: [DictTreasureTableEntry(**asdict(entry)) for entry in entries]
+                for tt_name, entries in tt_map.items()
+            }
+
+        models: dict[str, Callable[[], Any]] = {
+            "Dataclass entries": build_dict_entries,
+            "Slotted entries": lambda: parser.parse_treasure_table(
+                reader.iter_lines(tt_file)
+            ),
+            "TreasureTableStore": lambda: parser.parse_treasure_table_store(
+                reader.iter_lines(tt_file)
+            ),
+        }
+
+        rows: list[list[Any]] = []
+        num_entries = 0
+        baseline_mb = 0.0
+        for name, build in models.items():
+            result, retained_mb, seconds = measure(build)
+            baseline_mb = baseline_mb or retained_mb
+            if isinstance(result, TreasureTableStore):
+                num_entries = len(result)
+            pickled_mb = len(pickle.dumps(result, pickle.HIGHEST_PROTOCOL)) / (
+                1024 * 1024
+            )
+            rows.append(
+                [
+                    name,
+                    round(retained_mb, 1),
+                    f"{baseline_mb / retained_mb:.1f}x",
+                    round(pickled_mb, 1),
+                    round(seconds * 1000, 1),
+                ]
+            )
+            del result
+
+    typer.echo(f"{num_entries} entries")
+    typer.echo(
+        tabulate(
+            rows,
+            headers=[
+                "Model",
+                "Retained (MB)",
+                "Smaller by",
+                "Pickled (MB)",
+                "Build time (ms, traced)",
+            ],
+        )
+    )
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from ModAnalyzer import AnalysisResult, analyze_mod
+from ModAnalyzer.analysis_cache import AnalysisCache, MemoryAnalysisCache
+from ModAnalyzer.Localization.localization_analyzer import LocalizationReport
+from ModAnalyzer.ScriptExtender.se_analyzer import SEReport
+from ModAnalyzer.TreasureTable import TreasureTableReport
+
+
+def test_analyze_mod():
+    result = analyze_mod("TestMod", record_timings=True)
+
+    assert isinstance(result, AnalysisResult)
+    assert not result.error
+    assert result.report.Structure.has_treasure_table
+    assert len(result.report.TreasureTable.verified_items) > 0
+    assert result.to_dict()["mod_dir"] == "TestMod"
+    assert "rt_files_parsed" in result.timings["counters"]
+
+
+def test_analyze_missing_mod():
+    result = analyze_mod("NotAMod")
+
+    assert not result.report.Structure.mod_dir_exists
+    assert result.report.TreasureTable is None
+    assert result.timings is None
+
+
+def test_reports_do_not_share_state():
+    tt_report = TreasureTableReport()
+    tt_report.inaccessible_items.append("OBJ_RUNE")
+    se_report = SEReport()
+    se_report.config_missing_fields.append("RequiredVersion")
+    loca_report = LocalizationReport()
+    loca_report.missing_handles["h1"] = []
+
+    assert TreasureTableReport().inaccessible_items == []
+    assert SEReport().config_missing_fields == []
+    assert LocalizationReport().missing_handles == {}
+
+    first = analyze_mod("TestMod").report
+    second = analyze_mod("TestMod").report
+    assert first.TreasureTable.verified_items == second.TreasureTable.verified_items
+    assert first.TreasureTable.verified_items is not second.TreasureTable.verified_items
+
+
+@pytest.mark.parametrize("cache_class", [AnalysisCache, MemoryAnalysisCache])
+def test_concurrent_calls(tmp_path: Path, cache_class: type[AnalysisCache]):
+    # Shared by every thread, which is what the guarantee depends on
+    cache = cache_class(str(tmp_path), enabled=True)
+    assert cache.enabled
+    mod_paths = ["TestMod", "NotAMod"] * 8
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(lambda mod_path: analyze_mod(mod_path, cache=cache), mod_paths)
+        )
+    # The threads stored what they parsed in the shared cache
+    found, _ = cache.lookup(
+        "treasure_table", "TestMod/Public/TestMod/Stats/Generated/TreasureTable.txt"
+    )
+    cache.close()
+    assert found
+
+    expected = {
+        mod_path: analyze_mod(mod_path).to_dict() for mod_path in set(mod_paths)
+    }
+    for result in results:
+        result_dict = result.to_dict()
+        result_dict.pop("elapsed_ms")
+        expected_dict = dict(expected[result.mod_path])
+        expected_dict.pop("elapsed_ms")
+        assert result_dict == expected_dict
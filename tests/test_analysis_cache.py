@@ -0,0 +1,101 @@
+import os
+
+from ModAnalyzer.analysis_cache import AnalysisCache
+
+
+def get_cache(tmp_path, **kwargs) -> AnalysisCache:
+    return AnalysisCache(str(tmp_path / ".modanalyzer"), **kwargs)
+
+
+def test_unchanged_file_is_not_parsed_again(tmp_path):
+    tt_path = tmp_path / "TreasureTable.txt"
+    tt_path.write_text('new treasuretable "TT"')
+    cache = get_cache(tmp_path)
+    calls: list[str] = []
+
+    def parse():
+        calls.append(str(tt_path))
+        return {"TT": []}
+
+    assert cache.get_or_parse("treasure_table", str(tt_path), parse) == {"TT": []}
+    assert cache.get_or_parse("treasure_table", str(tt_path), parse) == {"TT": []}
+    assert len(calls) == 1, "Unchanged file was parsed again"
+
+    # Same contents with a new mtime falls back to the content hash
+    stat = os.stat(tt_path)
+    os.utime(tt_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    cache.get_or_parse("treasure_table", str(tt_path), parse)
+    assert len(calls) == 1, "Touched file was parsed again"
+
+    tt_path.write_text('new treasuretable "TT2"')
+    cache.get_or_parse("treasure_table", str(tt_path), parse)
+    assert len(calls) == 2, "Changed file was not parsed again"
+    cache.close()
+
+
+def test_version_change_invalidates_entries(tmp_path):
+    config_path = tmp_path / "Config.json"
+    config_path.write_text("{}")
+
+    cache = get_cache(tmp_path)
+    cache.store("se_config", str(config_path), {})
+    assert cache.lookup("se_config", str(config_path))[0]
+    cache.close()
+
+    AnalysisCache.CACHE_VERSION += 1
+    try:
+        cache = get_cache(tmp_path)
+        assert not cache.lookup("se_config", str(config_path))[0]
+        cache.close()
+    finally:
+        AnalysisCache.CACHE_VERSION -= 1
+
+
+def test_eviction_keeps_cache_under_max_size(tmp_path):
+    cache = get_cache(tmp_path, max_size_bytes=4096)
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"{i}.lsx"
+        path.write_text(str(i))
+        paths.append(str(path))
+        cache.store("root_template_records", str(path), "x" * 1500)
+
+    assert not cache.lookup("root_template_records", paths[0])[0], "Oldest entry kept"
+    assert cache.lookup("root_template_records", paths[-1])[0], "Newest entry evicted"
+    cache.close()
+
+
+def test_disabled_cache_does_not_write(tmp_path):
+    cache = get_cache(tmp_path, enabled=False)
+    assert cache.get_or_parse("tag", "missing.lsx", lambda: None) is None
+    assert not (tmp_path / ".modanalyzer").exists()
+
+
+def test_cli_closes_cache_when_analysis_fails(tmp_path, monkeypatch):
+    from typer.testing import CliRunner
+
+    import analyzer
+    from ModAnalyzer.analyzer import Analyzer
+    from ModAnalyzer.TreasureTable import TreasureTableConflictAnalyzer
+
+    closed: list[AnalysisCache] = []
+
+    def close(cache: AnalysisCache):
+        closed.append(cache)
+
+    def analyze(*args, **kwargs):
+        raise RuntimeError("analysis failed")
+
+    monkeypatch.setattr(AnalysisCache, "close", close)
+    monkeypatch.setattr(Analyzer, "analyze", analyze)
+    monkeypatch.setattr(TreasureTableConflictAnalyzer, "generate_report", analyze)
+
+    runner = CliRunner()
+    for args in [
+        ["analyze", "TestMod", "--cache-dir", str(tmp_path)],
+        ["conflicts", "TestMod", "--cache-dir", str(tmp_path)],
+    ]:
+        result = runner.invoke(analyzer.app, args)
+        assert isinstance(result.exception, RuntimeError)
+
+    assert len(closed) == 2
@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from ModAnalyzer.analysis_cache import MemoryAnalysisCache
+from ModAnalyzer.analysis_server import AnalysisServer
+from ModAnalyzer.GameData import VanillaIndex
+from tests.test_collection_analyzer import write_mod_with_vanilla_item
+
+
+@pytest.fixture
+def server():
+    analysis_server = AnalysisServer(port=0, cache_dir=None)
+    analysis_server.create_http_server()
+    thread = threading.Thread(target=analysis_server.serve_forever, daemon=True)
+    thread.start()
+    yield analysis_server
+    analysis_server.shutdown()
+    thread.join()
+
+
+def post_analyze(server: AnalysisServer, mod_dir: str) -> dict:
+    request = Request(
+        f"http://{server.host}:{server.port}/analyze",
+        data=json.dumps({"mod_dir": mod_dir}).encode("UTF-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    with urlopen(request) as response:
+        return json.load(response)
+
+
+def test_analyze_request(server: AnalysisServer):
+    report = post_analyze(server, "TestMod")
+
+    assert report["mod_dir"] == "TestMod"
+    assert report["structure"]["has_treasure_table"]
+    assert len(report["treasure_table"]["verified_items"]) > 0
+    # Parsed files stay in memory for the next request
+    assert len(server.cache.memory_entries) > 0
+
+
+def test_concurrent_requests(server: AnalysisServer):
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        reports = list(executor.map(post_analyze, [server] * 8, ["TestMod"] * 8))
+
+    for report in reports:
+        report.pop("elapsed_ms")
+    assert all(report == reports[0] for report in reports)
+
+    with urlopen(f"http://{server.host}:{server.port}/health") as response:
+        assert json.load(response)["requests"] == 8
+    # Nothing is waiting, so no locks are kept
+    assert server.mod_dir_locks == {}
+    assert server.mod_dir_users == {}
+
+
+def test_missing_mod_dir(server: AnalysisServer):
+    with pytest.raises(HTTPError) as err:
+        urlopen(f"http://{server.host}:{server.port}/analyze")
+    assert err.value.code == 400
+
+
+def test_items_in_vanilla_tables(tmp_path):
+    mod_dir, index_path = write_mod_with_vanilla_item(tmp_path)
+
+    with VanillaIndex(index_path) as vanilla_index:
+        analysis_server = AnalysisServer(
+            port=0, cache_dir=None, vanilla_index=vanilla_index
+        )
+        report = analysis_server.analyze(mod_dir)
+
+    assert report["treasure_table"]["inaccessible_items"] == []
+    report = AnalysisServer(port=0, cache_dir=None).analyze(mod_dir)
+    assert report["treasure_table"]["inaccessible_items"] == ["OBJ_RUNE_ROF_BONE_ARMOR"]
+
+
+def test_memory_cache_reparses_changed_files(tmp_path):
+    config_path = tmp_path / "Config.json"
+    config_path.write_text("{}")
+    cache = MemoryAnalysisCache(enabled=False)
+    calls: list[str] = []
+
+    def parse():
+        calls.append(config_path.read_text())
+        return json.loads(calls[-1])
+
+    cache.get_or_parse("se_config", str(config_path), parse)
+    cache.get_or_parse("se_config", str(config_path), parse)
+    assert len(calls) == 1
+
+    config_path.write_text('{"RequiredVersion": 1}')
+    assert cache.get_or_parse("se_config", str(config_path), parse) == {
+        "RequiredVersion": 1
+    }
+    assert len(calls) == 2
+
+
+def test_mod_dir_locks_are_dropped_after_use():
+    analysis_server = AnalysisServer(port=0, cache_dir=None)
+    entered = threading.Event()
+
+    def wait_for_lock():
+        with analysis_server.lock_mod_dir("TestMod"):
+            entered.set()
+
+    with analysis_server.lock_mod_dir("TestMod"):
+        waiter = threading.Thread(target=wait_for_lock)
+        waiter.start()
+        while analysis_server.mod_dir_users.get(os.path.abspath("TestMod")) != 2:
+            time.sleep(0.001)
+        # The second request shares the lock and waits for it
+        assert len(analysis_server.mod_dir_locks) == 1
+        assert not entered.is_set()
+
+    waiter.join()
+    assert entered.is_set()
+    assert analysis_server.mod_dir_locks == {}
+    assert analysis_server.mod_dir_users == {}
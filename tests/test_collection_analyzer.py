@@ -0,0 +1,79 @@
+import os
+import shutil
+from pathlib import Path
+
+from ModAnalyzer import CollectionAnalyzer
+from ModAnalyzer.GameData import VanillaIndexBuilder
+
+TEST_MOD_NAME = "TestMod"
+
+
+def test_generate_report_in_worker_processes():
+    analyzer = CollectionAnalyzer(workers=2)
+    report = analyzer.generate_report([TEST_MOD_NAME, TEST_MOD_NAME])
+
+    assert report.workers == 2
+    assert len(report.reports) == 2
+
+    for mod_report in report.reports:
+        assert not mod_report.error, mod_report.error
+        assert mod_report.Structure.has_meta_file, "No meta file detected"
+        assert mod_report.TreasureTable is not None, "No treasure table report"
+        assert len(mod_report.TreasureTable.verified_items) == 13
+        assert mod_report.ScriptExtender.has_config, "No SE config"
+
+    assert report.get_total_verified_items() == 26
+    assert report.get_total_inaccessible_items() == 0
+
+
+def write_mod_with_vanilla_item(tmp_path: Path) -> tuple[str, str]:
+    """
+    Copies TestMod with one rune only in a vanilla table, and returns
+    the mod dir and the path of a vanilla index with that table
+    """
+    mod_dir = tmp_path / "Mods" / TEST_MOD_NAME
+    shutil.copytree(TEST_MOD_NAME, mod_dir)
+    tt_path = mod_dir / "Public" / TEST_MOD_NAME / "Stats" / "Generated"
+    tt_path /= "TreasureTable.txt"
+    tt_path.write_text(
+        os.linesep.join(
+            line
+            for line in tt_path.read_text().splitlines()
+            if "I_OBJ_RUNE_ROF_BONE_ARMOR" not in line
+        )
+    )
+    vanilla_dir = tmp_path / "Data" / "Public" / "Shared" / "Stats" / "Generated"
+    vanilla_dir.mkdir(parents=True)
+    (vanilla_dir / "TreasureTable.txt").write_text(
+        os.linesep.join(
+            [
+                'new treasuretable "ST_MagicItems_Unique"',
+                'new subtable "1,1"',
+                'object category "I_OBJ_RUNE_ROF_BONE_ARMOR",1,0,0,0,0,0,0,0',
+            ]
+        )
+    )
+    index_path = str(tmp_path / "vanilla.idx")
+    VanillaIndexBuilder(str(tmp_path / "Data")).build(index_path)
+    return str(mod_dir), index_path
+
+
+def test_items_in_vanilla_tables_with_worker_processes(tmp_path: Path):
+    mod_dir, index_path = write_mod_with_vanilla_item(tmp_path)
+    mod_dirs = [mod_dir, mod_dir]
+
+    report = CollectionAnalyzer(workers=2).generate_report(mod_dirs)
+    assert report.get_total_inaccessible_items() == 2
+
+    report = CollectionAnalyzer(
+        workers=2, vanilla_index_path=index_path
+    ).generate_report(mod_dirs)
+    assert report.get_total_inaccessible_items() == 0
+
+
+def test_get_mod_dirs_from_collection_folder():
+    analyzer = CollectionAnalyzer()
+    mod_dirs = analyzer.get_mod_dirs(["tests"])
+
+    assert os.path.join("tests", "fixture") in mod_dirs
+    assert analyzer.get_mod_dirs([TEST_MOD_NAME]) == [TEST_MOD_NAME]
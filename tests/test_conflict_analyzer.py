@@ -0,0 +1,124 @@
+import json
+import os
+from pathlib import Path
+
+from ModAnalyzer.GameData import VanillaIndex, VanillaIndexBuilder
+from ModAnalyzer.report_json import get_conflicts_json
+from ModAnalyzer.TreasureTable import TreasureTableConflictAnalyzer
+
+
+def write_mod(
+    mods_dir: Path, mod_name: str, tables: dict[str, tuple[bool, list[str]]]
+) -> str:
+    """tables is table name => (can merge, entry names)"""
+    generated_dir = mods_dir / mod_name / "Public" / mod_name / "Stats" / "Generated"
+    generated_dir.mkdir(parents=True)
+    lines: list[str] = []
+    for table_name, (can_merge, entries) in tables.items():
+        lines.append(f'new treasuretable "{table_name}"')
+        if can_merge:
+            lines.append("CanMerge 1")
+        lines.append('new subtable "1,1"')
+        for entry in entries:
+            lines.append(f'object category "{entry}",1,0,0,0,0,0,0,0')
+    (generated_dir / "TreasureTable.txt").write_text(os.linesep.join(lines))
+    return str(mods_dir / mod_name)
+
+
+def test_replacement_drops_earlier_entries(tmp_path: Path):
+    mod_dirs = [
+        write_mod(tmp_path, "ModA", {"Shared_Table": (True, ["I_A_RING"])}),
+        write_mod(
+            tmp_path,
+            "ModB",
+            {
+                "Shared_Table": (True, ["I_B_RING"]),
+                "ModB_Table": (False, ["I_B_SWORD"]),
+            },
+        ),
+        write_mod(tmp_path, "ModC", {"Shared_Table": (False, ["I_C_RING"])}),
+        write_mod(tmp_path, "ModD", {"Shared_Table": (True, ["I_D_RING"])}),
+    ]
+    report = TreasureTableConflictAnalyzer().generate_report(mod_dirs)
+
+    assert report.num_mods == 4
+    assert report.num_tables == 2
+    assert report.num_entries == 5
+    assert len(report.conflicts) == 1
+
+    conflict = report.conflicts[0]
+    assert conflict.table_name == "Shared_Table"
+    assert conflict.get_mod_dirs() == mod_dirs
+    assert conflict.winner == mod_dirs[2]
+    # ModD merges after the replacement, so it keeps its entry
+    assert conflict.lost_entries == {
+        mod_dirs[0]: ["I_A_RING"],
+        mod_dirs[1]: ["I_B_RING"],
+    }
+
+    result = json.loads(get_conflicts_json(report))
+    assert result["conflicts"][0]["winner"] == mod_dirs[2]
+
+
+def test_merging_mods_do_not_conflict(tmp_path: Path):
+    mod_dirs = [
+        write_mod(tmp_path, f"Mod{index}", {"Shared_Table": (True, [f"I_{index}"])})
+        for index in range(3)
+    ]
+    report = TreasureTableConflictAnalyzer().generate_report(mod_dirs)
+
+    assert report.conflicts == []
+
+
+def test_merging_table_without_entries(tmp_path: Path):
+    mod_dirs = [
+        write_mod(tmp_path, "ModA", {"TT_X": (False, ["I_FOO"])}),
+        write_mod(tmp_path, "ModB", {"TT_X": (True, [])}),
+        write_mod(tmp_path, "ModC", {"TT_X": (False, ["I_BAR"])}),
+    ]
+    # CanMerge after the entries still applies to the whole table
+    tt_path = Path(
+        mod_dirs[2], "Public", "ModC", "Stats", "Generated", "TreasureTable.txt"
+    )
+    tt_path.write_text(tt_path.read_text() + os.linesep + "CanMerge 1")
+
+    report = TreasureTableConflictAnalyzer().generate_report(mod_dirs)
+
+    assert report.conflicts == []
+
+
+def test_replacing_a_vanilla_table(tmp_path: Path):
+    stats_dir = tmp_path / "Data" / "Public" / "Shared" / "Stats" / "Generated"
+    stats_dir.mkdir(parents=True)
+    (stats_dir / "TreasureTable.txt").write_text(
+        os.linesep.join(
+            [
+                'new treasuretable "Vanilla_Table"',
+                'new subtable "1,1"',
+                'object category "I_VANILLA_RING",1,0,0,0,0,0,0,0',
+            ]
+        )
+    )
+    index_path = str(tmp_path / "vanilla.idx")
+    VanillaIndexBuilder(str(tmp_path / "Data")).build(index_path)
+    mod_dir = write_mod(
+        tmp_path / "Mods", "ModA", {"Vanilla_Table": (False, ["I_A_RING"])}
+    )
+
+    with VanillaIndex(index_path) as vanilla_index:
+        report = TreasureTableConflictAnalyzer(
+            vanilla_index=vanilla_index
+        ).generate_report([mod_dir])
+
+    assert len(report.conflicts) == 1
+    assert report.conflicts[0].lost_entries == {"Vanilla": ["I_VANILLA_RING"]}
+
+
+def test_tt_that_is_not_utf8(tmp_path: Path):
+    mod_dir = write_mod(tmp_path, "ModA", {"Shared_Table": (True, ["I_A_RING"])})
+    tt_path = Path(mod_dir, "Public", "ModA", "Stats", "Generated", "TreasureTable.txt")
+    tt_path.write_bytes(tt_path.read_bytes() + b"\xff\xfe")
+
+    report = TreasureTableConflictAnalyzer().generate_report([mod_dir])
+
+    assert report.conflicts == []
@@ -0,0 +1,61 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import ModAnalyzer
+from ModAnalyzer import Structure
+
+# Generous, since CI machines vary. The module checks below are what
+# catches an eager import creeping back in.
+IMPORT_BUDGET_SECONDS = 2.0
+
+# Only needed to generate or link mods, or to render tables
+DEFERRED_MODULES = [
+    "jinja2",
+    "directory_tree",
+    "tabulate",
+    "concurrent.futures.process",
+    "ModAnalyzer.Structure.mod_linker",
+    "ModAnalyzer.Structure.structure_generator",
+    "ModAnalyzer.collection_analyzer",
+    "ModAnalyzer.mod_watcher",
+]
+
+
+def get_import_times(statement: str) -> dict[str, int]:
+    """Returns module => cumulative microseconds from -X importtime"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+        # The CLI script lives at the repo root
+        cwd=Path(__file__).parent.parent,
+    )
+    import_times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module_name = line.split("|")
+        import_times[module_name.strip()] = int(cumulative)
+    return import_times
+
+
+def test_cli_import_time():
+    import_times = get_import_times("import analyzer")
+
+    for module_name in DEFERRED_MODULES:
+        assert module_name not in import_times, f"{module_name} imported at startup"
+
+    assert import_times["analyzer"] / 1_000_000 < IMPORT_BUDGET_SECONDS
+
+
+def test_lazy_attributes():
+    assert "StructureGenerator" in dir(Structure)
+    assert Structure.StructureGenerator.__name__ == "StructureGenerator"
+    assert ModAnalyzer.Analyzer.__name__ == "Analyzer"
+
+    with pytest.raises(AttributeError):
+        Structure.NotAClass
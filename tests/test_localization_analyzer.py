@@ -0,0 +1,72 @@
+import os
+import shutil
+import time
+from pathlib import Path
+
+from ModAnalyzer.Localization import LocalizationAnalyzer
+from ModAnalyzer.Structure.structure_analyzer import StructureAnalyzer
+
+RUNE_DESCRIPTION = "h339303faca4d483f970a0f16c082aef5869b"
+RUNE_DISPLAY_NAME = "h027eef5bddf04810ab3453b01c1aba1a51fa"
+UNUSED_HANDLE = "h00000000000000000000000000000000beef"
+
+
+def write_loca_file(loca_path: Path, handles: list[str]):
+    lines = ['<?xml version="1.0" encoding="utf-8"?>', "<contentList>"]
+    for handle in handles:
+        lines.append(f'<content contentuid="{handle}" version="1">Text</content>')
+    lines.append("</contentList>")
+    loca_path.write_text(os.linesep.join(lines))
+
+
+def get_analyzer(mod_dir: Path) -> LocalizationAnalyzer:
+    structure_analyzer = StructureAnalyzer(
+        mod_dir_name=str(mod_dir),
+        mod_name=StructureAnalyzer.get_mod_name_from_dir(str(mod_dir)),
+    )
+    return LocalizationAnalyzer(structure_analyzer=structure_analyzer)
+
+
+def test_report(tmp_path: Path):
+    mod_dir = tmp_path / "TestMod"
+    shutil.copytree("TestMod", mod_dir)
+    write_loca_file(
+        mod_dir / "Localization" / "English" / "TestMod-English.xml",
+        [RUNE_DESCRIPTION, RUNE_DESCRIPTION, RUNE_DISPLAY_NAME, UNUSED_HANDLE],
+    )
+
+    report = get_analyzer(mod_dir).generate_report()
+
+    assert report.has_localization
+    assert report.num_entries == 4
+    assert report.duplicate_handles == [RUNE_DESCRIPTION]
+    assert report.unused_handles == [UNUSED_HANDLE]
+    assert RUNE_DESCRIPTION not in report.missing_handles
+    assert RUNE_DISPLAY_NAME not in report.missing_handles
+    assert "h50c615750ee344f6bb28c3fcbb6adac2786c" in report.missing_handles
+
+
+def test_mod_without_localization(tmp_path: Path):
+    mod_dir = tmp_path / "EmptyMod"
+    mod_dir.mkdir()
+
+    report = get_analyzer(mod_dir).generate_report([])
+
+    assert not report.has_localization
+    assert report.num_entries == 0
+    assert report.missing_handles == {}
+
+
+def test_large_localization_file(tmp_path: Path):
+    loca_path = tmp_path / "Large-English.xml"
+    handles = [f"h{index:036x}" for index in range(300_000)]
+    write_loca_file(loca_path, handles)
+    analyzer = get_analyzer(tmp_path)
+
+    start_time = time.perf_counter()
+    file_handles = analyzer.parse_localization_file(str(loca_path))
+    elapsed = time.perf_counter() - start_time
+
+    assert len(file_handles) == len(handles)
+    # Generous, it takes well under a second
+    assert elapsed < 10
@@ -0,0 +1,176 @@
+import struct
+import uuid
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+from ModAnalyzer.Larian import LSFReader
+from ModAnalyzer.Larian.compression import COMPRESSION_LZ4, decompress_lz4_frame
+from ModAnalyzer.Larian.lsf_reader import TYPE_NAMES
+from ModAnalyzer.TreasureTable.treasure_table_analyzer import parse_rt_file_records
+from tests.test_pak_reader import get_lz4_literals
+
+RT_PATH = Path("TestMod/Public/TestMod/RootTemplates/runes.lsx")
+
+
+def get_lz4_frame(data: bytes) -> bytes:
+    """An LZ4 frame with one literal only block, and no checksums"""
+    block = get_lz4_literals(data)
+    return (
+        struct.pack("<IBBB", 0x184D2204, 0x60, 0x40, 0)
+        + struct.pack("<I", len(block))
+        + block
+        + struct.pack("<I", 0)
+    )
+
+
+def get_value_bytes(attribute: ET.Element) -> bytes:
+    type_name = attribute.get("type")
+    value = attribute.get("value", "")
+    if type_name == "TranslatedString":
+        handle = attribute.get("handle", "").encode() + b"\0"
+        return (
+            struct.pack("<Hi", int(attribute.get("version", 0)), len(handle)) + handle
+        )
+    if type_name == "bool":
+        return struct.pack("<?", value == "True")
+    if type_name == "uint8":
+        return struct.pack("<B", int(value))
+    if type_name == "int32":
+        return struct.pack("<i", int(value))
+    if type_name == "float":
+        return struct.pack("<f", float(value))
+    if type_name == "fvec3":
+        return struct.pack("<3f", *map(float, value.split()))
+    if type_name == "guid":
+        return uuid.UUID(value).bytes_le
+    return value.encode() + b"\0"
+
+
+def write_lsf(lsf_path: Path, lsx_path: Path, is_long=True, compressed=False):
+    """Converts an LSX to a version 6 LSF, with long or short nodes"""
+    names: dict[str, int] = {}
+    nodes: list[tuple[int, int, int]] = []
+    attributes: list[tuple[int, int, int, int, int]] = []
+    values = bytearray()
+
+    def get_name_index(name: str) -> int:
+        # One bucket per name keeps this simple
+        return names.setdefault(name, len(names)) << 16
+
+    def add_node(node: ET.Element, name: str, parent: int):
+        node_index = len(nodes)
+        node_attributes = node.findall("attribute")
+        first_attribute = len(attributes) if node_attributes else -1
+        nodes.append((get_name_index(name), parent, first_attribute))
+        for index, attribute in enumerate(node_attributes):
+            value = get_value_bytes(attribute)
+            is_last = index == len(node_attributes) - 1
+            attributes.append(
+                (
+                    get_name_index(attribute.get("id")),
+                    TYPE_NAMES.index(attribute.get("type")) | (len(value) << 6),
+                    -1 if is_last else len(attributes) + 1,
+                    len(values),
+                    node_index,
+                )
+            )
+            values.extend(value)
+        for child in node.findall("children/node"):
+            add_node(child, child.get("id"), node_index)
+
+    for region in ET.parse(lsx_path).getroot().iter("region"):
+        add_node(region.find("node"), region.get("id"), -1)
+
+    strings = struct.pack("<I", len(names))
+    for name in names:
+        strings += struct.pack("<HH", 1, len(name)) + name.encode()
+    if is_long:
+        node_bytes = b"".join(
+            struct.pack("<Iiii", name, parent, -1, first)
+            for name, parent, first in nodes
+        )
+        attribute_bytes = b"".join(
+            struct.pack("<IIiI", name, type_length, next_index, offset)
+            for name, type_length, next_index, offset, _ in attributes
+        )
+    else:
+        node_bytes = b"".join(
+            struct.pack("<Iii", name, first, parent) for name, parent, first in nodes
+        )
+        attribute_bytes = b"".join(
+            struct.pack("<IIi", name, type_length, node_index)
+            for name, type_length, _, _, node_index in attributes
+        )
+
+    sections = [strings, b"", node_bytes, attribute_bytes, bytes(values)]
+    sizes: list[int] = []
+    stored_sections: list[bytes] = []
+    for section_index, section in enumerate(sections):
+        # Like LSLib, strings are a plain block and the rest are frames
+        compress = get_lz4_frame if section_index > 0 else get_lz4_literals
+        stored = compress(section) if compressed and section else section
+        sizes += [len(section), len(stored) if compressed and section else 0]
+        stored_sections.append(stored)
+    lsf_path.write_bytes(
+        b"LSOF"
+        + struct.pack("<IQ", 6, 0)
+        + struct.pack(
+            "<10IBBHI",
+            *sizes,
+            COMPRESSION_LZ4 if compressed else 0,
+            0,
+            0,
+            1 if is_long else 0,
+        )
+        + b"".join(stored_sections[:1] + stored_sections[2:])
+    )
+
+
+@pytest.mark.parametrize(
+    "is_long,compressed", [(True, False), (False, False), (True, True)]
+)
+def test_records_match_lsx(tmp_path: Path, is_long: bool, compressed: bool):
+    lsf_path = tmp_path / "runes.lsf"
+    write_lsf(lsf_path, RT_PATH, is_long, compressed)
+
+    lsf_summary = parse_rt_file_records(str(lsf_path))
+    lsx_summary = parse_rt_file_records(str(RT_PATH))
+
+    assert len(lsf_summary["verified"]) == 13
+    assert lsf_summary == lsx_summary
+
+
+def test_attribute_values(tmp_path: Path):
+    lsf_path = tmp_path / "runes.lsf"
+    write_lsf(lsf_path, RT_PATH)
+
+    with LSFReader(str(lsf_path)) as lsf:
+        assert lsf.version == 6
+        templates = lsf.get_children(lsf.get_region("Templates"))
+        attributes = lsf.get_attributes(templates[0])
+
+    assert attributes["Name"] == ("LSString", "ROF_Rune_Template")
+    assert attributes["DisplayName"].value == "h027eef5bddf04810ab3453b01c1aba1a51fa"
+    assert attributes["Type"] == ("FixedString", "item")
+    assert isinstance(attributes["maxStackAmount"].value, int)
+
+
+def test_invalid_lsf():
+    with pytest.raises(ValueError):
+        LSFReader(b"LSOF" + struct.pack("<I", 6))
+    with pytest.raises(ValueError):
+        LSFReader(b"LSPK" + bytes(64))
+
+
+def test_lz4_frame_with_stored_block():
+    frame = (
+        struct.pack("<IBBB", 0x184D2204, 0x60, 0x40, 0)
+        + struct.pack("<I", 0x80000000 | 3)
+        + b"abc"
+        + struct.pack("<I", len(get_lz4_literals(b"def")))
+        + get_lz4_literals(b"def")
+        + struct.pack("<I", 0)
+    )
+    assert decompress_lz4_frame(frame) == b"abcdef"
@@ -0,0 +1,212 @@
+import json
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from ModAnalyzer import Analyzer, CollectionAnalyzer
+from ModAnalyzer.Larian.compression import COMPRESSION_LZ4
+from ModAnalyzer.mod_fs import (
+    DirectoryModFS,
+    IndexedModFS,
+    MemoryModFS,
+    ModFS,
+    PakModFS,
+    ZipModFS,
+    get_mod_fs,
+)
+from ModAnalyzer.report_json import get_report_json
+from tests.test_pak_reader import write_pak
+
+TT_PATH = "TestMod/Public/TestMod/Stats/Generated/TreasureTable.txt"
+
+
+def get_test_mod_files() -> dict[str, bytes]:
+    """Every file in TestMod, relative to it"""
+    return {
+        path.relative_to("TestMod").as_posix(): path.read_bytes()
+        for path in Path("TestMod").rglob("*")
+        if path.is_file()
+    }
+
+
+def get_report_dict(fs: ModFS | None = None) -> dict:
+    return json.loads(get_report_json(Analyzer(fs=fs).generate_report("TestMod")))
+
+
+@pytest.fixture(scope="module")
+def directory_report() -> dict:
+    return get_report_dict()
+
+
+def test_memory_fs(directory_report: dict):
+    fs = MemoryModFS(get_test_mod_files(), root="TestMod")
+
+    assert fs.is_dir("TestMod")
+    assert fs.is_dir("TestMod/Public/TestMod/Stats")
+    assert fs.is_file(TT_PATH)
+    assert not fs.exists("TestMod/Public/Missing.txt")
+    assert "Generated" in fs.list_dir("TestMod/Public/TestMod/Stats")
+    assert fs.stat(TT_PATH).size == Path(TT_PATH).stat().st_size
+    assert fs.read_bytes(TT_PATH) == Path(TT_PATH).read_bytes()
+    assert fs.get_local_path(TT_PATH) is None
+
+    with pytest.raises(FileNotFoundError):
+        fs.open("TestMod/Public/Missing.txt")
+    with pytest.raises(FileNotFoundError):
+        fs.stat("OtherMod/meta.lsx")
+
+    assert get_report_dict(fs) == directory_report
+
+
+def write_zip(zip_path: Path, prefix: str = "") -> Path:
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for name, contents in get_test_mod_files().items():
+            zip_file.writestr(f"{prefix}{name}", contents)
+    return zip_path
+
+
+def test_zip_fs(tmp_path: Path, directory_report: dict):
+    zip_path = write_zip(tmp_path / "TestMod.zip")
+
+    with ZipModFS(str(zip_path)) as fs:
+        assert fs.root == "TestMod"
+        assert fs.read_bytes(TT_PATH) == Path(TT_PATH).read_bytes()
+        assert get_report_dict(fs) == directory_report
+
+
+def test_zip_with_mod_folder(tmp_path: Path, directory_report: dict):
+    zip_path = write_zip(tmp_path / "upload-1234.zip", prefix="TestMod/")
+    with zipfile.ZipFile(zip_path, "a") as zip_file:
+        zip_file.writestr("__MACOSX/TestMod/._meta.lsx", b"")
+
+    with get_mod_fs(str(zip_path)) as fs:
+        # Named after the folder, not the upload
+        assert fs.get_mod_dir(str(zip_path)) == "TestMod"
+        assert sorted(fs.list_dir("TestMod")) == ["Localization", "Mods", "Public"]
+        assert get_report_dict(fs) == directory_report
+
+
+def test_zip_named_after_a_version(tmp_path: Path, directory_report: dict):
+    zip_path = write_zip(tmp_path / "TestMod_v1.2.zip")
+
+    with get_mod_fs(str(zip_path)) as fs:
+        assert fs.get_mod_dir(str(zip_path)) == "TestMod_v1.2"
+        assert fs.get_mod_name() == "TestMod"
+        report = Analyzer(fs=fs).generate_report(fs.get_mod_dir(str(zip_path)))
+
+    assert report.Structure.has_meta_file
+    assert report.Structure.has_root_templates
+    assert report.Structure.has_treasure_table
+    report_dict = json.loads(get_report_json(report))
+    assert report_dict["mod_dir"] == "TestMod_v1.2"
+    # Paths start with the zip's name, everything else is the same
+    assert report_dict["treasure_table"] == directory_report["treasure_table"]
+    assert report_dict["localization"]["missing_handles"] == (
+        directory_report["localization"]["missing_handles"]
+    )
+
+
+def test_zip_folder_detection():
+    assert ZipModFS.get_mod_folder_name(["TestMod/Mods/TestMod/meta.lsx"]) == "TestMod"
+    assert ZipModFS.get_mod_folder_name(["Mods/TestMod/meta.lsx"]) == ""
+    assert ZipModFS.get_mod_folder_name(["A/meta.lsx", "B/meta.lsx"]) == ""
+    assert ZipModFS.get_mod_folder_name(["meta.lsx"]) == ""
+
+
+def test_collection_of_archives(tmp_path: Path):
+    write_zip(tmp_path / "TestMod.zip", prefix="TestMod/")
+    (tmp_path / "notes.txt").write_text("Not a mod")
+
+    collection_analyzer = CollectionAnalyzer(workers=1)
+    assert collection_analyzer.get_mod_dirs([str(tmp_path)]) == [
+        str(tmp_path / "TestMod.zip")
+    ]
+
+    report = collection_analyzer.generate_report([str(tmp_path)])
+    assert report.reports[0].mod_dir == "TestMod"
+    assert report.get_total_verified_items() > 0
+
+
+def test_pak_fs(tmp_path: Path, directory_report: dict):
+    pak_path = tmp_path / "TestMod.pak"
+    write_pak(
+        pak_path,
+        {
+            name: (COMPRESSION_LZ4, contents)
+            for name, contents in get_test_mod_files().items()
+        },
+    )
+
+    with PakModFS(str(pak_path)) as fs:
+        assert fs.read_bytes(TT_PATH) == Path(TT_PATH).read_bytes()
+        assert get_report_dict(fs) == directory_report
+
+
+def test_pak_named_after_a_version(tmp_path: Path, directory_report: dict):
+    pak_path = tmp_path / "TestMod_v1.2.pak"
+    write_pak(
+        pak_path,
+        {
+            name: (COMPRESSION_LZ4, contents)
+            for name, contents in get_test_mod_files().items()
+        },
+    )
+
+    with get_mod_fs(str(pak_path)) as fs:
+        assert fs.get_mod_name() == "TestMod"
+        report = Analyzer(fs=fs).generate_report(fs.get_mod_dir(str(pak_path)))
+
+    assert report.mod_dir == "TestMod_v1.2"
+    assert report.Structure.has_meta_file
+    assert report.Structure.has_treasure_table
+    report_dict = json.loads(get_report_json(report))
+    assert report_dict["treasure_table"] == directory_report["treasure_table"]
+
+
+def test_directory_fs():
+    fs = DirectoryModFS()
+    rt_dir = "TestMod/Public/TestMod/RootTemplates"
+
+    assert fs.is_local
+    assert fs.get_files(rt_dir, ".LSX") == [f"{rt_dir}/runes.lsx"]
+    assert fs.stat(TT_PATH).size == Path(TT_PATH).stat().st_size
+    assert fs.get_local_path(TT_PATH) == TT_PATH
+
+
+@pytest.mark.parametrize("archive_name", ["bad.zip", "bad.pak"])
+def test_cli_reports_broken_archives(tmp_path: Path, archive_name: str):
+    from typer.testing import CliRunner
+
+    from analyzer import app
+
+    archive_path = tmp_path / archive_name
+    archive_path.write_bytes(b"PK\x03\x04 truncated upload")
+
+    result = CliRunner().invoke(app, ["analyze", str(archive_path), "--no-cache"])
+
+    assert result.exit_code == 1
+    assert f"Unable to open {archive_path}" in result.output
+
+
+def test_mod_fs_needs_entry_hooks():
+    class IncompleteModFS(IndexedModFS):
+        def iter_entries(self):
+            yield from []
+
+    with pytest.raises(TypeError):
+        IncompleteModFS("Mod")
+    # Directories are read from disk, not through an index
+    assert not hasattr(DirectoryModFS(), "iter_entries")
+
+
+def test_directory_tree_index_is_not_stale(tmp_path: Path):
+    fs = DirectoryModFS()
+    mod_dir = tmp_path / "Mod"
+    (mod_dir / "Mods" / "Mod").mkdir(parents=True)
+
+    meta_path = (mod_dir / "Mods" / "Mod" / "meta.lsx").as_posix()
+
+    assert not fs.get_tree_index(str(mod_dir)).is_file(meta_path)
+    Path(meta_path).write_text("<save />")
+    assert fs.get_tree_index(str(mod_dir)).is_file(meta_path)
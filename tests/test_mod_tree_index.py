@@ -0,0 +1,29 @@
+import os
+
+from ModAnalyzer.Structure import ModTreeIndex
+
+
+def test_index_from_windows_paths(mod_dirs_fixture: list[str]):
+    index = ModTreeIndex(mod_dirs_fixture)
+
+    assert len(index) == len(set(mod_dirs_fixture))
+    assert os.path.join("TestMod", "Mods", "TestMod", "meta.lsx") in index
+    assert "TestMod/Mods/TestMod/meta.lsx" in index
+    assert "TestMod/Mods/TestMod/missing.lsx" not in index
+    assert index.is_dir("TestMod\\Mods\\TestMod\\ScriptExtender")
+    assert index.is_file("TestMod\\Mods\\TestMod\\ScriptExtender\\Config.json")
+    assert "Config.json" in index.get_children("TestMod/Mods/TestMod/ScriptExtender")
+
+
+def test_index_from_directory():
+    index = ModTreeIndex.from_directory("TestMod")
+
+    assert index.is_dir(os.path.join("TestMod", "Public", "TestMod", "RootTemplates"))
+    assert index.is_file(os.path.join("TestMod", "Mods", "TestMod", "meta.lsx"))
+    assert index.get_files_with_extension(
+        os.path.join("TestMod", "Public", "TestMod", "RootTemplates"),
+        ".LSX",
+        case_sensitive=False,
+    ) == ["TestMod/Public/TestMod/RootTemplates/runes.lsx"]
+    assert index.has_file_with_extension("TestMod/Public", ".lsx", recursive=True)
+    assert not index.has_file_with_extension("TestMod/Public", ".lsx")
@@ -0,0 +1,49 @@
+import os
+import shutil
+
+from ModAnalyzer import Analyzer
+from ModAnalyzer.mod_watcher import ModWatcher
+
+
+def test_poll_runs_affected_stages(tmp_path, monkeypatch):
+    shutil.copytree("TestMod", tmp_path / "TestMod")
+    monkeypatch.chdir(tmp_path)
+
+    watcher = ModWatcher(Analyzer(), "TestMod")
+    watcher.mod_tree_index = watcher.get_snapshot()
+    watcher.run_stages({ModWatcher.STRUCTURE})
+
+    assert watcher.poll() == set(), "Stages ran without changes"
+
+    tt_path = watcher.structure_analyzer.get_treasure_table_file_path()
+    with open(tt_path, "a", encoding="UTF-8") as tt_file:
+        tt_file.write(os.linesep)
+    assert watcher.poll() == {ModWatcher.TREASURE_TABLE}
+
+    stats_path = os.path.join(watcher.structure_analyzer.get_data_path(), "Object.txt")
+    os.makedirs(os.path.dirname(stats_path), exist_ok=True)
+    with open(stats_path, "w", encoding="UTF-8") as stats_file:
+        stats_file.write('new entry "OBJ_RUNE"')
+    assert watcher.poll() == {
+        ModWatcher.STRUCTURE,
+        ModWatcher.TREASURE_TABLE,
+        ModWatcher.LOCALIZATION,
+    }
+
+    with open(stats_path, "a", encoding="UTF-8") as stats_file:
+        stats_file.write(f'{os.linesep}type "Object"')
+    assert watcher.poll() == {ModWatcher.TREASURE_TABLE, ModWatcher.LOCALIZATION}
+
+    bootstrap_path = watcher.se_analyzer.get_bootstrap_client_file_path()
+    os.makedirs(os.path.dirname(bootstrap_path))
+    with open(bootstrap_path, "w", encoding="UTF-8") as bootstrap_file:
+        bootstrap_file.write("print('hi')")
+    assert watcher.poll() == {ModWatcher.STRUCTURE, ModWatcher.SCRIPT_EXTENDER}
+
+    loca_path = watcher.structure_analyzer.get_localization_file_path()
+    with open(loca_path, "a", encoding="UTF-8") as loca_file:
+        loca_file.write(os.linesep)
+    assert watcher.poll() == {ModWatcher.LOCALIZATION}
+
+    os.remove(loca_path)
+    assert watcher.poll() == {ModWatcher.STRUCTURE, ModWatcher.LOCALIZATION}
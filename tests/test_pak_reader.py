@@ -0,0 +1,121 @@
+import struct
+import zlib
+from pathlib import Path
+
+import pytest
+
+from ModAnalyzer.Larian import PakReader
+from ModAnalyzer.Larian.compression import (
+    COMPRESSION_LZ4,
+    COMPRESSION_NONE,
+    COMPRESSION_ZLIB,
+    decompress_lz4_block,
+)
+
+META_PATH = "Mods/TestMod/meta.lsx"
+TT_PATH = "Public/TestMod/Stats/Generated/TreasureTable.txt"
+CONFIG_PATH = "Mods/TestMod/ScriptExtender/Config.json"
+
+
+def get_lz4_literals(data: bytes) -> bytes:
+    """A valid LZ4 block that is only literals"""
+    if len(data) < 15:
+        return bytes([len(data) << 4]) + data
+    remaining = len(data) - 15
+    return (
+        bytes([0xF0]) + b"\xff" * (remaining // 255) + bytes([remaining % 255]) + data
+    )
+
+
+def write_pak(pak_path: Path, files: dict[str, tuple[int, bytes]]):
+    """files is name => (compression method, contents), as a version 18 pak"""
+    header_size = 4 + struct.calcsize("<IQIBB16sH")
+    body = bytearray()
+    entries = bytearray()
+    for name, (method, contents) in files.items():
+        if method == COMPRESSION_ZLIB:
+            stored = zlib.compress(contents)
+        elif method == COMPRESSION_LZ4:
+            stored = get_lz4_literals(contents)
+        else:
+            stored = contents
+        offset = header_size + len(body)
+        body += stored
+        entries += struct.pack(
+            "<256sIHBBII",
+            name.encode("UTF-8"),
+            offset & 0xFFFFFFFF,
+            offset >> 32,
+            0,
+            method,
+            len(stored),
+            len(contents) if method != COMPRESSION_NONE else 0,
+        )
+
+    file_list = get_lz4_literals(bytes(entries))
+    file_list_offset = header_size + len(body)
+    pak_path.write_bytes(
+        b"LSPK"
+        + struct.pack(
+            "<IQIBB16sH", 18, file_list_offset, 8 + len(file_list), 0, 0, b"", 1
+        )
+        + body
+        + struct.pack("<II", len(files), len(file_list))
+        + file_list
+    )
+
+
+@pytest.fixture
+def pak_path(tmp_path: Path) -> Path:
+    pak_path = tmp_path / "TestMod.pak"
+    write_pak(
+        pak_path,
+        {
+            META_PATH: (
+                COMPRESSION_NONE,
+                Path("TestMod/Mods/TestMod/meta.lsx").read_bytes(),
+            ),
+            TT_PATH: (
+                COMPRESSION_ZLIB,
+                Path(
+                    "TestMod/Public/TestMod/Stats/Generated/TreasureTable.txt"
+                ).read_bytes(),
+            ),
+            CONFIG_PATH: (COMPRESSION_LZ4, b'{"RequiredVersion": 1}'),
+        },
+    )
+    return pak_path
+
+
+def test_read_files(pak_path: Path):
+    with PakReader(str(pak_path)) as pak:
+        assert pak.version == 18
+        assert pak.get_names("Mods/") == [CONFIG_PATH, META_PATH]
+        assert pak.read(META_PATH) == Path("TestMod/Mods/TestMod/meta.lsx").read_bytes()
+        assert pak.read(TT_PATH).startswith(b"// Rune of Bone Armor //")
+        assert pak.open(CONFIG_PATH).read() == b'{"RequiredVersion": 1}'
+        assert pak.get_entry(CONFIG_PATH).size == 22
+
+        with pytest.raises(KeyError):
+            pak.read("Mods/TestMod/missing.lsx")
+
+
+def test_invalid_archive(tmp_path: Path):
+    pak_path = tmp_path / "Invalid.pak"
+    pak_path.write_bytes(b"LSPK" + struct.pack("<I", 10))
+
+    with pytest.raises(ValueError):
+        PakReader(str(pak_path))
+    assert PakReader.open_if_exists(str(pak_path)) is None
+    assert PakReader.open_if_exists(str(tmp_path / "Missing.pak")) is None
+
+
+def test_lz4_matches():
+    # "abc", then a 9 byte match 3 back that overlaps itself, then "d"
+    block = bytes([0x35]) + b"abc" + bytes([3, 0, 0x10]) + b"d"
+    assert decompress_lz4_block(block, 13) == b"abcabcabcabcd"
+
+    with pytest.raises(ValueError):
+        decompress_lz4_block(bytes([0x35]) + b"abc" + bytes([9, 0, 0x10]) + b"d", 13)
+    with pytest.raises(ValueError):
+        decompress_lz4_block(bytes([0x35]) + b"abc" + bytes([3]), 13)
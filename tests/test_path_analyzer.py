@@ -1,6 +1,7 @@
 import logging
 import os
 
+from ModAnalyzer.Structure import ModTreeIndex
 from ModAnalyzer.Structure.path_analyzer import PathAnalyzer, PathAnalyzerReport
 
 logger = logging.getLogger(__name__)
@@ -30,3 +31,44 @@ def test_path_doesnt_exist():
     assert not report.paths["meow"]["exists"]
 
     logger.debug(report.colored_path)
+
+
+def test_scanned_paths_are_not_stat(monkeypatch):
+    analyzer = PathAnalyzer()
+    analyzer.set_mod_tree_index(ModTreeIndex.from_directory("TestMod"))
+    checked_paths: list[str] = []
+    exists = os.path.exists
+
+    def exists_spy(path):
+        checked_paths.append(path)
+        return exists(path)
+
+    monkeypatch.setattr(os.path, "exists", exists_spy)
+
+    meta_path = os.path.join("TestMod", "Mods", "TestMod", "meta.lsx")
+    report = analyzer.get_path_report(meta_path)
+    assert report.paths["meta.lsx"]["exists"]
+
+    report = analyzer.get_path_report(os.path.join("TestMod", "Mods", "woof"))
+    assert report.paths["Mods"]["exists"]
+    assert not report.paths["woof"]["exists"]
+    assert checked_paths == [], "Paths inside the scanned mod dir were stat'd"
+
+    analyzer.get_path_report(os.path.join("tests", "fixture"))
+    analyzer.get_path_report(os.path.join("tests", "fixture", "dirs.json"))
+    assert checked_paths == [
+        "tests",
+        os.path.join("tests", "fixture"),
+        os.path.join("tests", "fixture", "dirs.json"),
+    ], "Prefixes were checked more than once"
+
+    analyzer.clear_cache()
+    analyzer.get_path_report("tests")
+    assert checked_paths[-1] == "tests", "Cache was not cleared"
+
+
+def test_absolute_path_exists():
+    analyzer = PathAnalyzer()
+    report = analyzer.get_path_report(os.path.abspath("tests"))
+
+    assert report.paths["tests"]["exists"]
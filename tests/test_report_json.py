@@ -0,0 +1,51 @@
+import json
+
+from ModAnalyzer import Analyzer, CollectionReport
+from ModAnalyzer.report_json import (
+    SCHEMA_VERSION,
+    get_collection_json,
+    get_report_json,
+)
+
+
+def test_report_json():
+    report = Analyzer().generate_report("TestMod")
+    result = json.loads(get_report_json(report))
+
+    assert result["schema_version"] == SCHEMA_VERSION
+    assert result["mod_dir"] == "TestMod"
+    assert result["structure"]["has_treasure_table"]
+
+    tt_result = result["treasure_table"]
+    assert len(tt_result["verified_items"]) == len(report.TreasureTable.verified_items)
+    assert tt_result["verified_items"][0]["stats"].startswith("OBJ_")
+    # Only the schema's fields, not every field TemplateRecord has
+    assert set(tt_result["verified_items"][0]) == {
+        "name",
+        "map_key",
+        "stats",
+        "dev_comment",
+        "parent_template_id",
+    }
+    assert tt_result["treasure_table_entries"] == len(
+        report.TreasureTable.treasure_table_entries
+    )
+    assert set(result["script_extender"]) >= {"has_se_dir", "has_config"}
+
+
+def test_missing_stages_are_null():
+    result = json.loads(get_report_json(Analyzer().generate_report("NotAMod")))
+
+    assert not result["structure"]["mod_dir_exists"]
+    assert result["treasure_table"] is None
+    assert result["script_extender"] is None
+
+
+def test_collection_json():
+    collection_report = CollectionReport(
+        reports=[Analyzer().generate_report("TestMod")], workers=1
+    )
+    result = json.loads(get_collection_json(collection_report))
+
+    assert [mod["mod_dir"] for mod in result["mods"]] == ["TestMod"]
+    assert result["workers"] == 1
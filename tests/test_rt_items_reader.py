@@ -1,3 +1,4 @@
+import io
 import logging
 import xml.etree.ElementTree as ET
 from pathlib import Path
@@ -22,11 +23,18 @@ def node_children():
 
     assert root_node is not None, "Failed to get root node from XML"
 
-    node_summary = parser.get_verified_nodes(root_node)
+    template_nodes = parser.get_templates_children(root_node).findall("node")
+    records = [parser.get_template_record(node) for node in template_nodes]
+    verified_records = parser.get_record_summary(records)["verified"]
+    verified_nodes = [
+        node
+        for node, record in zip(template_nodes, records)
+        if any(record is verified for verified in verified_records)
+    ]
 
-    assert len(node_summary["verified"]) > 0, "Failed to get template children"
+    assert len(verified_nodes) > 0, "Failed to get template children"
 
-    return node_summary["verified"]
+    return verified_nodes
 
 
 def test_get_items_from_rt(node_children: list[ET.Element]):
@@ -49,3 +57,52 @@ def test_get_stats_names_from_node_children(node_children: list[ET.Element]):
     parser = RootTemplateParser()
     stats_names = parser.get_stats_names_from_node_children(node_children)
     assert len(stats_names) == len(node_children), "Failed to get stats names"
+
+
+def test_iter_template_records(node_children: list[ET.Element]):
+    """Streaming records match the verified template nodes"""
+    parser = RootTemplateParser()
+    records = list(parser.iter_template_records(FIXTURE_PATHS["ROOT_TEMPLATE"]))
+    summary = parser.get_record_summary(records)
+
+    assert len(summary["verified"]) == len(node_children)
+    assert len(summary["ignored"]) == 2
+
+    stats_names = parser.get_stats_names_from_records(summary["verified"])
+    assert stats_names == parser.get_stats_names_from_node_children(node_children)
+
+    template = summary["ignored"][0]
+    assert template.name == "ROF_Rune_Template"
+    assert template.map_key == "2874eaa0-dcc7-48c0-9d96-dc50c5149aa2"
+    assert template.parent_template_id == "6ce06d40-aef0-405d-9860-98c0df7cbe1b"
+    assert template.dev_comment == "Ignore"
+
+
+def test_iter_template_records_frees_nodes():
+    rt_xml = Path(FIXTURE_PATHS["ROOT_TEMPLATE"]).read_bytes()
+    templates_children: list[ET.Element] = []
+
+    class ChildrenTrackingParser(RootTemplateParser):
+        def is_template_node(self, node, ancestors):
+            is_template = super().is_template_node(node, ancestors)
+            if is_template and not templates_children:
+                templates_children.append(ancestors[-1])
+            return is_template
+
+    parser = ChildrenTrackingParser()
+    records = list(parser.iter_template_records(io.BytesIO(rt_xml)))
+
+    assert len(records) == 15
+    assert (
+        len(templates_children[0].findall("node")) == 0
+    ), "Template nodes were kept after their record"
+
+
+def test_iter_template_records_from_root():
+    """Records from a parsed tree match the streamed records"""
+    parser = RootTemplateParser()
+    root_node = ET.fromstring(Path(FIXTURE_PATHS["ROOT_TEMPLATE"]).read_text())
+
+    assert list(parser.iter_template_records_from_root(root_node)) == list(
+        parser.iter_template_records(FIXTURE_PATHS["ROOT_TEMPLATE"])
+    )
@@ -0,0 +1,115 @@
+import os
+import shutil
+from pathlib import Path
+
+from ModAnalyzer import Analyzer
+from ModAnalyzer.Stats import StatsParser
+from ModAnalyzer.TreasureTable import TreasureTableAnalyzer
+
+OBJECT_STATS = """
+// Runes
+new entry "OBJ_RUNE_BASE"
+type "Object"
+data "ValueLevel" "1"
+
+new entry "OBJ_RUNE_ROF_BONE_ARMOR"
+type "Object"
+using "OBJ_RUNE_BASE"
+data "RootTemplate" "e5e39521-2b95-4b18-b07a-dbe5f1356576"
+data "Description" "Says "hello""
+data "Weight" ""
+"""
+
+
+def test_parse_stats():
+    stats_parser = StatsParser()
+    stats_map = stats_parser.parse_stats(OBJECT_STATS.splitlines())
+
+    assert list(stats_map) == ["OBJ_RUNE_BASE", "OBJ_RUNE_ROF_BONE_ARMOR"]
+    entry = stats_map["OBJ_RUNE_ROF_BONE_ARMOR"]
+    assert entry.type == "Object"
+    assert entry.using == "OBJ_RUNE_BASE"
+    assert entry.data == {
+        "RootTemplate": "e5e39521-2b95-4b18-b07a-dbe5f1356576",
+        "Description": 'Says "hello"',
+        "Weight": "",
+    }
+    assert stats_map["OBJ_RUNE_BASE"].using == ""
+    assert stats_parser.num_lines == len(OBJECT_STATS.splitlines())
+
+
+def test_last_entry_wins():
+    lines = [
+        'new entry "OBJ_A"',
+        'data "ValueLevel" "1"',
+        'new entry "OBJ_A"',
+        'data "ValueLevel" "2"',
+    ]
+    stats_map = StatsParser().parse_stats(lines)
+
+    assert stats_map["OBJ_A"].data == {"ValueLevel": "2"}
+
+
+def test_bad_entry_name_is_skipped():
+    lines = [
+        'new entry "OBJ_A"',
+        "new entry OBJ_B",
+        'data "ValueLevel" "2"',
+    ]
+    stats_map = StatsParser().parse_stats(lines)
+
+    assert list(stats_map) == ["OBJ_A"]
+    assert stats_map["OBJ_A"].data == {}
+
+
+def test_unknown_stats(tmp_path: Path):
+    mod_dir = tmp_path / "TestMod"
+    shutil.copytree("TestMod", mod_dir)
+    generated_dir = mod_dir / "Public" / "TestMod" / "Stats" / "Generated"
+    (generated_dir / "Data").mkdir()
+    (generated_dir / "Data" / "Object.txt").write_text(OBJECT_STATS)
+    # Generated stats files start out empty
+    (generated_dir / "Data" / "Status.txt").touch()
+
+    report = TreasureTableAnalyzer().generate_report(
+        str(generated_dir / "TreasureTable.txt"),
+        str(mod_dir / "Public" / "TestMod" / "RootTemplates"),
+    )
+
+    assert report.has_stats
+    assert "OBJ_RUNE_ROF_BONE_ARMOR" not in report.unknown_stats
+    assert "OBJ_RUNE_OF_SLIMY_COMPANIONSHIP" in report.unknown_stats
+    assert "I_OBJ_RUNE_ROF_BONE_ARMOR" not in report.unknown_object_categories
+    assert "I_OBJ_RUNE_OF_SLIMY_COMPANIONSHIP" in report.unknown_object_categories
+
+
+def test_unknown_stats_without_treasure_table(tmp_path: Path):
+    mod_dir = tmp_path / "TestMod"
+    shutil.copytree("TestMod", mod_dir)
+    generated_dir = mod_dir / "Public" / "TestMod" / "Stats" / "Generated"
+    (generated_dir / "TreasureTable.txt").unlink()
+    (generated_dir / "Data").mkdir()
+    (generated_dir / "Data" / "Object.txt").write_text(OBJECT_STATS)
+
+    report = Analyzer().generate_report(str(mod_dir))
+
+    assert not report.Structure.has_treasure_table
+    tt_report = report.TreasureTable
+    assert tt_report.has_stats
+    assert "OBJ_RUNE_ROF_BONE_ARMOR" not in tt_report.unknown_stats
+    assert "OBJ_RUNE_OF_SLIMY_COMPANIONSHIP" in tt_report.unknown_stats
+    # Nothing to check treasure table entries or accessibility against
+    assert tt_report.unknown_object_categories == set()
+    assert tt_report.inaccessible_items == []
+
+
+def test_mod_without_stats_is_not_checked():
+    tt_filename = os.path.join(
+        "TestMod", "Public", "TestMod", "Stats", "Generated", "TreasureTable.txt"
+    )
+    report = TreasureTableAnalyzer().generate_report(
+        tt_filename, os.path.join("TestMod", "Public", "TestMod", "RootTemplates")
+    )
+
+    assert not report.has_stats
+    assert report.unknown_stats == set()
@@ -0,0 +1,113 @@
+import time
+from pathlib import Path
+
+from ModAnalyzer.Stats import StatsParser, StatsResolver
+
+VANILLA_STATS = """
+new entry "_BaseItem"
+type "Object"
+data "Weight" "1"
+data "ValueLevel" "1"
+
+new entry "OBJ_RUNE_BASE"
+type "Object"
+using "_BaseItem"
+data "ValueLevel" "2"
+"""
+
+MOD_STATS = """
+new entry "OBJ_RUNE_ROF_BONE_ARMOR"
+using "OBJ_RUNE_BASE"
+data "RootTemplate" "e5e39521-2b95-4b18-b07a-dbe5f1356576"
+
+new entry "_BaseItem"
+type "Object"
+data "Weight" "5"
+"""
+
+
+def get_stats_map(contents: str):
+    return StatsParser().parse_stats(contents.splitlines())
+
+
+def test_resolve_inherits_through_layers():
+    resolver = StatsResolver([get_stats_map(VANILLA_STATS), get_stats_map(MOD_STATS)])
+    entry = resolver.resolve("OBJ_RUNE_ROF_BONE_ARMOR")
+
+    assert entry.type == "Object"
+    # The mod replaces _BaseItem, which drops its ValueLevel
+    assert entry.data == {
+        "Weight": "5",
+        "ValueLevel": "2",
+        "RootTemplate": "e5e39521-2b95-4b18-b07a-dbe5f1356576",
+    }
+    # Parsed entries are left alone
+    assert resolver.entries["OBJ_RUNE_ROF_BONE_ARMOR"].data == {
+        "RootTemplate": "e5e39521-2b95-4b18-b07a-dbe5f1356576"
+    }
+    assert resolver.missing_parents == {}
+    assert resolver.cycles == {}
+
+
+def test_missing_parents_and_cycles():
+    stats_map = get_stats_map("""
+new entry "OBJ_A"
+using "OBJ_B"
+data "A" "1"
+
+new entry "OBJ_B"
+using "OBJ_A"
+data "B" "1"
+
+new entry "OBJ_C"
+using "OBJ_A"
+
+new entry "OBJ_D"
+using "OBJ_MISSING"
+data "D" "1"
+""")
+    resolver = StatsResolver([stats_map])
+    resolved = resolver.resolve_all()
+
+    assert resolver.missing_parents == {"OBJ_D": "OBJ_MISSING"}
+    assert resolver.cycles == {
+        "OBJ_A": ["OBJ_A", "OBJ_B", "OBJ_A"],
+        "OBJ_B": ["OBJ_A", "OBJ_B", "OBJ_A"],
+    }
+    assert resolved["OBJ_D"].data == {"D": "1"}
+    assert resolved["OBJ_A"].data == {"A": "1", "B": "1"}
+    assert resolved["OBJ_C"].data == {"A": "1", "B": "1"}
+
+
+def test_from_stats_dirs(tmp_path: Path):
+    vanilla_dir = tmp_path / "Vanilla"
+    mod_dir = tmp_path / "Mod"
+    vanilla_dir.mkdir()
+    mod_dir.mkdir()
+    (vanilla_dir / "Object.txt").write_text(VANILLA_STATS)
+    (mod_dir / "Object.txt").write_text(MOD_STATS)
+
+    resolver = StatsResolver.from_stats_dirs([str(vanilla_dir), str(mod_dir)])
+
+    assert resolver.resolve("OBJ_RUNE_ROF_BONE_ARMOR").data["Weight"] == "5"
+
+
+def test_resolve_all_is_linear():
+    lines: list[str] = []
+    # Long chains, so resolving each entry on its own would be quadratic
+    for chain in range(100):
+        for depth in range(2000):
+            lines.append(f'new entry "OBJ_{chain}_{depth}"')
+            if depth > 0:
+                lines.append(f'using "OBJ_{chain}_{depth - 1}"')
+            lines.append(f'data "Field{depth % 20}" "{depth}"')
+    resolver = StatsResolver([StatsParser().parse_stats(lines)])
+
+    start_time = time.perf_counter()
+    resolved = resolver.resolve_all()
+    elapsed = time.perf_counter() - start_time
+
+    assert len(resolved) == 200_000
+    assert resolved["OBJ_0_1999"].data["Field0"] == "1980"
+    # Generous, it takes about a second
+    assert elapsed < 20
@@ -0,0 +1,70 @@
+import os
+from pathlib import Path
+
+from ModAnalyzer import Analyzer
+from ModAnalyzer.Structure import SyntheticModGenerator
+
+
+def generate_mod(mod_dir: Path, **kwargs) -> Path:
+    generator = SyntheticModGenerator(mod_name=mod_dir.name, **kwargs)
+    assert generator.create_synthetic_mod(str(mod_dir)), "Failed to generate mod"
+    return mod_dir
+
+
+def test_create_synthetic_mod(tmp_path: Path):
+    mod_dir = generate_mod(
+        tmp_path / "SyntheticMod",
+        num_root_templates=120,
+        templates_per_file=50,
+        num_treasure_tables=7,
+        num_tags=3,
+        num_lua_files=4,
+        ignored_ratio=0.1,
+    )
+    report = Analyzer().generate_report(str(mod_dir))
+    public_dir = mod_dir / "Public" / "SyntheticMod"
+
+    assert report.Structure.has_root_templates
+    assert report.Structure.has_treasure_table
+    assert report.Structure.has_tags
+    assert len(list((public_dir / "RootTemplates").glob("*.lsx"))) == 3
+    # Includes the sample tag from the basic structure
+    assert len(list((public_dir / "Tags").glob("*.lsx"))) == 4
+
+    tt_report = report.TreasureTable
+    assert len(tt_report.verified_items) + len(tt_report.ignored_items) == 120
+    assert len(tt_report.ignored_items) > 0
+    assert tt_report.inaccessible_items == []
+
+    se_report = report.ScriptExtender
+    assert se_report.has_bootstrap_server and se_report.has_config
+    lua_dir = mod_dir / "Mods" / "SyntheticMod" / "ScriptExtender" / "Lua" / "Server"
+    assert len(os.listdir(lua_dir)) == 4
+
+
+def test_synthetic_mod_is_deterministic(tmp_path: Path):
+    settings = {"num_root_templates": 20, "num_tags": 1, "inaccessible_ratio": 0.5}
+    first = generate_mod(tmp_path / "first" / "SyntheticMod", **settings)
+    second = generate_mod(tmp_path / "second" / "SyntheticMod", **settings)
+
+    def get_synthetic_files(mod_dir: Path) -> list[Path]:
+        # The basic structure writes the mod path and fresh UUIDs, so
+        # only compare what the synthetic generator adds
+        return sorted(
+            path.relative_to(mod_dir)
+            for path in mod_dir.rglob("*.*")
+            if path.name.lower().startswith("synthetic")
+            or path.name == "TreasureTable.txt"
+        )
+
+    first_files = get_synthetic_files(first)
+    assert len(first_files) > 0
+    assert first_files == get_synthetic_files(second)
+
+    for relative_path in first_files:
+        assert (first / relative_path).read_bytes() == (
+            second / relative_path
+        ).read_bytes(), f"{relative_path} differs"
+
+    report = Analyzer().generate_report(str(first))
+    assert len(report.TreasureTable.inaccessible_items) > 0
@@ -0,0 +1,79 @@
+import json
+
+from ModAnalyzer import Analyzer
+from ModAnalyzer.timings import NULL_SPAN, Timings
+
+
+def test_nested_spans():
+    timings = Timings(enabled=True)
+
+    with timings.span("analyze"):
+        for _ in range(3):
+            with timings.span("rt_parse"):
+                pass
+        with timings.span("render"):
+            pass
+
+    assert list(timings.spans) == [
+        "analyze",
+        "analyze/rt_parse",
+        "analyze/render",
+    ]
+    assert timings.spans["analyze"][0] == 1
+    assert timings.spans["analyze/rt_parse"][0] == 3
+    assert timings.spans["analyze"][1] >= timings.spans["analyze/rt_parse"][1]
+    assert timings.stack == []
+
+
+def test_disabled_timings_record_nothing():
+    timings = Timings()
+
+    assert timings.span("analyze") is NULL_SPAN
+    with timings.span("analyze"):
+        timings.count("rt_files_parsed")
+
+    assert timings.spans == {}
+    assert timings.counters == {}
+
+
+def test_counters_and_json():
+    timings = Timings(enabled=True)
+    timings.count("rt_files_parsed")
+    timings.count("rt_files_parsed", 2)
+    with timings.span("tt_parse"):
+        pass
+
+    result = json.loads(timings.to_json())
+    assert result["counters"] == {"rt_files_parsed": 3}
+    assert [span["name"] for span in result["spans"]] == ["tt_parse"]
+    assert result["spans"][0]["calls"] == 1
+    assert "rt_files_parsed" in timings.get_table()
+
+
+def test_analyzer_records_stages():
+    timings = Timings(enabled=True)
+    Analyzer(timings=timings).generate_report("TestMod")
+
+    assert "generate_report/structure/scan" in timings.spans
+    assert "generate_report/treasure_table/tt_parse" in timings.spans
+    assert "generate_report/treasure_table/rt_parse" in timings.spans
+    assert "generate_report/script_extender" in timings.spans
+    assert timings.counters["files_scanned"] > 0
+    assert timings.counters["bytes_read"] > 0
+    assert timings.counters["tt_lines_processed"] > 0
+    assert timings.counters["rt_files_parsed"] > 0
+    assert timings.counters["template_nodes_parsed"] > 0
+
+
+def test_analyze_records_rendering():
+    timings = Timings(enabled=True)
+    Analyzer(using_typer=True, timings=timings).analyze("TestMod")
+
+    for stage in ["structure", "treasure_table", "script_extender", "localization"]:
+        assert f"analyze/{stage}/render" in timings.spans
+    # Reports without output don't render anything
+    Analyzer(timings=timings).generate_report("TestMod")
+    assert not any(
+        path.startswith("generate_report") and path.endswith("/render")
+        for path in timings.spans
+    )
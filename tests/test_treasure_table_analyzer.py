@@ -1,10 +1,13 @@
 import logging
 import os
+import shutil
+from pathlib import Path
 
-from ModAnalyzer import Structure
+from ModAnalyzer import Analyzer, Structure
 from ModAnalyzer.TreasureTable import (
     TreasureTableAnalyzer,
 )
+from ModAnalyzer.TreasureTable.models import TemplateRecord
 from tests.conftest import FIXTURE_PATHS
 
 logger = logging.getLogger("TestTreasureTableAnalyzer")
@@ -62,3 +65,78 @@ def test_replacement_entry_detection():
 
     assert len(report.treasure_table_entries) == 2, "Failed to find entry"
     assert len(report.replacement_entries) == 2, "Failed to identify replacement entry"
+
+
+def test_generate_report_streaming():
+    analyzer = TreasureTableAnalyzer(streaming=True)
+    report = analyzer.generate_report(
+        FIXTURE_PATHS["TREASURE_TABLE"],
+        os.path.split(FIXTURE_PATHS["ROOT_TEMPLATE"])[0],
+    )
+
+    assert len(report.verified_items) == 13
+    assert len(report.ignored_items) == 2
+    assert len(report.inaccessible_items) == 0, "Some items not verified"
+
+
+def get_rt_dir_with_copies(tmp_path: Path, num_copies: int) -> Path:
+    rt_dir = tmp_path / "RootTemplates"
+    rt_dir.mkdir()
+    for index in range(num_copies):
+        shutil.copy(FIXTURE_PATHS["ROOT_TEMPLATE"], rt_dir / f"runes_{index}.lsx")
+    return rt_dir
+
+
+def test_generate_report_parallel(tmp_path: Path):
+    rt_dir = get_rt_dir_with_copies(tmp_path, 3)
+    serial_report = TreasureTableAnalyzer(streaming=True).generate_report(
+        FIXTURE_PATHS["TREASURE_TABLE"], str(rt_dir)
+    )
+    analyzer = TreasureTableAnalyzer(workers=2, parallel_threshold_bytes=0)
+    assert analyzer.should_parse_in_parallel(sorted(rt_dir.iterdir()))
+
+    parallel_report = analyzer.generate_report(
+        FIXTURE_PATHS["TREASURE_TABLE"], str(rt_dir)
+    )
+
+    assert len(parallel_report.verified_items) == 3 * 13
+    # Merged in file order, whichever worker finishes first
+    assert parallel_report.verified_items == serial_report.verified_items
+    assert parallel_report.ignored_items == serial_report.ignored_items
+    assert len(parallel_report.inaccessible_items) == 0
+
+
+def test_small_rt_dir_is_parsed_serially(tmp_path: Path):
+    rt_dir = get_rt_dir_with_copies(tmp_path, 3)
+    analyzer = TreasureTableAnalyzer(workers=4)
+
+    assert not analyzer.should_parse_in_parallel(sorted(rt_dir.iterdir()))
+    assert not TreasureTableAnalyzer(
+        workers=1, parallel_threshold_bytes=0
+    ).should_parse_in_parallel(sorted(rt_dir.iterdir()))
+
+
+def test_ignored_item_names():
+    report = TreasureTableAnalyzer().generate_report(
+        FIXTURE_PATHS["TREASURE_TABLE"],
+        os.path.split(FIXTURE_PATHS["ROOT_TEMPLATE"])[0],
+    )
+
+    ignored_names = Analyzer().get_list_of_ignored_items(report.ignored_items)
+
+    assert ignored_names.split(", ") == [item.name for item in report.ignored_items]
+    assert "ROF_Rune_Template" in ignored_names
+
+
+def test_tt_that_is_not_utf8(tmp_path: Path):
+    tt_path = tmp_path / "TreasureTable.txt"
+    tt_path.write_bytes(
+        Path(FIXTURE_PATHS["TREASURE_TABLE"]).read_bytes() + b"\xff\xfe"
+    )
+
+    report = TreasureTableAnalyzer().generate_report(
+        str(tt_path), os.path.dirname(FIXTURE_PATHS["ROOT_TEMPLATE"])
+    )
+
+    assert report.verified_items == []
+    assert report.treasure_table_entries == []
@@ -0,0 +1,121 @@
+import pickle
+from dataclasses import asdict
+
+from ModAnalyzer.TreasureTable import (
+    TreasureTableAnalyzer,
+    TreasureTableParser,
+    TreasureTableReader,
+)
+from ModAnalyzer.TreasureTable.models import (
+    TreasureTable,
+    TreasureTableEntry,
+    TreasureTableStore,
+)
+from tests.conftest import FIXTURE_PATHS
+
+parser = TreasureTableParser()
+reader = TreasureTableReader()
+
+
+def get_entry(object_category_name: str, can_merge: bool = True):
+    return TreasureTableEntry(
+        can_merge=can_merge,
+        subtable_position="1,1",
+        object_category_name=object_category_name,
+        is_valid=object_category_name.startswith("I_"),
+        options=[1, 0, 0, 0, 0, 0, 0, 0],
+    )
+
+
+def test_store_matches_tt_map():
+    tt_map = parser.parse_treasure_table(
+        reader.iter_lines(
+            "tests/fixture/TreasureTableWithoutReplacementEntryExample.txt"
+        )
+    )
+    store = parser.parse_treasure_table_store(
+        reader.iter_lines(
+            "tests/fixture/TreasureTableWithoutReplacementEntryExample.txt"
+        )
+    )
+    analyzer = TreasureTableAnalyzer()
+
+    assert store.get_table_names() == list(tt_map)
+    assert {
+        tt_name: [asdict(entry) for entry in entries]
+        for tt_name, entries in store.to_tt_map().items()
+    } == {
+        tt_name: [asdict(entry) for entry in entries]
+        for tt_name, entries in tt_map.items()
+    }
+    assert store.get_summary() == parser.get_summary_from_tt_map(tt_map)
+    assert store.get_invalid_entries() == analyzer.get_invalid_entries(tt_map)
+    assert store.get_replacement_entries() == (
+        analyzer.get_replacement_entries_from_map(tt_map)
+    )
+
+
+def test_store_interns_names_and_options():
+    store = parser.parse_treasure_table_store(
+        reader.iter_lines(FIXTURE_PATHS["TREASURE_TABLE"])
+    )
+
+    assert len(store.get_table_names()) == 29
+    # Every entry in the fixture has the same options
+    assert len(store.option_set_ids) == 1
+    assert len(store.strings) == len(set(store.strings))
+    assert all(len(view.options) == 8 for view in store)
+
+
+def test_duplicate_tables_are_merged():
+    store = TreasureTableStore.from_tables(
+        [
+            TreasureTable("Table", True, [get_entry("I_A"), get_entry("I_B")]),
+            TreasureTable("Other", False, [get_entry("I_A", can_merge=False)]),
+            TreasureTable("Table", True, [get_entry("I_B"), get_entry("I_C")]),
+        ]
+    )
+
+    assert "Table" in store
+    assert "Missing" not in store
+    assert len(store) == 4
+    assert [view.object_category_name for view in store.get_entries("Table")] == [
+        "I_A",
+        "I_B",
+        "I_C",
+    ]
+    assert store.get_entries("Other")[0].table_name == "Other"
+    assert store.get_replacement_entries() == {"I_A"}
+    assert store.get_entries("Table")[0] == "I_A"
+    assert store.can_merge("Table")
+    assert not store.can_merge("Other")
+
+
+def test_table_flags_come_from_the_table():
+    store = TreasureTableStore.from_tables(
+        [
+            TreasureTable("Empty", True, []),
+            # CanMerge came after this table's only entry
+            TreasureTable("Late", True, [get_entry("I_A", can_merge=False)]),
+            TreasureTable("Replaced", True, [get_entry("I_B")]),
+            TreasureTable("Replaced", False, [get_entry("I_C", can_merge=False)]),
+        ]
+    )
+
+    assert store.can_merge("Empty")
+    assert store.can_merge("Late")
+    assert not store.can_merge("Replaced")
+    assert not store.can_merge("Missing")
+
+
+def test_store_pickles():
+    store = TreasureTableStore.from_tables(
+        [TreasureTable("Table", True, [get_entry("I_A"), get_entry("OBJ_B")])]
+    )
+
+    restored: TreasureTableStore = pickle.loads(pickle.dumps(store))
+
+    assert [asdict(view.to_entry()) for view in restored] == [
+        asdict(view.to_entry()) for view in store
+    ]
+    assert restored.get_invalid_entries() == {"OBJ_B"}
@@ -0,0 +1,111 @@
+import os
+import pickle
+from pathlib import Path
+
+import pytest
+
+from ModAnalyzer.GameData import VanillaIndex, VanillaIndexBuilder
+from ModAnalyzer.TreasureTable import TreasureTableAnalyzer
+
+VANILLA_TREASURE_TABLE = """
+new treasuretable "ST_MagicItems_Unique"
+CanMerge 1
+new subtable "1,1"
+object category "I_OBJ_VANILLA_RING",1,0,0,0,0,0,0,0
+object category "T_Gold_Pile_Small",1,0,0,0,0,0,0,0
+
+new treasuretable "Gold_Pile_Small"
+new subtable "1,1"
+object category "I_LOOT_Gold_A",1,0,0,0,0,0,0,0
+
+new treasuretable "Empty_Merge"
+CanMerge 1
+"""
+
+VANILLA_STATS = """
+new entry "OBJ_VANILLA_RING"
+type "Armor"
+data "ValueLevel" "1"
+
+new entry "LOOT_Gold_A"
+type "Object"
+"""
+
+
+def write_vanilla_data(data_dir: Path):
+    stats_dir = data_dir / "Public" / "Shared" / "Stats" / "Generated"
+    (stats_dir / "Data").mkdir(parents=True)
+    (stats_dir / "TreasureTable.txt").write_text(VANILLA_TREASURE_TABLE)
+    (stats_dir / "Data" / "Object.txt").write_text(VANILLA_STATS)
+
+
+@pytest.fixture
+def vanilla_index(tmp_path: Path):
+    write_vanilla_data(tmp_path / "Data")
+    index_path = str(tmp_path / "vanilla.idx")
+    VanillaIndexBuilder(str(tmp_path / "Data")).build(index_path)
+    with VanillaIndex(index_path) as index:
+        yield index
+
+
+def test_lookups(vanilla_index: VanillaIndex):
+    assert vanilla_index.get_summary() == {"tables": 3, "categories": 3, "stats": 2}
+    assert vanilla_index.has_table("Gold_Pile_Small")
+    assert not vanilla_index.has_table("Gold_Pile")
+    assert vanilla_index.can_merge("ST_MagicItems_Unique")
+    assert not vanilla_index.can_merge("Gold_Pile_Small")
+    assert vanilla_index.can_merge("Empty_Merge")
+    assert vanilla_index.get_table_entries("Empty_Merge") == []
+    assert vanilla_index.has_stats("OBJ_VANILLA_RING")
+    assert vanilla_index.get_table_entries("ST_MagicItems_Unique") == [
+        "I_OBJ_VANILLA_RING",
+        "T_Gold_Pile_Small",
+    ]
+    assert vanilla_index.get_tables_with_category("I_LOOT_Gold_A") == [
+        "Gold_Pile_Small"
+    ]
+    assert vanilla_index.get_tables_with_category("I_MISSING") == []
+
+
+def test_index_can_be_pickled(vanilla_index: VanillaIndex):
+    copy = pickle.loads(pickle.dumps(vanilla_index))
+    assert copy.has_category("I_OBJ_VANILLA_RING")
+    copy.close()
+
+
+def test_invalid_index_is_not_opened(tmp_path: Path):
+    index_path = tmp_path / "vanilla.idx"
+    index_path.write_bytes(b"not an index")
+    assert VanillaIndex.open_if_exists(str(index_path)) is None
+    assert VanillaIndex.open_if_exists(str(tmp_path / "missing.idx")) is None
+
+
+def test_items_in_vanilla_tables_are_accessible(
+    tmp_path: Path, vanilla_index: VanillaIndex
+):
+    mod_tt_path = tmp_path / "TreasureTable.txt"
+    mod_tt_path.write_text(
+        os.linesep.join(
+            [
+                'new treasuretable "MOD_Table"',
+                'new subtable "1,1"',
+                'object category "T_Gold_Pile_Small",1,0,0,0,0,0,0,0',
+                'object category "T_Not_A_Table",1,0,0,0,0,0,0,0',
+            ]
+        )
+    )
+    analyzer = TreasureTableAnalyzer(vanilla_index=vanilla_index)
+    tt_summary = {"I_OBJ_MOD_ITEM": ["MOD_Table"]}
+
+    assert analyzer.item_in_treasure_table("OBJ_VANILLA_RING", tt_summary)
+    assert analyzer.item_in_treasure_table("OBJ_MOD_ITEM", tt_summary)
+    assert not analyzer.item_in_treasure_table("OBJ_MISSING", tt_summary)
+
+    report = analyzer.generate_report(str(mod_tt_path), str(tmp_path / "RootTemplates"))
+    assert report.unknown_table_references == {"T_Not_A_Table"}
+
+    # Without an index there is nothing to check references against
+    report = TreasureTableAnalyzer().generate_report(
+        str(mod_tt_path), str(tmp_path / "RootTemplates")
+    )
+    assert report.unknown_table_references == set()
@@ -115,3 +115,54 @@ def test_invalid_tt_entry():
                 num_invalid_entries += 1
 
     assert num_invalid_entries == 1, "Invalid entry detection not working as expected"
+
+
+def test_parse_from_file_object(
+    treasure_table_map: dict[str, list[TreasureTableEntry]],
+):
+    with open(FIXTURE_PATHS["TREASURE_TABLE"], "rb") as file:
+        tt_map = parser.parse_treasure_table(reader.iter_lines(file))
+        assert not file.closed, "Reader closed the caller's file"
+
+    assert tt_map == treasure_table_map
+
+
+def test_parse_from_bytes(treasure_table_map: dict[str, list[TreasureTableEntry]]):
+    with open(FIXTURE_PATHS["TREASURE_TABLE"], "rb") as file:
+        buffer = file.read()
+
+    tt_map = parser.parse_treasure_table(reader.iter_lines(buffer))
+
+    assert tt_map == treasure_table_map
+
+
+def test_iter_treasure_tables_is_incremental():
+    consumed: list[str] = []
+
+    def lines():
+        for line in [
+            'new treasuretable "First"',
+            "CanMerge 1",
+            'new subtable "1,1"',
+            'object category "I_OBJ_FIRST",1,0,0,0,0,0,0,0',
+            "// A comment //",
+            'new treasuretable "Second"',
+            'new subtable "1,1"',
+            'object category "I_OBJ_SECOND",1,0,0,0,0,0,0,0',
+        ]:
+            consumed.append(line)
+            yield line
+
+    tables = parser.iter_treasure_tables(lines())
+    first = next(tables)
+
+    assert first.name == "First"
+    assert first.can_merge
+    assert [entry.object_category_name for entry in first.entries] == ["I_OBJ_FIRST"]
+    # Only read up to the start of the next table
+    assert len(consumed) == 6
+
+    second = next(tables)
+    assert second.name == "Second"
+    assert not second.entries[0].can_merge
+    assert next(tables, None) is None